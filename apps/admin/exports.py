@@ -0,0 +1,103 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.generics import ListAPIView
+
+from apps.utils import CustomResponse
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    # csv.writer yozgan qatorni saqlamasdan qaytaradi
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def iter_ndjson(fields, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def buffered(lines, size=EXPORT_BUFFER_SIZE):
+    # har qator alohida chunk bo'lmasligi uchun ~64KB lik bo'laklarga yig'iladi
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer).encode()
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+async def as_async(chunks):
+    """
+    ASGI da sync iterator ni Django oxirigacha o'qib bitta javob qilib yuboradi (oqim yo'qoladi).
+    Shuning uchun har chunk alohida sync_to_async bilan olinadi: thread_sensitive bo'lgani uchun
+    server-side cursor doim bitta threadda, o'z DB ulanishida o'qiladi.
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+class StreamingExportAPIView(ListAPIView):
+    """
+    List view ning filter, search va ordering lari bilan bir xil querysetni sahifalarsiz
+    CSV yoki NDJSON qilib oqim bilan beradi. values_list().iterator() server-side cursor dan
+    chunk_size qatordan o'qiydi: xotira qator soniga bog'liq emas, COUNT(*) bajarilmaydi.
+    """
+    pagination_class = None
+    export_fields = ()
+    export_name = 'export'
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return CustomResponse.error_response(
+                message=f"export_format quyidagilardan biri bo'lishi kerak: {', '.join(EXPORT_FORMATS)}"
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # DB tanlovi so'rov davomida bog'lanadi: javob oqimi finalize_response dan keyin o'qiladi
+        queryset = queryset.using(queryset.db)
+        rows = queryset.values_list(*self.export_fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        lines = iter_csv(self.export_fields, rows) if export_format == 'csv' else iter_ndjson(self.export_fields, rows)
+        content = buffered(lines)
+        if isinstance(request._request, ASGIRequest):
+            content = as_async(content)
+        response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+        filename = f"{self.export_name}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-store'
+        return response
@@ -1,5 +1,5 @@
 import django_filters
-from apps.profile.models import Profile
+from apps.profile.models import PatientProfile
 
 class AdminUserProfileListFilter(django_filters.FilterSet):
     created_at__gte = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
@@ -8,5 +8,5 @@ class AdminUserProfileListFilter(django_filters.FilterSet):
     updated_at__lte = django_filters.DateTimeFilter(field_name='updated_at', lookup_expr='lte')
 
     class Meta:
-        model = Profile
+        model = PatientProfile
         fields = ['created_at__gte', 'created_at__lte', 'updated_at__gte', 'updated_at__lte']
@@ -1,14 +1,14 @@
 from rest_framework import serializers
 
-from apps.profile.models import Profile
+from apps.profile.models import PatientProfile
 from apps.users.serializers import UserSerializer
 
 
 class AdminUserProfileListSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
-        model = Profile
-        fields = ['id', 'user', 'username', 'full_name', 'bio', 'image', 'website',
+        model = PatientProfile
+        fields = ['id', 'user', 'full_name', 'bio', 'image', 'website',
                   'followers_count', 'following_count', 'posts_count', 'is_private',
                   'slug', 'created_at', 'updated_at', 'deleted_at']
 
@@ -25,11 +25,11 @@ class AdminUserProfileListSerializer(serializers.ModelSerializer):
 
 class AdminProfileCreateSerializer(serializers.ModelSerializer):
     class Meta:
-        model = Profile
+        model = PatientProfile
         fields = '__all__'
 
 
 class AdminUserProfileRetrieveUpdateDestroy(serializers.ModelSerializer):
     class Meta:
-        model = Profile
+        model = PatientProfile
         fields = '__all__'
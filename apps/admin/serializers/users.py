@@ -1,6 +1,10 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from apps.users.models import UserImport
 from apps.utils.CustomValidationError import CustomValidationError
 from apps.utils.validates import validate_email_or_phone_number
 
@@ -58,4 +62,29 @@ class AdminUserCreateSerializer(serializers.ModelSerializer):
 class AdminUserRetrieveUpdateDestroySerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class AdminUserImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserImport
+        fields = [
+            'id', 'file', 'status', 'total_rows', 'created_count', 'error_count', 'rows_per_second',
+            'error', 'started_at', 'finished_at', 'created_at'
+        ]
+        read_only_fields = [
+            'status', 'total_rows', 'created_count', 'error_count', 'rows_per_second',
+            'error', 'started_at', 'finished_at', 'created_at'
+        ]
+
+    def validate_file(self, file):
+        if os.path.splitext(file.name)[1].lower() not in ('.csv', '.json'):
+            raise CustomValidationError(detail="Faqat CSV yoki JSON fayl yuklash mumkin")
+        if file.size > settings.USER_IMPORT_MAX_SIZE:
+            raise CustomValidationError(detail=f"Fayl hajmi {settings.USER_IMPORT_MAX_SIZE} baytdan oshmasligi kerak")
+        return file
+
+
+class AdminUserImportDetailSerializer(AdminUserImportSerializer):
+    class Meta(AdminUserImportSerializer.Meta):
+        fields = AdminUserImportSerializer.Meta.fields + ['errors']
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.admin.exports import as_async, buffered, iter_csv
+
+User = get_user_model()
+
+
+class ExportStreamTests(SimpleTestCase):
+    def test_csv_serializes_json_and_dates(self):
+        lines = list(iter_csv(('id', 'roles'), [(1, ['Bemor']), (2, None)]))
+        self.assertEqual(lines, ['id,roles\r\n', '1,"[""Bemor""]"\r\n', '2,\r\n'])
+
+    def test_lines_are_buffered(self):
+        chunks = list(buffered(['ab', 'cd', 'e'], size=3))
+        self.assertEqual(chunks, [b'abcd', b'e'])
+
+    async def test_async_iterator_yields_same_chunks(self):
+        chunks = [chunk async for chunk in as_async(buffered(['ab', 'cd', 'e'], size=3))]
+        self.assertEqual(chunks, [b'abcd', b'e'])
+
+
+class AdminExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin@example.com', full_name='Admin', is_staff=True)
+        self.users = [User.objects.create_user(f'user{index}@example.com', full_name=f'User {index}')
+                      for index in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, name, **params):
+        return self.client.get(reverse(f'custom_admin:{name}'), params)
+
+    def test_users_csv_follows_list_filters(self):
+        response = self.export('admin-user-export', search='user1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="users-\d{8}-\d{6}\.csv"$')
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['contact'] for row in rows], ['user1@example.com'])
+        self.assertEqual(json.loads(rows[0]['roles']), self.users[1].roles)
+
+    def test_profiles_ndjson(self):
+        response = self.export('admin-profile-export', export_format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['user__contact'] for row in rows],
+                         ['admin@example.com'] + [user.contact for user in self.users])
+
+    def test_unknown_format_is_rejected(self):
+        self.assertEqual(self.export('admin-user-export', export_format='xlsx').status_code, 400)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(self.users[0])
+        self.assertEqual(self.export('admin-user-export').status_code, 403)
@@ -4,5 +4,6 @@ app_name = 'admin'
 
 urlpatterns = [
     path('users/', include('apps.admin.urls.users')),
-    path('users/profile/', include('apps.admin.urls.profile'))
+    path('users/profile/', include('apps.admin.urls.profile')),
+    path('stats/', include('apps.admin.urls.stats')),
 ]
\ No newline at end of file
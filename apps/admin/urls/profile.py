@@ -1,10 +1,11 @@
 from django.urls import path
 
 from apps.admin.views.profile import AdminUserProfileListAPIView, AdminUserProfileCreateAPIView, \
-    AdminUserProfileRetrieveUpdateDestroyAPIView
+    AdminUserProfileRetrieveUpdateDestroyAPIView, AdminUserProfileExportAPIView
 
 urlpatterns = [
     path('list/', AdminUserProfileListAPIView.as_view(), name='admin-profile-list'),
+    path('export/', AdminUserProfileExportAPIView.as_view(), name='admin-profile-export'),
     path('create/', AdminUserProfileCreateAPIView.as_view(), name='admin-profile-create'),
     path('detail/<int:pk>', AdminUserProfileRetrieveUpdateDestroyAPIView.as_view(), name='admin-profile-detail'),
 ]
\ No newline at end of file
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from apps.admin.views.stats import AdminDashboardStatsAPIView
+
+urlpatterns = [
+    path('dashboard/', AdminDashboardStatsAPIView.as_view(), name='admin-stats-dashboard'),
+]
@@ -1,9 +1,13 @@
 from django.urls import path
 
-from apps.admin.views.users import AdminUserListAPIView, AdminUserCreateAPIView, AdminUserRetrieveUpdateDestroyAPIView
+from apps.admin.views.users import AdminUserListAPIView, AdminUserCreateAPIView, AdminUserRetrieveUpdateDestroyAPIView, \
+    AdminUserExportAPIView, AdminUserImportCreateAPIView, AdminUserImportDetailAPIView
 
 urlpatterns = [
     path('list/', AdminUserListAPIView.as_view(), name='admin-user-list'),
+    path('export/', AdminUserExportAPIView.as_view(), name='admin-user-export'),
+    path('import/', AdminUserImportCreateAPIView.as_view(), name='admin-user-import'),
+    path('import/<int:pk>/', AdminUserImportDetailAPIView.as_view(), name='admin-user-import-detail'),
     path('create/', AdminUserCreateAPIView.as_view(), name='admin-user-create'),
     path('detail/<int:pk>/', AdminUserRetrieveUpdateDestroyAPIView.as_view(), name='admin-user-detail'),
 ]
\ No newline at end of file
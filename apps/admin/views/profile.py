@@ -3,32 +3,43 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.admin.exports import StreamingExportAPIView
 from apps.admin.filters.profile import AdminUserProfileListFilter
 from apps.admin.paginations.profile import AdminUserProfileListPagination
 from apps.admin.permissions.users import AdminPermission
 from apps.admin.serializers.profile import AdminUserProfileListSerializer, AdminProfileCreateSerializer, \
     AdminUserProfileRetrieveUpdateDestroy
-from apps.profile.models import Profile
+from apps.profile.models import PatientProfile
+from apps.utils.db_router import ReadReplicaMixin
 
 
-class AdminUserProfileListAPIView(ListAPIView):
+class AdminUserProfileListAPIView(ReadReplicaMixin, ListAPIView):
     serializer_class = AdminUserProfileListSerializer
     permission_classes = [AdminPermission]
-    queryset = Profile.objects.all()
+    queryset = PatientProfile.objects.all()
     pagination_class = AdminUserProfileListPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_private']
     filterset_class = AdminUserProfileListFilter
-    search_fields = ['username', 'full_name']
+    search_fields = ['full_name', 'user__contact']
     ordering_fields = ['created_at', 'updated_at', 'full_name']
     ordering = ['id']
 
+
+class AdminUserProfileExportAPIView(StreamingExportAPIView, AdminUserProfileListAPIView):
+    export_name = 'profiles'
+    export_fields = (
+        'id', 'public_id', 'user_id', 'user__contact', 'full_name', 'bio', 'website', 'followers_count',
+        'following_count', 'posts_count', 'is_private', 'slug', 'created_at', 'updated_at'
+    )
+
+
 class AdminUserProfileCreateAPIView(CreateAPIView):
     serializer_class = AdminProfileCreateSerializer
     permission_classes = [AdminPermission]
-    queryset = Profile.objects.all()
+    queryset = PatientProfile.objects.all()
 
 class AdminUserProfileRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     serializer_class = AdminUserProfileRetrieveUpdateDestroy
     permission_classes = [AdminPermission]
-    queryset = Profile.objects.all()
\ No newline at end of file
+    queryset = PatientProfile.objects.all()
\ No newline at end of file
@@ -0,0 +1,23 @@
+from rest_framework.views import APIView
+
+from apps.admin.permissions.users import AdminPermission
+from apps.stats.rollups import dashboard_stats
+from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
+
+DASHBOARD_MAX_DAYS = 366
+
+
+class AdminDashboardStatsAPIView(ReadReplicaMixin, APIView):
+    """
+    Faqat stat_rollup jadvalidan o'qiydi: custom_user va story ga COUNT/GROUP BY yuborilmaydi.
+    """
+    permission_classes = [AdminPermission]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return CustomResponse.error_response(message="days butun son bo'lishi kerak")
+        days = min(max(days, 1), DASHBOARD_MAX_DAYS)
+        return CustomResponse.success_response(data=dashboard_stats(days))
@@ -1,18 +1,22 @@
 from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView, RetrieveAPIView
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import filters
 
+from apps.admin.exports import StreamingExportAPIView
 from apps.admin.filters.users import UserListFilter
 from apps.admin.paginations.users import AdminUserListPagination
 from apps.admin.permissions.users import AdminPermission
 from apps.admin.serializers.users import AdminUserListSerializer, AdminUserCreateSerializer, \
-    AdminUserRetrieveUpdateDestroySerializer
+    AdminUserRetrieveUpdateDestroySerializer, AdminUserImportSerializer, AdminUserImportDetailSerializer
+from apps.users.models import UserImport
+from apps.utils.db_router import ReadReplicaMixin
 
 User = get_user_model()
 
-class AdminUserListAPIView(ListAPIView):
+class AdminUserListAPIView(ReadReplicaMixin, ListAPIView):
     permission_classes = [AdminPermission]
     serializer_class = AdminUserListSerializer
     pagination_class = AdminUserListPagination
@@ -20,11 +24,18 @@ class AdminUserListAPIView(ListAPIView):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'is_staff']
     filterset_class = UserListFilter
-    search_fields = ['full_name', 'contact', 'role', 'contact_type', 'gender']
+    search_fields = ['full_name', 'contact', 'active_role', 'contact_type', 'gender']
     ordering_fields = ['created_at', 'full_name']
     ordering = ['-created_at']
 
 
+class AdminUserExportAPIView(StreamingExportAPIView, AdminUserListAPIView):
+    export_name = 'users'
+    export_fields = (
+        'id', 'public_id', 'full_name', 'contact', 'contact_type', 'registration_type', 'active_role', 'roles',
+        'birth_date', 'gender', 'status', 'is_active', 'is_staff', 'created_at', 'updated_at'
+    )
+
 
 class AdminUserCreateAPIView(CreateAPIView):
     serializer_class = AdminUserCreateSerializer
@@ -38,3 +49,20 @@ class AdminUserRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
 
 
+class AdminUserImportCreateAPIView(CreateAPIView):
+    """
+    Fayl saqlanadi va navbatga qo'yiladi; importni process_user_imports worker bajaradi.
+    """
+    serializer_class = AdminUserImportSerializer
+    permission_classes = [AdminPermission]
+    parser_classes = [MultiPartParser, FormParser]
+    queryset = UserImport.objects.all()
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+
+class AdminUserImportDetailAPIView(RetrieveAPIView):
+    serializer_class = AdminUserImportDetailSerializer
+    permission_classes = [AdminPermission]
+    queryset = UserImport.objects.all()
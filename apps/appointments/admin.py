@@ -1,3 +1,57 @@
 from django.contrib import admin
 
-# Register your models here.
+from apps.appointments.models import Clinic, Doctor, DoctorAvailableDay, Appointment, Review, AppointmentReminder
+
+
+@admin.register(Clinic)
+class ClinicAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'address', 'latitude', 'longitude', 'status')
+    search_fields = ('name', 'address')
+    list_filter = ('status',)
+    readonly_fields = ('geohash',)
+    raw_id_fields = ('user',)
+    list_per_page = 20
+
+
+@admin.register(Doctor)
+class DoctorAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'speciality', 'experience_year', 'gender', 'rating', 'rating_count', 'status')
+    search_fields = ('user__full_name', 'user__contact', 'speciality')
+    list_filter = ('status', 'gender')
+    list_select_related = ('user',)
+    raw_id_fields = ('user', 'clinic')
+    list_per_page = 20
+
+
+@admin.register(DoctorAvailableDay)
+class DoctorAvailableDayAdmin(admin.ModelAdmin):
+    list_display = ('doctor', 'date', 'total_slots', 'free_slots', 'updated_at')
+    list_filter = ('date',)
+    raw_id_fields = ('doctor',)
+    list_per_page = 50
+
+
+@admin.register(Appointment)
+class AppointmentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'doctor', 'patient', 'starts_at', 'ends_at', 'status')
+    list_filter = ('status',)
+    raw_id_fields = ('doctor', 'patient')
+    list_per_page = 20
+    ordering = ('-starts_at',)
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('id', 'doctor', 'patient', 'rating', 'created_at')
+    list_filter = ('rating',)
+    raw_id_fields = ('doctor', 'patient')
+    list_per_page = 20
+
+
+@admin.register(AppointmentReminder)
+class AppointmentReminderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'appointment', 'kind', 'due_at', 'status', 'attempts', 'sent_at')
+    list_filter = ('status', 'kind')
+    raw_id_fields = ('appointment',)
+    list_per_page = 50
+    ordering = ('-due_at',)
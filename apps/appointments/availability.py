@@ -0,0 +1,133 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.appointments.models import DoctorAvailableDay, Appointment, AppointmentStatusChoices
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+def parse_time(value):
+    hours, minutes = value.split(':')
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or hours * 60 + minutes > 24 * 60:
+        raise ValueError(value)
+    return hours * 60 + minutes
+
+
+def parse_working_hours(working_hours):
+    """
+    {"mon": [["09:00", "13:00"], ...]} -> {0: [(540, 780), ...]} (hafta kuni -> kun boshidan daqiqalar).
+    Format noto'g'ri bo'lsa ValidationError.
+    """
+    if not isinstance(working_hours, dict):
+        raise ValidationError("working_hours obyekt bo'lishi kerak")
+
+    parsed = {}
+    for day, intervals in working_hours.items():
+        if day not in WEEKDAYS:
+            raise ValidationError(f"Noma'lum hafta kuni: {day}")
+        try:
+            ranges = sorted((parse_time(start), parse_time(end)) for start, end in intervals)
+        except (TypeError, ValueError):
+            raise ValidationError(f"{day}: oraliqlar [\"HH:MM\", \"HH:MM\"] ko'rinishida bo'lishi kerak")
+
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:] + [(24 * 60 + 1, None)]):
+            if start >= end or end > next_start:
+                raise ValidationError(f"{day}: oraliqlar noto'g'ri yoki ustma-ust tushgan")
+        parsed[WEEKDAYS.index(day)] = ranges
+    return parsed
+
+
+def day_slot_count(intervals, slot_minutes):
+    return sum((end - start) // slot_minutes for start, end in intervals)
+
+
+def day_start(day, minutes=0):
+    return timezone.make_aware(datetime.combine(day, time()) + timedelta(minutes=minutes))
+
+
+def iter_day_slots(day, intervals, slot_minutes):
+    """
+    Bir kunlik ish oraliqlarini slot_minutes lik slotlarga bo'ladi: (starts_at, ends_at).
+    Slotlar saqlanmaydi, har so'rovda shu oynaning o'zi uchun hisoblanadi.
+    """
+    for start, end in intervals:
+        for minute in range(start, end - slot_minutes + 1, slot_minutes):
+            yield day_start(day, minute), day_start(day, minute + slot_minutes)
+
+
+def booked_starts(doctor, start_at, end_at, using=None):
+    return set(
+        Appointment.objects.using(using).filter(
+            doctor=doctor,
+            status=AppointmentStatusChoices.BOOKED,
+            starts_at__gte=start_at,
+            starts_at__lt=end_at
+        ).values_list('starts_at', flat=True)
+    )
+
+
+def booked_slot_counts(doctor, start, end):
+    return dict(
+        Appointment.objects.filter(
+            doctor=doctor,
+            status=AppointmentStatusChoices.BOOKED,
+            starts_at__date__gte=start,
+            starts_at__date__lt=end
+        ).annotate(day=TruncDate('starts_at')).values('day').annotate(total=Count('id')).values_list('day', 'total')
+    )
+
+
+def extend_availability(doctors, start, end):
+    """
+    Har shifokor uchun indeksda hali yo'q kunlarni [start, end) oralig'ida qo'shadi (gorizontni surish).
+    doctors: last_available_date annotatsiyasi bilan.
+    """
+    rows = []
+    for doctor in doctors:
+        schedule = parse_working_hours(doctor.working_hours or {})
+        day = max(start, doctor.last_available_date + timedelta(days=1)) if doctor.last_available_date else start
+        while day < end:
+            total = day_slot_count(schedule.get(day.weekday(), []), doctor.slot_minutes)
+            rows.append(DoctorAvailableDay(doctor=doctor, date=day, total_slots=total, free_slots=total))
+            day += timedelta(days=1)
+    DoctorAvailableDay.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+    return len(rows)
+
+
+def rebuild_doctor_availability(doctor, start=None, days=None):
+    """
+    Shifokorning oldindagi kunlari uchun availability qatorlarini working_hours dan qayta hisoblaydi.
+    working_hours, slot_minutes yoki status o'zgarganda va refresh_doctor_availability --rebuild da chaqiriladi.
+    """
+    start = start or timezone.localdate()
+    days = settings.DOCTOR_AVAILABILITY_DAYS if days is None else days
+    end = start + timedelta(days=days)
+
+    if not doctor.status:
+        DoctorAvailableDay.objects.filter(doctor=doctor, date__gte=start).delete()
+        return 0
+
+    schedule = parse_working_hours(doctor.working_hours or {})
+    booked = booked_slot_counts(doctor, start, end)
+    rows = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        total = day_slot_count(schedule.get(day.weekday(), []), doctor.slot_minutes)
+        rows.append(DoctorAvailableDay(
+            doctor=doctor, date=day, total_slots=total, free_slots=max(total - booked.get(day, 0), 0)
+        ))
+
+    DoctorAvailableDay.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['doctor', 'date'],
+        update_fields=['total_slots', 'free_slots', 'updated_at'],
+    )
+    DoctorAvailableDay.objects.filter(doctor=doctor, date__gte=end).delete()
+    return len(rows)
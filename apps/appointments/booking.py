@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from apps.appointments.availability import parse_working_hours, iter_day_slots, booked_starts, day_start
+from apps.appointments.models import Appointment, AppointmentStatusChoices, DoctorAvailableDay
+from apps.appointments.reminders import schedule_reminders, cancel_reminders
+from apps.appointments.slot_cache import mark_slot
+from apps.utils.CustomValidationError import CustomValidationError
+
+
+def generate_slots(doctor, start_date, days):
+    """
+    [start_date, start_date + days) oynasi uchun {date: [(starts_at, ends_at, available), ...]}.
+    """
+    schedule = parse_working_hours(doctor.working_hours or {})
+    end_date = start_date + timedelta(days=days)
+    booked = booked_starts(doctor, day_start(start_date), day_start(end_date))
+    now = timezone.now()
+
+    slots = {}
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        slots[day] = [
+            (starts_at, ends_at, starts_at > now and starts_at not in booked)
+            for starts_at, ends_at in iter_day_slots(day, schedule.get(day.weekday(), []), doctor.slot_minutes)
+        ]
+    return slots
+
+
+def find_slot(doctor, starts_at):
+    starts_at = timezone.localtime(starts_at)
+    schedule = parse_working_hours(doctor.working_hours or {})
+    for slot_start, slot_end in iter_day_slots(starts_at.date(), schedule.get(starts_at.weekday(), []),
+                                               doctor.slot_minutes):
+        if slot_start == starts_at:
+            return slot_start, slot_end
+    return None
+
+
+def _change_free_slots(doctor_id, day, delta):
+    queryset = DoctorAvailableDay.objects.filter(doctor_id=doctor_id, date=day)
+    if delta < 0:
+        queryset.update(free_slots=Greatest(F('free_slots') + delta, 0))
+    else:
+        queryset.update(free_slots=Least(F('free_slots') + delta, F('total_slots')))
+
+
+def _overlapping(doctor, patient, starts_at, ends_at):
+    return Appointment.objects.filter(
+        Q(doctor=doctor) | Q(patient=patient),
+        status=AppointmentStatusChoices.BOOKED, starts_at__lt=ends_at, ends_at__gt=starts_at
+    )
+
+
+def book_appointment(doctor, patient, starts_at, note=None):
+    """
+    Slot band qilish uchun oldindan lock olinmaydi: INSERT ni exclusion constraint hakamlaydi.
+    Bir slotga yuzlab so'rov kelganda bittasi o'tadi, qolganlari IntegrityError bilan darhol qaytadi.
+    """
+    if not doctor.status:
+        raise CustomValidationError(detail="Shifokor hozir qabul qilmaydi")
+
+    slot = find_slot(doctor, starts_at)
+    if slot is None:
+        raise CustomValidationError(detail="Bunday slot shifokor ish vaqtida mavjud emas")
+    slot_start, slot_end = slot
+
+    now = timezone.now()
+    if slot_start <= now:
+        raise CustomValidationError(detail="O'tib ketgan vaqtga yozilib bo'lmaydi")
+    if slot_start.date() >= timezone.localdate() + timedelta(days=settings.DOCTOR_AVAILABILITY_DAYS):
+        raise CustomValidationError(
+            detail=f"Faqat {settings.DOCTOR_AVAILABILITY_DAYS} kun oldinga yozilish mumkin"
+        )
+
+    try:
+        with transaction.atomic():
+            if connection.vendor != 'postgresql' and _overlapping(doctor, patient, slot_start, slot_end).exists():
+                # exclusion constraint faqat PostgreSQL da: boshqa bazalarda (SQLite dev) INSERT dan oldin tekshiriladi
+                raise IntegrityError("appointment overlap")
+            appointment = Appointment.objects.create(
+                doctor=doctor, patient=patient, starts_at=slot_start, ends_at=slot_end, note=note
+            )
+            _change_free_slots(doctor.id, slot_start.date(), -1)
+            schedule_reminders(appointment, now)
+            transaction.on_commit(lambda: mark_slot(doctor, slot_start, free=False))
+    except IntegrityError:
+        if Appointment.objects.filter(
+                patient=patient, status=AppointmentStatusChoices.BOOKED,
+                starts_at__lt=slot_end, ends_at__gt=slot_start
+        ).exists():
+            raise CustomValidationError(detail="Bu vaqtda sizda boshqa qabul bor")
+        # kesh slotni bo'sh deb ko'rsatgan bo'lishi mumkin: keyingi o'qishlar DB ga to'g'ri keladi
+        mark_slot(doctor, slot_start, free=False)
+        raise CustomValidationError(detail="Bu slot band qilingan")
+    return appointment
+
+
+def cancel_appointment(appointment_id, user):
+    with transaction.atomic():
+        appointment = (
+            Appointment.objects.select_for_update()
+            .select_related('doctor')
+            .filter(id=appointment_id)
+            .first()
+        )
+        if appointment is None or user.id not in (appointment.patient_id, appointment.doctor.user_id):
+            raise CustomValidationError(detail="Qabul topilmadi")
+        if appointment.status != AppointmentStatusChoices.BOOKED:
+            raise CustomValidationError(detail="Qabul allaqachon bekor qilingan yoki yakunlangan")
+
+        appointment.status = AppointmentStatusChoices.CANCELLED
+        appointment.cancelled_at = timezone.now()
+        appointment.save(update_fields=['status', 'cancelled_at', 'updated_at'])
+        _change_free_slots(appointment.doctor_id, timezone.localtime(appointment.starts_at).date(), 1)
+        cancel_reminders(appointment.id)
+        transaction.on_commit(lambda: mark_slot(appointment.doctor, appointment.starts_at, free=True))
+    return appointment
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+import django_filters
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.appointments.models import Doctor, DoctorAvailableDay
+from apps.utils.base_models import GenderChoices
+
+
+class DoctorListFilter(django_filters.FilterSet):
+    speciality = django_filters.CharFilter(field_name='speciality', lookup_expr='iexact')
+    gender = django_filters.ChoiceFilter(field_name='gender', choices=GenderChoices.choices)
+    experience_year__gte = django_filters.NumberFilter(field_name='experience_year', lookup_expr='gte')
+    rating__gte = django_filters.NumberFilter(field_name='rating', lookup_expr='gte')
+    available_days = django_filters.NumberFilter(method='filter_available_days')
+
+    class Meta:
+        model = Doctor
+        fields = ['speciality', 'gender', 'experience_year__gte', 'rating__gte', 'available_days']
+
+    def filter_available_days(self, queryset, name, value):
+        # "keyingi N kun ichida bo'sh slot bor" - doctor_available_day partial indeksi bo'yicha EXISTS
+        days = min(max(int(value), 1), settings.DOCTOR_AVAILABILITY_DAYS)
+        today = timezone.localdate()
+        return queryset.filter(Exists(
+            DoctorAvailableDay.objects.filter(
+                doctor=OuterRef('pk'),
+                date__gte=today,
+                date__lt=today + timedelta(days=days),
+                free_slots__gt=0
+            )
+        ))
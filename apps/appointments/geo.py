@@ -0,0 +1,178 @@
+import math
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connections, DatabaseError
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_LAT_DEGREE = 111.32
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# radius qidiruvida bbox ni qoplaydigan geohash kataklari soni shundan oshmaydi
+MAX_COVER_CELLS = 16
+
+# PostGIS bo'lsa shu ifoda bo'yicha GiST indeks quriladi (migration 0003); so'rovdagi ifoda u bilan bir xil
+CLINIC_GEOGRAPHY_SQL = 'geography(ST_SetSRID(ST_MakePoint("clinic"."longitude", "clinic"."latitude"), 4326))'
+ORIGIN_GEOGRAPHY_SQL = 'geography(ST_SetSRID(ST_MakePoint(%s, %s), 4326))'
+
+_postgis = {}
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """
+    precision uzunlikdagi geohash katagining o'lchami gradusda: (lat, lng).
+    """
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Markazdan radius_km gacha bo'lgan nuqtalarni o'z ichiga olgan (min_lat, max_lat, min_lng, max_lng).
+    Antimeridian orqali o'tish hisobga olinmaydi (lng -180..180 ga qirqiladi).
+    """
+    lat_delta = radius_km / KM_PER_LAT_DEGREE
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    if min_lat == -90.0 or max_lat == 90.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    lng_delta = radius_km / (KM_PER_LAT_DEGREE * cos_lat)
+    return min_lat, max_lat, max(longitude - lng_delta, -180.0), min(longitude + lng_delta, 180.0)
+
+
+def _steps(start, end, step):
+    value = start
+    while value < end:
+        yield value
+        value += step
+    yield end
+
+
+def cover_cells(box):
+    """
+    bbox ni qoplaydigan geohash prefikslari: eng uzun (eng tor) precision, kataklar soni MAX_COVER_CELLS dan oshmasin.
+    """
+    min_lat, max_lat, min_lng, max_lng = box
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(precision)
+        count = (math.ceil((max_lat - min_lat) / lat_step) + 1) * (math.ceil((max_lng - min_lng) / lng_step) + 1)
+        if count <= MAX_COVER_CELLS or precision == 1:
+            return sorted({
+                encode_geohash(lat, lng, precision)
+                for lat in _steps(min_lat, max_lat, lat_step)
+                for lng in _steps(min_lng, max_lng, lng_step)
+            })
+
+
+def postgis_available(using):
+    if settings.GEO_BACKEND != 'auto':
+        return settings.GEO_BACKEND == 'postgis'
+    if using not in _postgis:
+        connection = connections[using]
+        available = False
+        if connection.vendor == 'postgresql':
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
+                    available = cursor.fetchone() is not None
+            except DatabaseError:
+                available = False
+        _postgis[using] = available
+    return _postgis[using]
+
+
+def _postgis_nearby(queryset, latitude, longitude, radius_km, limit):
+    origin = (longitude, latitude)
+    queryset = queryset.annotate(distance_km=RawSQL(
+        f"ST_Distance({CLINIC_GEOGRAPHY_SQL}, {ORIGIN_GEOGRAPHY_SQL}) / 1000", origin, output_field=FloatField()
+    ))
+    if radius_km is not None:
+        queryset = queryset.filter(RawSQL(
+            f"ST_DWithin({CLINIC_GEOGRAPHY_SQL}, {ORIGIN_GEOGRAPHY_SQL}, %s)",
+            origin + (radius_km * 1000,), output_field=BooleanField()
+        ))
+    # <-> GiST indeks bo'yicha KNN: eng yaqinlar butun jadvalni saralamasdan olinadi
+    return list(queryset.order_by(RawSQL(f"{CLINIC_GEOGRAPHY_SQL} <-> {ORIGIN_GEOGRAPHY_SQL}", origin))[:limit])
+
+
+def _within(queryset, latitude, longitude, radius_km, location):
+    box = bounding_box(latitude, longitude, radius_km)
+    min_lat, max_lat, min_lng, max_lng = box
+    candidates = queryset.filter(
+        reduce(or_, [Q(**{f'{location}geohash__startswith': cell}) for cell in cover_cells(box)]),
+        **{
+            f'{location}latitude__range': (min_lat, max_lat),
+            f'{location}longitude__range': (min_lng, max_lng),
+        }
+    )
+
+    results = []
+    for obj in candidates:
+        point = obj.clinic if location else obj
+        obj.distance_km = haversine_km(latitude, longitude, point.latitude, point.longitude)
+        if obj.distance_km <= radius_km:
+            results.append(obj)
+    results.sort(key=lambda item: item.distance_km)
+    return results
+
+
+def _geohash_nearby(queryset, latitude, longitude, radius_km, limit, location):
+    if radius_km is not None:
+        return _within(queryset, latitude, longitude, radius_km, location)[:limit]
+
+    # k-NN: radius ikki barobardan kengaytiriladi. r ichidagi natijalar to'liq, shuning uchun
+    # ular orasida limit tasi topilsa bular haqiqiy eng yaqinlar
+    radius = settings.GEO_KNN_START_KM
+    while True:
+        results = _within(queryset, latitude, longitude, radius, location)
+        if len(results) >= limit or radius >= settings.GEO_KNN_MAX_KM:
+            return results[:limit]
+        radius = min(radius * 2, settings.GEO_KNN_MAX_KM)
+
+
+def nearby(queryset, latitude, longitude, radius_km=None, limit=20, location=''):
+    """
+    Markazga eng yaqin obyektlar ro'yxati (distance_km atributi bilan, masofa bo'yicha saralangan).
+    radius_km berilsa - shu radius ichidagilar, aks holda k-NN (limit = k).
+    location: joylashuv boshqa modelda bo'lsa lookup prefiksi (Doctor uchun 'clinic__').
+    PostGIS o'rnatilgan bo'lsa geography GiST indeksi, aks holda geohash prefiks indeksi ishlatiladi.
+    """
+    queryset = queryset.filter(**{
+        f'{location}latitude__isnull': False,
+        f'{location}longitude__isnull': False,
+    })
+    if postgis_available(queryset.db):
+        return _postgis_nearby(queryset, latitude, longitude, radius_km, limit)
+    return _geohash_nearby(queryset, latitude, longitude, radius_km, limit, location)
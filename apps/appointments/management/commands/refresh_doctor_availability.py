@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.appointments.availability import rebuild_doctor_availability, extend_availability
+from apps.appointments.models import Doctor, DoctorAvailableDay
+
+
+class Command(BaseCommand):
+    help = "Shifokorlar availability indeksini oldindagi kunlar uchun yangilaydi (har kuni ishga tushiriladi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.DOCTOR_AVAILABILITY_DAYS)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Barcha kunlarni working_hours dan qayta hisoblash (default: faqat yangi kunlar)")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end = today + timedelta(days=options['days'])
+        deleted, _ = DoctorAvailableDay.objects.filter(date__lt=today).delete()
+
+        doctors = Doctor.objects.filter(status=True).order_by('id')
+        if options['rebuild']:
+            count = 0
+            for doctor in doctors.iterator(chunk_size=options['batch_size']):
+                count += rebuild_doctor_availability(doctor, today, options['days'])
+        else:
+            doctors = doctors.annotate(last_available_date=Max('available_days__date'))
+            batch, count = [], 0
+            for doctor in doctors.iterator(chunk_size=options['batch_size']):
+                batch.append(doctor)
+                if len(batch) >= options['batch_size']:
+                    count += extend_availability(batch, today, end)
+                    batch = []
+            count += extend_availability(batch, today, end)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} ta kun qatori yozildi, {deleted} ta o'tgan kun qatori o'chirildi"
+        ))
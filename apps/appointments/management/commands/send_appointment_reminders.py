@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.appointments.reminders import upcoming_reminders, due_reminder_ids, dispatch_reminders, \
+    recover_stuck_reminders
+from apps.appointments.timing_wheel import HierarchicalTimingWheel
+
+
+class Command(BaseCommand):
+    help = "Qabul eslatmalarini (24 soat va 1 soat oldin) muddati kelganda email orqali yuboradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.APPOINTMENT_REMINDER_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true',
+                            help="Worker rejimi: yaqin oynadagi eslatmalar timing wheel da kutiladi")
+        parser.add_argument('--tick', type=float, default=1.0, help="Timing wheel qadami (sekund)")
+        parser.add_argument('--lookahead', type=int, default=settings.APPOINTMENT_REMINDER_LOOKAHEAD_SECONDS,
+                            help="Navbatdan necha sekund oldinga o'qiladi")
+        parser.add_argument('--refresh', type=int, default=30,
+                            help="Navbat necha sekundda bir qayta o'qiladi (yangi band qilingan qabullar uchun)")
+
+    def handle(self, *args, **options):
+        recovered = recover_stuck_reminders()
+        if recovered:
+            self.stderr.write(f"{recovered} ta to'xtab qolgan eslatma FAILED deb belgilandi")
+
+        if not options['loop']:
+            sent, previous = 0, None
+            # bir xil partiya qaytsa - ularni boshqa worker lock qilgan, kutilmaydi
+            while (ids := due_reminder_ids(timezone.now(), options['batch_size'])) and ids != previous:
+                sent += dispatch_reminders(ids)
+                previous = ids
+            self.stdout.write(self.style.SUCCESS(f"{sent} ta eslatma yuborildi"))
+            return
+
+        self.run_worker(options)
+
+    def run_worker(self, options):
+        # DB har refresh da faqat [.., now + lookahead] oynasi uchun indeks bo'yicha o'qiladi,
+        # aniq vaqtni esa xotiradagi wheel kuzatadi: har tick da jadval so'ralmaydi
+        wheel = HierarchicalTimingWheel(time.time(), tick=options['tick'])
+        scheduled = set()
+        loaded_at = None
+
+        while True:
+            if loaded_at is None or time.monotonic() - loaded_at >= options['refresh']:
+                until = timezone.now() + timedelta(seconds=options['lookahead'])
+                for reminder_id, due_at in upcoming_reminders(until):
+                    if reminder_id not in scheduled:
+                        scheduled.add(reminder_id)
+                        wheel.add(reminder_id, due_at.timestamp())
+                recover_stuck_reminders()
+                loaded_at = time.monotonic()
+
+            due = wheel.advance(time.time())
+            for offset in range(0, len(due), options['batch_size']):
+                batch = due[offset:offset + options['batch_size']]
+                sent = dispatch_reminders(batch)
+                # qayta navbatga qo'yilganlari keyingi refresh da yangi due_at bilan qayta o'qiladi
+                scheduled.difference_update(batch)
+                if sent:
+                    self.stdout.write(f"{sent} ta eslatma yuborildi")
+
+            time.sleep(options['tick'])
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.appointments.models import Doctor
+from apps.appointments.ratings import AGGREGATE_FIELDS, find_rating_drift, recompute_doctor_rating
+
+
+class Command(BaseCommand):
+    help = ("Shifokorlarning saqlangan reyting agregatini sharhlardan bo'laklab qayta hisoblab solishtiradi "
+            "(drift bo'lsa --fix bilan tuzatadi)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--fix', action='store_true', help="Farq topilgan shifokorlarni qayta hisoblash")
+
+    def handle(self, *args, **options):
+        doctors = Doctor.objects.only('id', 'rating', *AGGREGATE_FIELDS).order_by('id')
+        last_id, checked, drifted = 0, 0, 0
+
+        # id bo'yicha keyset: har bo'lak bitta GROUP BY so'rovi, butun jadval bir tranzaksiyada ushlanmaydi
+        while True:
+            batch = list(doctors.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            checked += len(batch)
+
+            for doctor_id, (stored, actual) in find_rating_drift(batch).items():
+                drifted += 1
+                self.stdout.write(self.style.WARNING(f"Doctor {doctor_id}: saqlangan {stored}, haqiqiy {actual}"))
+                if options['fix']:
+                    recompute_doctor_rating(doctor_id)
+
+        message = f"{checked} ta shifokor tekshirildi, {drifted} tasida farq topildi"
+        if options['fix'] and drifted:
+            message += " va tuzatildi"
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:00
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='Doctor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('speciality', models.CharField(max_length=255)),
+                ('experience_year', models.PositiveSmallIntegerField(default=0)),
+                ('working_hours', models.JSONField(blank=True, default=dict)),
+                ('slot_minutes', models.PositiveSmallIntegerField(default=30)),
+                ('gender', models.CharField(choices=[('erkak', 'erkak'), ('ayol', 'ayol')], null=True)),
+                ('bio', models.TextField(blank=True, null=True)),
+                ('qualifications', models.TextField(null=True)),
+                ('rating', models.FloatField(default=0)),
+                ('status', models.BooleanField(default=True)),
+                ('user', models.OneToOneField(null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                              related_name='doctor', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Doctor',
+                'verbose_name_plural': 'Doctors',
+                'db_table': 'doctor',
+                'ordering': ['-rating', 'id'],
+                'indexes': [
+                    models.Index(condition=models.Q(('status', True)), fields=['speciality', '-rating'],
+                                 name='doctor_speciality_rating_idx'),
+                    models.Index(condition=models.Q(('status', True)), fields=['-rating'], name='doctor_rating_idx'),
+                    models.Index(condition=models.Q(('status', True)), fields=['experience_year'],
+                                 name='doctor_experience_idx'),
+                    models.Index(condition=models.Q(('status', True)), fields=['gender', 'speciality'],
+                                 name='doctor_gender_speciality_idx'),
+                    django.contrib.postgres.indexes.GinIndex(fields=['speciality'], name='doctor_speciality_trgm_idx',
+                                                             opclasses=['gin_trgm_ops']),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='DoctorAvailableDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_slots', models.PositiveSmallIntegerField(default=0)),
+                ('free_slots', models.PositiveSmallIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                             related_name='available_days', to='appointments.doctor')),
+            ],
+            options={
+                'verbose_name': 'Doctor Available Day',
+                'verbose_name_plural': 'Doctor Available Days',
+                'db_table': 'doctor_available_day',
+                'constraints': [models.UniqueConstraint(fields=('doctor', 'date'),
+                                                        name='doctor_available_day_unique')],
+                'indexes': [models.Index(condition=models.Q(('free_slots__gt', 0)), fields=['date', 'doctor'],
+                                         name='doctor_available_free_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:00
+
+import apps.appointments.models
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name='Appointment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('booked', 'Booked'), ('cancelled', 'Cancelled'),
+                                                     ('completed', 'Completed')], default='booked', max_length=20)),
+                ('note', models.TextField(blank=True, null=True)),
+                ('cancelled_at', models.DateTimeField(blank=True, null=True)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                             related_name='appointments', to='appointments.doctor')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                              related_name='appointments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Appointment',
+                'verbose_name_plural': 'Appointments',
+                'db_table': 'appointment',
+                'ordering': ['starts_at'],
+                'indexes': [
+                    models.Index(condition=models.Q(('status', 'booked')), fields=['doctor', 'starts_at'],
+                                 name='appointment_doctor_booked_idx'),
+                    models.Index(fields=['patient', '-starts_at'], name='appointment_patient_idx'),
+                ],
+                'constraints': [
+                    apps.appointments.models.PostgresExclusionConstraint(
+                        condition=models.Q(('status', 'booked')),
+                        expressions=[
+                            (apps.appointments.models.TsTzRange('starts_at', 'ends_at',
+                                                                django.contrib.postgres.fields.ranges.RangeBoundary()),
+                             '&&'),
+                            ('doctor', '='),
+                        ],
+                        name='appointment_doctor_no_overlap',
+                    ),
+                    apps.appointments.models.PostgresExclusionConstraint(
+                        condition=models.Q(('status', 'booked')),
+                        expressions=[
+                            (apps.appointments.models.TsTzRange('starts_at', 'ends_at',
+                                                                django.contrib.postgres.fields.ranges.RangeBoundary()),
+                             '&&'),
+                            ('patient', '='),
+                        ],
+                        name='appointment_patient_no_overlap',
+                    ),
+                ],
+            },
+        ),
+    ]
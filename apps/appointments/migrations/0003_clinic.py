@@ -0,0 +1,77 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models, transaction, DatabaseError
+
+CLINIC_GEOGRAPHY_INDEX = 'clinic_geography_gist_idx'
+
+
+def create_postgis_index(apps, schema_editor):
+    # PostGIS ixtiyoriy: serverda bo'lmasa yoki extension yaratishga huquq bo'lmasa geohash indeksi ishlaydi
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+        if cursor.fetchone() is None:
+            return
+        try:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+        except DatabaseError:
+            return
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {CLINIC_GEOGRAPHY_INDEX} ON clinic USING GIST "
+            "(geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))) "
+            "WHERE status AND latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+
+
+def drop_postgis_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {CLINIC_GEOGRAPHY_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0002_appointment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Clinic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('name', models.CharField(max_length=255)),
+                ('address', models.CharField(blank=True, max_length=500, null=True)),
+                ('phone_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('geohash', models.CharField(blank=True, editable=False, max_length=12, null=True)),
+                ('status', models.BooleanField(default=True)),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                              related_name='clinic', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Clinic',
+                'verbose_name_plural': 'Clinics',
+                'db_table': 'clinic',
+                'ordering': ['name'],
+                'indexes': [models.Index(condition=models.Q(('status', True)), fields=['geohash'],
+                                         name='clinic_geohash_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='clinic',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name='doctors', to='appointments.clinic'),
+        ),
+        migrations.RunPython(create_postgis_index, drop_postgis_index),
+    ]
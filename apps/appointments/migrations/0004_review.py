@@ -0,0 +1,91 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:00
+
+import apps.appointments.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def reset_doctor_ratings(apps, schema_editor):
+    # sharhlar hali yo'q: eski qo'lda kiritilgan reytinglar Bayes prior bilan almashtiriladi
+    Doctor = apps.get_model('appointments', 'Doctor')
+    Doctor.objects.update(rating=settings.DOCTOR_RATING_PRIOR_MEAN)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0003_clinic'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='doctor',
+            name='rating',
+            field=models.FloatField(default=apps.appointments.models.prior_rating, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='stars_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='stars_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='stars_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='stars_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='stars_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(reset_doctor_ratings, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('rating', models.PositiveSmallIntegerField()),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews',
+                                             to='appointments.doctor')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                              related_name='doctor_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Review',
+                'verbose_name_plural': 'Reviews',
+                'db_table': 'doctor_review',
+                'ordering': ['-created_at'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('doctor', 'patient'), name='review_doctor_patient_unique'),
+                    models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)),
+                                           name='review_rating_range'),
+                ],
+                'indexes': [models.Index(fields=['doctor', '-created_at'], name='review_doctor_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0004_review'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('24h', '24 hours before'), ('1h', '1 hour before')],
+                                          max_length=10)),
+                ('due_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'),
+                                                     ('cancelled', 'Cancelled'), ('failed', 'Failed')],
+                                            default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('appointment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                                                  related_name='reminders', to='appointments.appointment')),
+            ],
+            options={
+                'verbose_name': 'Appointment Reminder',
+                'verbose_name_plural': 'Appointment Reminders',
+                'db_table': 'appointment_reminder',
+                'constraints': [models.UniqueConstraint(fields=('appointment', 'kind'),
+                                                        name='appointment_reminder_unique')],
+                'indexes': [
+                    models.Index(condition=models.Q(('status', 'pending')), fields=['due_at', 'id'],
+                                 name='reminder_pending_due_idx'),
+                    models.Index(condition=models.Q(('status', 'sending')), fields=['claimed_at'],
+                                 name='reminder_sending_idx'),
+                ],
+            },
+        ),
+    ]
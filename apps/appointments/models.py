@@ -1,28 +1,297 @@
-
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models import Func, Q
 
-from apps.utils.base_models import CreateUpdateBaseModel
+from apps.appointments.geo import encode_geohash
+from apps.utils.base_models import CreateUpdateBaseModel, GenderChoices
 
 
 User = get_user_model()
 
+RATING_STARS = (1, 2, 3, 4, 5)
+
+
+def prior_rating():
+    # hali sharh olmagan shifokorning Bayes reytingi - prior o'rtacha
+    return settings.DOCTOR_RATING_PRIOR_MEAN
+
+
+class Clinic(CreateUpdateBaseModel):
+    user = models.OneToOneField(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='clinic')
+    name = models.CharField(max_length=255)
+    address = models.CharField(max_length=500, null=True, blank=True)
+    phone_number = models.CharField(max_length=20, null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # latitude/longitude dan save() da hisoblanadi: PostGIS bo'lmaganda "yaqin atrof" prefiks qidiruvi uchun
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
+    status = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'clinic'
+        verbose_name = 'Clinic'
+        verbose_name_plural = 'Clinics'
+        ordering = ['name']
+        indexes = [
+            # geohash__startswith -> LIKE 'abc%': C bo'lmagan collation da varchar_pattern_ops kerak
+            models.Index(fields=['geohash'], name='clinic_geohash_idx', opclasses=['varchar_pattern_ops'],
+                         condition=Q(status=True)),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValidationError("latitude va longitude birga kiritilishi kerak")
+        if self.latitude is not None and not (-90 <= self.latitude <= 90 and -180 <= self.longitude <= 180):
+            raise ValidationError("Koordinatalar noto'g'ri")
+
+    def save(self, *args, **kwargs):
+        self.geohash = encode_geohash(self.latitude, self.longitude) \
+            if self.latitude is not None and self.longitude is not None else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
+
+class Doctor(CreateUpdateBaseModel):
+    user = models.OneToOneField(User, on_delete=models.SET_NULL, null=True, related_name='doctor')
+    clinic = models.ForeignKey(Clinic, on_delete=models.SET_NULL, null=True, blank=True, related_name='doctors')
+    speciality = models.CharField(max_length=255)
+    experience_year = models.PositiveSmallIntegerField(default=0)
+    # {"mon": [["09:00", "13:00"], ["14:00", "18:00"]], ..., "sun": []}
+    working_hours = models.JSONField(default=dict, blank=True)
+    slot_minutes = models.PositiveSmallIntegerField(default=30)
+    gender = models.CharField(null=True, choices=GenderChoices.choices)
+    bio = models.TextField(null=True, blank=True)
+    qualifications = models.TextField(null=True)
+    # Review yozilganda/o'zgarganda/o'chirilganda bitta UPDATE bilan yangilanadi (apps.appointments.ratings).
+    # rating - Bayes o'rtacha; directory faqat shu saqlangan qiymat bo'yicha saralaydi
+    rating = models.FloatField(default=prior_rating, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    stars_1 = models.PositiveIntegerField(default=0, editable=False)
+    stars_2 = models.PositiveIntegerField(default=0, editable=False)
+    stars_3 = models.PositiveIntegerField(default=0, editable=False)
+    stars_4 = models.PositiveIntegerField(default=0, editable=False)
+    stars_5 = models.PositiveIntegerField(default=0, editable=False)
+    status = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'doctor'
+        verbose_name = 'Doctor'
+        verbose_name_plural = 'Doctors'
+        ordering = ['-rating', 'id']
+        indexes = [
+            # directory faqat status=True shifokorlarni ko'rsatadi
+            models.Index(fields=['speciality', '-rating'], name='doctor_speciality_rating_idx',
+                         condition=Q(status=True)),
+            models.Index(fields=['-rating'], name='doctor_rating_idx', condition=Q(status=True)),
+            models.Index(fields=['experience_year'], name='doctor_experience_idx', condition=Q(status=True)),
+            models.Index(fields=['gender', 'speciality'], name='doctor_gender_speciality_idx',
+                         condition=Q(status=True)),
+            # speciality bo'yicha icontains qidiruv (pg_trgm)
+            GinIndex(fields=['speciality'], name='doctor_speciality_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
+    def __str__(self) -> str:
+        if self.user:
+            return self.user.full_name or self.user.contact
+        return str(self.pk)
+
+    def clean(self):
+        from apps.appointments.availability import parse_working_hours
+        parse_working_hours(self.working_hours or {})
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        return {stars: getattr(self, f'stars_{stars}') for stars in RATING_STARS}
+
+
+class DoctorAvailableDay(models.Model):
+    """
+    Availability indeksi: har shifokor uchun oldindagi DOCTOR_AVAILABILITY_DAYS kun bo'yicha bitta qator.
+    Directory "N kun ichida bo'sh" filtri working_hours JSON ni emas, shu jadvalni o'qiydi.
+    """
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='available_days')
+    date = models.DateField()
+    total_slots = models.PositiveSmallIntegerField(default=0)
+    free_slots = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'doctor_available_day'
+        verbose_name = 'Doctor Available Day'
+        verbose_name_plural = 'Doctor Available Days'
+        constraints = [
+            models.UniqueConstraint(fields=['doctor', 'date'], name='doctor_available_day_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'doctor'], name='doctor_available_free_idx', condition=Q(free_slots__gt=0)),
+        ]
+
+    def __str__(self):
+        return f"{self.doctor_id} {self.date}: {self.free_slots}/{self.total_slots}"
+
+
+class TsTzRange(Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+
+class PostgresExclusionConstraint(ExclusionConstraint):
+    """
+    ExclusionConstraint faqat PostgreSQL da (btree_gist bilan) yaratiladi. SQLite (lokal dev, testlar) da
+    DDL va validate() hech narsa qilmaydi: u yerda ustma-ust yozuvni booking dagi tekshiruv ushlaydi,
+    poygadan himoya faqat PostgreSQL da.
+    """
+
+    def constraint_sql(self, model, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return None
+        return super().constraint_sql(model, schema_editor)
+
+    def create_sql(self, model, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return None
+        return super().create_sql(model, schema_editor)
+
+    def remove_sql(self, model, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return None
+        return super().remove_sql(model, schema_editor)
+
+    def validate(self, model, instance, exclude=None, using=DEFAULT_DB_ALIAS):
+        if connections[using].vendor != 'postgresql':
+            return
+        super().validate(model, instance, exclude=exclude, using=using)
+
+
+class AppointmentStatusChoices(models.TextChoices):
+    BOOKED = ('booked', 'Booked')
+    CANCELLED = ('cancelled', 'Cancelled')
+    COMPLETED = ('completed', 'Completed')
+
+
+class Appointment(CreateUpdateBaseModel):
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='appointments')
+    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='appointments')
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=AppointmentStatusChoices.choices,
+                              default=AppointmentStatusChoices.BOOKED)
+    note = models.TextField(null=True, blank=True)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'appointment'
+        verbose_name = 'Appointment'
+        verbose_name_plural = 'Appointments'
+        ordering = ['starts_at']
+        constraints = [
+            # bitta shifokor vaqti ikki bemorga berilmaydi; tekshiruv DB darajasida, poyga bo'lsa ham
+            PostgresExclusionConstraint(
+                name='appointment_doctor_no_overlap',
+                expressions=[
+                    (TsTzRange('starts_at', 'ends_at', RangeBoundary()), RangeOperators.OVERLAPS),
+                    ('doctor', RangeOperators.EQUAL),
+                ],
+                condition=Q(status=AppointmentStatusChoices.BOOKED),
+            ),
+            PostgresExclusionConstraint(
+                name='appointment_patient_no_overlap',
+                expressions=[
+                    (TsTzRange('starts_at', 'ends_at', RangeBoundary()), RangeOperators.OVERLAPS),
+                    ('patient', RangeOperators.EQUAL),
+                ],
+                condition=Q(status=AppointmentStatusChoices.BOOKED),
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['doctor', 'starts_at'], name='appointment_doctor_booked_idx',
+                         condition=Q(status=AppointmentStatusChoices.BOOKED)),
+            models.Index(fields=['patient', '-starts_at'], name='appointment_patient_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.doctor_id} {self.starts_at:%Y-%m-%d %H:%M} ({self.status})"
+
+
+class Review(CreateUpdateBaseModel):
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='reviews')
+    patient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='doctor_reviews')
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'doctor_review'
+        verbose_name = 'Review'
+        verbose_name_plural = 'Reviews'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['doctor', 'patient'], name='review_doctor_patient_unique'),
+            models.CheckConstraint(condition=Q(rating__gte=1, rating__lte=5), name='review_rating_range'),
+        ]
+        indexes = [
+            models.Index(fields=['doctor', '-created_at'], name='review_doctor_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.doctor_id} <- {self.patient_id}: {self.rating}"
+
+
+class ReminderKindChoices(models.TextChoices):
+    DAY_BEFORE = ('24h', '24 hours before')
+    HOUR_BEFORE = ('1h', '1 hour before')
+
+
+class ReminderStatusChoices(models.TextChoices):
+    PENDING = ('pending', 'Pending')
+    SENDING = ('sending', 'Sending')
+    SENT = ('sent', 'Sent')
+    CANCELLED = ('cancelled', 'Cancelled')
+    FAILED = ('failed', 'Failed')
+
+
+class AppointmentReminder(CreateUpdateBaseModel):
+    """
+    Eslatmalar navbati: qabul band qilinganda yaratiladi, worker due_at bo'yicha partial indeksdan o'qiydi.
+    appointment jadvali har daqiqa skanerlanmaydi.
+    """
+    appointment = models.ForeignKey(Appointment, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=10, choices=ReminderKindChoices.choices)
+    due_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=ReminderStatusChoices.choices,
+                              default=ReminderStatusChoices.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
 
+    class Meta:
+        db_table = 'appointment_reminder'
+        verbose_name = 'Appointment Reminder'
+        verbose_name_plural = 'Appointment Reminders'
+        constraints = [
+            models.UniqueConstraint(fields=['appointment', 'kind'], name='appointment_reminder_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['due_at', 'id'], name='reminder_pending_due_idx',
+                         condition=Q(status=ReminderStatusChoices.PENDING)),
+            models.Index(fields=['claimed_at'], name='reminder_sending_idx',
+                         condition=Q(status=ReminderStatusChoices.SENDING)),
+        ]
 
-# class Doctor(CreateUpdateBaseModel):
-#     user = models.OneToOneField(User, on_delete=models.SET_NULL, null=True, related_name='doctor')
-#     speciality = models.CharField(max_length=255)
-#     exprience_year = models.PositiveSmallIntegerField(default=0)
-#     working_hours = models.JSONField(default=dict, blank=True)
-#     gender = models.CharField(null=True, choices=Gender.choices)
-#     bio = models.TextField(null=True, blank=True)
-#     qualifications = models.TextField(null=True)
-#     rating = models.FloatField(default=0)
-#     status = models.BooleanField(default=True)
-#
-#     def __str__(self) -> str:
-#         if self.user:
-#             return self.user.full_name or self.contact
-#         return self.pk
-
-# class Patient(CreateUpdateBaseModel):
-#     user = models.OneToOneField(User, on_delete=models.SET_NULL, null=True, related_name='patient')
+    def __str__(self):
+        return f"{self.appointment_id} {self.kind}: {self.status}"
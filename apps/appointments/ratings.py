@@ -0,0 +1,133 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Sum, Q, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from apps.appointments.models import Doctor, Review, RATING_STARS, AppointmentStatusChoices, Appointment
+from apps.utils.CustomValidationError import CustomValidationError
+
+AGGREGATE_FIELDS = ('rating_count', 'rating_sum', *(f'stars_{stars}' for stars in RATING_STARS))
+
+
+def bayesian_rating(count, total):
+    prior_count = settings.DOCTOR_RATING_PRIOR_COUNT
+    return (prior_count * settings.DOCTOR_RATING_PRIOR_MEAN + total) / (prior_count + count)
+
+
+def review_key(review):
+    # signal lar uchun: (doctor_id, yulduz) yoki saqlanmagan sharh uchun None
+    return (review.doctor_id, review.rating) if review.pk else None
+
+
+def rating_deltas(old_key, new_key):
+    """
+    Sharh o'zgarishini shifokorlar bo'yicha agregat deltalariga aylantiradi: {doctor_id: Counter(field -> delta)}.
+    """
+    deltas = defaultdict(Counter)
+    for key, sign in ((old_key, -1), (new_key, 1)):
+        if key is None:
+            continue
+        doctor_id, stars = key
+        deltas[doctor_id].update({'rating_count': sign, 'rating_sum': sign * stars, f'stars_{stars}': sign})
+    return {doctor_id: delta for doctor_id, delta in deltas.items() if any(delta.values())}
+
+
+def apply_rating_deltas(deltas):
+    """
+    Har shifokor uchun bitta UPDATE: hisoblagichlar va Bayes reyting bir qatorda, qator lock i ostida yangilanadi.
+    SET ichidagi F() eski qiymatni o'qiydi, shuning uchun reyting yangi count/sum dan deltalar bilan hisoblanadi.
+    Sharh yozuvi bilan bitta tranzaksiyada chaqirilishi kerak.
+    """
+    prior_count = settings.DOCTOR_RATING_PRIOR_COUNT
+    prior_total = prior_count * settings.DOCTOR_RATING_PRIOR_MEAN
+    for doctor_id, delta in sorted(deltas.items()):
+        new_count = F('rating_count') + delta['rating_count']
+        new_sum = F('rating_sum') + delta['rating_sum']
+        Doctor.objects.filter(id=doctor_id).update(
+            **{field: F(field) + value for field, value in delta.items() if value},
+            rating=(Value(prior_total) + Cast(new_sum, FloatField())) / (Value(prior_count) + new_count),
+            updated_at=timezone.now()
+        )
+
+
+def doctor_rating_aggregates(doctor_ids):
+    """
+    Sharhlar jadvalidan qayta hisoblangan agregatlar: {doctor_id: {field: value}}. Sharhi yo'q shifokor - nollar.
+    """
+    rows = (
+        Review.objects.filter(doctor_id__in=doctor_ids)
+        .values('doctor_id')
+        .annotate(
+            rating_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{f'stars_{stars}': Count('id', filter=Q(rating=stars)) for stars in RATING_STARS}
+        )
+        .order_by()
+    )
+    aggregates = {doctor_id: dict.fromkeys(AGGREGATE_FIELDS, 0) for doctor_id in doctor_ids}
+    for row in rows:
+        aggregates[row.pop('doctor_id')] = row
+    for values in aggregates.values():
+        values['rating'] = bayesian_rating(values['rating_count'], values['rating_sum'])
+    return aggregates
+
+
+def find_rating_drift(doctors):
+    """
+    doctors: saqlangan agregat maydonlari bilan. Qayta hisoblangandan farq qiladiganlar: {doctor_id: (stored, actual)}.
+    """
+    actual = doctor_rating_aggregates([doctor.id for doctor in doctors])
+    drift = {}
+    for doctor in doctors:
+        stored = {field: getattr(doctor, field) for field in AGGREGATE_FIELDS + ('rating',)}
+        expected = actual[doctor.id]
+        if any(stored[field] != expected[field] for field in AGGREGATE_FIELDS) \
+                or abs(stored['rating'] - expected['rating']) > 1e-9:
+            drift[doctor.id] = (stored, expected)
+    return drift
+
+
+def recompute_doctor_rating(doctor_id):
+    # shifokor qatori lock qilinadi: shu vaqtda kelgan sharh deltasi qayta hisoblangan qiymat ustiga tushadi
+    with transaction.atomic():
+        Doctor.objects.select_for_update().filter(id=doctor_id).values_list('id').first()
+        values = doctor_rating_aggregates([doctor_id])[doctor_id]
+        Doctor.objects.filter(id=doctor_id).update(**values, updated_at=timezone.now())
+    return values
+
+
+def create_review(doctor, patient, rating, comment=None):
+    if not Appointment.objects.filter(
+            doctor=doctor, patient=patient, starts_at__lt=timezone.now()
+    ).exclude(status=AppointmentStatusChoices.CANCELLED).exists():
+        raise CustomValidationError(detail="Faqat qabulda bo'lgan shifokorga sharh qoldirish mumkin")
+    try:
+        with transaction.atomic():
+            return Review.objects.create(doctor=doctor, patient=patient, rating=rating, comment=comment)
+    except IntegrityError:
+        raise CustomValidationError(detail="Siz bu shifokorga sharh qoldirgansiz")
+
+
+def update_review(review_id, patient, rating=None, comment=None):
+    with transaction.atomic():
+        # lock: parallel tahrirlarda eski yulduz (delta uchun) aniq bo'lishi uchun
+        review = Review.objects.select_for_update().filter(id=review_id, patient=patient).first()
+        if review is None:
+            raise CustomValidationError(detail="Sharh topilmadi")
+        if rating is not None:
+            review.rating = rating
+        if comment is not None:
+            review.comment = comment
+        review.save(update_fields=['rating', 'comment', 'updated_at'])
+    return review
+
+
+def delete_review(review_id, patient):
+    with transaction.atomic():
+        review = Review.objects.select_for_update().filter(id=review_id, patient=patient).first()
+        if review is None:
+            raise CustomValidationError(detail="Sharh topilmadi")
+        review.delete()
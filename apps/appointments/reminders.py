@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.appointments.models import AppointmentReminder, ReminderKindChoices, ReminderStatusChoices, \
+    AppointmentStatusChoices
+from apps.users.choices import UserContactTypeChoices
+from apps.users.tasks import send_mail_batch
+
+REMINDER_OFFSETS = {
+    ReminderKindChoices.DAY_BEFORE: timedelta(hours=24),
+    ReminderKindChoices.HOUR_BEFORE: timedelta(hours=1),
+}
+
+
+def schedule_reminders(appointment, now=None):
+    # qabul bilan bitta tranzaksiyada: vaqti o'tib ketgan eslatma (masalan 30 daqiqa oldin yozilganda 1h) yaratilmaydi
+    now = now or timezone.now()
+    AppointmentReminder.objects.bulk_create([
+        AppointmentReminder(appointment=appointment, kind=kind, due_at=appointment.starts_at - offset)
+        for kind, offset in REMINDER_OFFSETS.items()
+        if appointment.starts_at - offset > now
+    ], ignore_conflicts=True)
+
+
+def cancel_reminders(appointment_id):
+    AppointmentReminder.objects.filter(
+        appointment_id=appointment_id, status=ReminderStatusChoices.PENDING
+    ).update(status=ReminderStatusChoices.CANCELLED, updated_at=timezone.now())
+
+
+def upcoming_reminders(until):
+    """
+    due_at <= until bo'lgan kutilayotgan eslatmalar (id, due_at) - reminder_pending_due_idx bo'yicha.
+    """
+    return (
+        AppointmentReminder.objects.filter(status=ReminderStatusChoices.PENDING, due_at__lte=until)
+        .order_by('due_at', 'id')
+        .values_list('id', 'due_at')
+        .iterator(chunk_size=2000)
+    )
+
+
+def due_reminder_ids(now, limit):
+    return list(
+        AppointmentReminder.objects.filter(status=ReminderStatusChoices.PENDING, due_at__lte=now)
+        .order_by('due_at', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+
+
+def recover_stuck_reminders(now=None):
+    """
+    SENDING holatida qolib ketganlar (worker xat yuborish paytida to'xtagan) qayta yuborilmaydi:
+    xat ketgan-ketmagani noma'lum, dublikatdan ko'ra FAILED afzal.
+    """
+    now = now or timezone.now()
+    return AppointmentReminder.objects.filter(
+        status=ReminderStatusChoices.SENDING,
+        claimed_at__lt=now - timedelta(seconds=settings.APPOINTMENT_REMINDER_CLAIM_TIMEOUT)
+    ).update(
+        status=ReminderStatusChoices.FAILED,
+        error="Worker yuborish vaqtida to'xtagan, eslatma qayta yuborilmadi",
+        updated_at=now
+    )
+
+
+def reminder_message(reminder):
+    appointment = reminder.appointment
+    doctor = appointment.doctor
+    doctor_name = doctor.user.full_name if doctor.user and doctor.user.full_name else doctor.speciality
+    starts_at = timezone.localtime(appointment.starts_at)
+    subject = "Qabul eslatmasi"
+    message = (
+        f"Eslatma: {starts_at:%d.%m.%Y} soat {starts_at:%H:%M} da "
+        f"{doctor_name} ({doctor.speciality}) qabuliga yozilgansiz."
+    )
+    return appointment.patient.contact, subject, message
+
+
+def _skip_reason(reminder, now):
+    appointment = reminder.appointment
+    if appointment.status != AppointmentStatusChoices.BOOKED or appointment.starts_at <= now:
+        return "Qabul bekor qilingan yoki o'tib ketgan"
+    patient = appointment.patient
+    if patient.deleted_at is not None or patient.contact_type != UserContactTypeChoices.EMAIL:
+        return "Bemorning email manzili yo'q"
+    return None
+
+
+def dispatch_reminders(ids, now=None):
+    """
+    Muddati kelgan eslatmalarni partiya qilib yuboradi. Avval PENDING -> SENDING claim commit qilinadi
+    (skip_locked: parallel workerlar bir eslatmani ikki marta olmaydi), keyin xatlar bitta SMTP ulanish
+    orqali ketadi. Yuborilmagani attempts bo'yicha qayta navbatga qo'yiladi yoki FAILED bo'ladi.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        reminders = list(
+            AppointmentReminder.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(id__in=ids, status=ReminderStatusChoices.PENDING, due_at__lte=now)
+            .select_related('appointment__doctor__user', 'appointment__patient')
+        )
+        if not reminders:
+            return 0
+        AppointmentReminder.objects.filter(id__in=[reminder.id for reminder in reminders]).update(
+            status=ReminderStatusChoices.SENDING, claimed_at=now, attempts=F('attempts') + 1, updated_at=now
+        )
+
+    deliverable = []
+    for reminder in reminders:
+        reason = _skip_reason(reminder, now)
+        if reason:
+            AppointmentReminder.objects.filter(id=reminder.id).update(
+                status=ReminderStatusChoices.CANCELLED, error=reason, updated_at=timezone.now()
+            )
+        else:
+            deliverable.append(reminder)
+
+    errors = send_mail_batch([reminder_message(reminder) for reminder in deliverable])
+
+    sent_ids = [reminder.id for index, reminder in enumerate(deliverable) if index not in errors]
+    AppointmentReminder.objects.filter(id__in=sent_ids).update(
+        status=ReminderStatusChoices.SENT, sent_at=timezone.now(), error=None, updated_at=timezone.now()
+    )
+    for index, error in errors.items():
+        reminder = deliverable[index]
+        attempts = reminder.attempts + 1
+        if attempts >= settings.APPOINTMENT_REMINDER_MAX_ATTEMPTS:
+            changes = {'status': ReminderStatusChoices.FAILED}
+        else:
+            retry_at = timezone.now() + timedelta(seconds=settings.APPOINTMENT_REMINDER_RETRY_SECONDS * attempts)
+            changes = {'status': ReminderStatusChoices.PENDING, 'due_at': retry_at}
+        AppointmentReminder.objects.filter(id=reminder.id).update(**changes, error=error, updated_at=timezone.now())
+    return len(sent_ids)
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from apps.appointments.models import Appointment, Doctor
+
+
+class AppointmentBookSerializer(serializers.Serializer):
+    doctor = serializers.PrimaryKeyRelatedField(queryset=Doctor.objects.filter(status=True))
+    starts_at = serializers.DateTimeField()
+    note = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=1000)
+
+
+class AppointmentSerializer(serializers.ModelSerializer):
+    doctor_name = serializers.CharField(source='doctor.user.full_name', read_only=True, default=None)
+    speciality = serializers.CharField(source='doctor.speciality', read_only=True)
+
+    class Meta:
+        model = Appointment
+        fields = ['id', 'doctor', 'doctor_name', 'speciality', 'patient', 'starts_at', 'ends_at', 'status', 'note',
+                  'cancelled_at', 'created_at']
+        read_only_fields = fields
+
+
+class DoctorSlotSerializer(serializers.Serializer):
+    starts_at = serializers.DateTimeField()
+    ends_at = serializers.DateTimeField()
+    available = serializers.BooleanField()
+
+
+class DoctorDaySlotsSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    slots = DoctorSlotSerializer(many=True)
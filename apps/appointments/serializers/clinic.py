@@ -0,0 +1,48 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from apps.appointments.models import Clinic
+from apps.appointments.serializers.doctor import DoctorListSerializer
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(required=False, min_value=0.1)
+    k = serializers.IntegerField(required=False, min_value=1)
+    speciality = serializers.CharField(required=False, max_length=255)
+
+    def validate_radius_km(self, value):
+        if value > settings.GEO_MAX_RADIUS_KM:
+            raise serializers.ValidationError(f"radius_km {settings.GEO_MAX_RADIUS_KM} dan oshmasligi kerak")
+        return value
+
+    def validate_k(self, value):
+        return min(value, settings.GEO_NEARBY_MAX_RESULTS)
+
+
+class ClinicSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Clinic
+        fields = ['id', 'name', 'address', 'phone_number', 'latitude', 'longitude']
+
+
+class ClinicNearbySerializer(ClinicSerializer):
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta(ClinicSerializer.Meta):
+        fields = ClinicSerializer.Meta.fields + ['distance_km']
+
+    def get_distance_km(self, obj):
+        return round(obj.distance_km, 3)
+
+
+class DoctorNearbySerializer(DoctorListSerializer):
+    clinic = ClinicSerializer(read_only=True)
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta(DoctorListSerializer.Meta):
+        fields = DoctorListSerializer.Meta.fields + ['clinic', 'distance_km']
+
+    def get_distance_km(self, obj):
+        return round(obj.distance_km, 3)
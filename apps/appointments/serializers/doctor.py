@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from apps.appointments.models import Doctor
+
+
+class DoctorListSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(source='user.full_name', read_only=True, default=None)
+    image = serializers.ImageField(source='user.image', read_only=True, default=None)
+    next_available_date = serializers.DateField(read_only=True, default=None)
+
+    class Meta:
+        model = Doctor
+        fields = ['id', 'full_name', 'image', 'speciality', 'experience_year', 'gender', 'rating', 'rating_count',
+                  'next_available_date']
+
+
+class DoctorDetailSerializer(DoctorListSerializer):
+    average_rating = serializers.FloatField(read_only=True)
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta(DoctorListSerializer.Meta):
+        fields = DoctorListSerializer.Meta.fields + ['bio', 'qualifications', 'working_hours', 'slot_minutes',
+                                                     'average_rating', 'rating_histogram']
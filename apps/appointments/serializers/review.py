@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from apps.appointments.models import Review
+
+
+class ReviewCreateSerializer(serializers.Serializer):
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    comment = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=2000)
+
+
+class ReviewUpdateSerializer(ReviewCreateSerializer):
+    rating = serializers.IntegerField(required=False, min_value=1, max_value=5)
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    patient_name = serializers.CharField(source='patient.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Review
+        fields = ['id', 'doctor', 'patient', 'patient_name', 'rating', 'comment', 'created_at', 'updated_at']
+        read_only_fields = fields
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_init, post_delete
+from django.dispatch import receiver
+
+from apps.appointments.availability import rebuild_doctor_availability
+from apps.appointments.models import Doctor, Review
+from apps.appointments.ratings import review_key, rating_deltas, apply_rating_deltas
+
+
+@receiver(post_save, sender=Doctor)
+def rebuild_availability_on_doctor_save(sender, instance, **kwargs):
+    # working_hours, slot_minutes yoki status o'zgargan bo'lishi mumkin: indeks qayta hisoblanadi
+    transaction.on_commit(lambda: rebuild_doctor_availability(instance))
+
+
+# Shifokor reyting agregati sharh yozuvi bilan bir tranzaksiyada yangilanadi (on_commit emas):
+# ratings.py servislari, admin va cascade delete atomic blok ichida ishlaydi.
+# Review.objects.update()/bulk_create signal yubormaydi - ulardan keyin verify_doctor_ratings --fix kerak.
+@receiver(post_init, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    instance._rating_key = review_key(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    old_key = None if created else getattr(instance, '_rating_key', None)
+    new_key = review_key(instance)
+    apply_rating_deltas(rating_deltas(old_key, new_key))
+    instance._rating_key = new_key
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    # saqlanmagan in-memory o'zgarishlar emas, bazadagi holat ayriladi
+    apply_rating_deltas(rating_deltas(getattr(instance, '_rating_key', None) or review_key(instance), None))
@@ -0,0 +1,88 @@
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.appointments.availability import parse_working_hours, iter_day_slots, booked_starts, day_start
+from apps.utils.db_router import PRIMARY_DB
+
+
+def schedule_version(doctor):
+    # working_hours yoki slot_minutes o'zgarsa kalit o'zgaradi: eski bitsetlar TTL bilan o'chib ketadi
+    payload = json.dumps([doctor.working_hours or {}, doctor.slot_minutes], sort_keys=True)
+    return zlib.crc32(payload.encode())
+
+
+def _cache_key(doctor, version, day):
+    return f"doctor:slots:{doctor.id}:{version:x}:{day:%Y%m%d}"
+
+
+def _day_slots(doctor, schedule, day):
+    # bit i - kunning i-sloti (booking bilan bir xil tartib)
+    return list(iter_day_slots(day, schedule.get(day.weekday(), []), doctor.slot_minutes))
+
+
+def _build_mask(slots, booked):
+    mask = 0
+    for index, (starts_at, _) in enumerate(slots):
+        if starts_at not in booked:
+            mask |= 1 << index
+    return mask
+
+
+def get_calendar(doctor, start_date, days):
+    """
+    [start_date, start_date + days) oynasi uchun {date: [(starts_at, ends_at, available), ...]}.
+    Har kun keshda bitta int (bit i = i-slot bo'sh): butun hafta bitta get_many bilan o'qiladi,
+    topilmagan kunlar bitta DB so'rovi bilan qayta quriladi.
+    """
+    schedule = parse_working_hours(doctor.working_hours or {})
+    version = schedule_version(doctor)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    keys = {day: _cache_key(doctor, version, day) for day in dates}
+    cached = cache.get_many(list(keys.values()))
+
+    slots = {day: _day_slots(doctor, schedule, day) for day in dates}
+    masks = {day: cached[keys[day]] for day in dates if keys[day] in cached}
+
+    missing = [day for day in dates if day not in masks]
+    if missing:
+        # replica kechikishi TTL davomida keshda qolib ketmasligi uchun primary dan o'qiladi
+        booked = booked_starts(
+            doctor, day_start(missing[0]), day_start(missing[-1] + timedelta(days=1)), using=PRIMARY_DB
+        )
+        rebuilt = {day: _build_mask(slots[day], booked) for day in missing}
+        cache.set_many({keys[day]: mask for day, mask in rebuilt.items()}, timeout=settings.DOCTOR_SLOT_CACHE_TTL)
+        masks.update(rebuilt)
+
+    now = timezone.now()
+    return {
+        day: [
+            (starts_at, ends_at, starts_at > now and bool(masks[day] >> index & 1))
+            for index, (starts_at, ends_at) in enumerate(slots[day])
+        ]
+        for day in dates
+    }
+
+
+def mark_slot(doctor, starts_at, free):
+    """
+    Bron qilish/bekor qilishdan keyin faqat bitta bitni o'zgartiradi. Kesh maslahat uchun:
+    yo'qolgan yangilanish TTL bilan tuzaladi, slot bandligini exclusion constraint kafolatlaydi.
+    """
+    starts_at = timezone.localtime(starts_at)
+    day = starts_at.date()
+    key = _cache_key(doctor, schedule_version(doctor), day)
+    mask = cache.get(key)
+    if mask is None:
+        return
+
+    schedule = parse_working_hours(doctor.working_hours or {})
+    for index, (slot_start, _) in enumerate(_day_slots(doctor, schedule, day)):
+        if slot_start == starts_at:
+            mask = mask | (1 << index) if free else mask & ~(1 << index)
+            cache.set(key, mask, timeout=settings.DOCTOR_SLOT_CACHE_TTL)
+            return
@@ -1,3 +1,491 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import StringIO
+from threading import Barrier
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.appointments.availability import parse_working_hours, iter_day_slots, day_start
+from apps.appointments.filters import DoctorListFilter
+from apps.appointments.booking import book_appointment, cancel_appointment, generate_slots
+from apps.appointments.geo import encode_geohash, cover_cells, bounding_box, cell_size, MAX_COVER_CELLS
+from apps.appointments.models import Appointment, AppointmentStatusChoices, Doctor, DoctorAvailableDay, Review, \
+    ReminderStatusChoices
+from apps.appointments.reminders import dispatch_reminders
+from apps.appointments.slot_cache import get_calendar, mark_slot, schedule_version
+from apps.appointments.ratings import rating_deltas, apply_rating_deltas, bayesian_rating, find_rating_drift
+from apps.appointments.timing_wheel import HierarchicalTimingWheel
+from apps.users.choices import UserContactTypeChoices
+from apps.utils.CustomValidationError import CustomValidationError
+
+User = get_user_model()
+
+EVERY_DAY = {day: [["09:00", "11:00"]] for day in ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')}
+
+
+def tomorrow_at(hours, minutes=0):
+    return day_start(timezone.localdate() + timedelta(days=1), hours * 60 + minutes)
+
+
+class HierarchicalTimingWheelTests(SimpleTestCase):
+    def test_item_fires_on_its_tick(self):
+        wheel = HierarchicalTimingWheel(start=0, slots=10, levels=2)
+        wheel.add('a', 5)
+        self.assertEqual(wheel.advance(4), [])
+        self.assertEqual(wheel.advance(5), ['a'])
+        self.assertEqual(len(wheel), 0)
+
+    def test_overdue_item_fires_on_next_advance(self):
+        wheel = HierarchicalTimingWheel(start=100, slots=10, levels=2)
+        wheel.add('late', 50)
+        self.assertEqual(wheel.advance(100), ['late'])
+
+    def test_higher_level_items_cascade_down(self):
+        wheel = HierarchicalTimingWheel(start=0, slots=10, levels=3)
+        wheel.add('level1', 37)
+        wheel.add('level2', 250)
+        self.assertEqual(wheel.advance(36), [])
+        self.assertEqual(wheel.advance(37), ['level1'])
+        self.assertEqual(wheel.advance(249), [])
+        self.assertEqual(wheel.advance(250), ['level2'])
+
+    def test_overflow_beyond_all_levels(self):
+        wheel = HierarchicalTimingWheel(start=0, slots=4, levels=2)
+        wheel.add('far', 40)
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.advance(39), [])
+        self.assertEqual(wheel.advance(40), ['far'])
+
+    def test_long_sleep_rebuilds_and_returns_everything_due(self):
+        wheel = HierarchicalTimingWheel(start=0, slots=10, levels=2)
+        for due in (3, 15, 80, 500):
+            wheel.add(due, due)
+        self.assertEqual(sorted(wheel.advance(100)), [3, 15, 80])
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.advance(500), [500])
+
+    def test_fractional_due_rounds_up_to_tick(self):
+        wheel = HierarchicalTimingWheel(start=0, tick=10, slots=10, levels=2)
+        wheel.add('a', 11)
+        self.assertEqual(wheel.advance(19), [])
+        self.assertEqual(wheel.advance(20), ['a'])
+
+
+class WorkingHoursTests(SimpleTestCase):
+    def test_parse_sorts_intervals_into_minutes(self):
+        parsed = parse_working_hours({"mon": [["14:00", "18:00"], ["09:00", "13:00"]], "sun": []})
+        self.assertEqual(parsed, {0: [(540, 780), (840, 1080)], 6: []})
+
+    def test_end_of_day_is_allowed(self):
+        self.assertEqual(parse_working_hours({"fri": [["20:00", "24:00"]]}), {4: [(1200, 1440)]})
+
+    def test_invalid_working_hours(self):
+        for working_hours in (
+                [],
+                {"monday": []},
+                {"mon": [["9", "10:00"]]},
+                {"mon": [["25:00", "26:00"]]},
+                {"mon": [["10:00", "09:00"]]},
+                {"mon": [["09:00", "12:00"], ["11:00", "13:00"]]},
+        ):
+            with self.subTest(working_hours=working_hours):
+                with self.assertRaises(ValidationError):
+                    parse_working_hours(working_hours)
+
+    def test_day_slots_skip_incomplete_tail(self):
+        day = date(2026, 1, 5)
+        slots = list(iter_day_slots(day, [(540, 640), (700, 730)], 30))
+        self.assertEqual(
+            [(start.strftime('%H:%M'), end.strftime('%H:%M')) for start, end in slots],
+            [('09:00', '09:30'), ('09:30', '10:00'), ('10:00', '10:30'), ('11:40', '12:10')]
+        )
+
+
+class BookingTests(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create(speciality='Kardiolog', working_hours=EVERY_DAY, slot_minutes=30)
+        self.patient = User.objects.create_user('patient@example.com', full_name='Patient')
+        self.other = User.objects.create_user('other@example.com', full_name='Other')
+
+    def test_generate_slots_marks_booked_slot(self):
+        book_appointment(self.doctor, self.patient, tomorrow_at(9, 30))
+        day = timezone.localdate() + timedelta(days=1)
+        slots = generate_slots(self.doctor, day, 1)[day]
+        self.assertEqual(len(slots), 4)
+        self.assertEqual([available for _, _, available in slots], [True, False, True, True])
+
+    def test_book_slot(self):
+        appointment = book_appointment(self.doctor, self.patient, tomorrow_at(9))
+        self.assertEqual(appointment.ends_at, tomorrow_at(9, 30))
+        self.assertEqual(appointment.status, AppointmentStatusChoices.BOOKED)
+
+    def test_slot_outside_working_hours(self):
+        with self.assertRaises(CustomValidationError):
+            book_appointment(self.doctor, self.patient, tomorrow_at(9, 10))
+        with self.assertRaises(CustomValidationError):
+            book_appointment(self.doctor, self.patient, tomorrow_at(12))
+
+    def test_past_slot(self):
+        with self.assertRaises(CustomValidationError):
+            book_appointment(self.doctor, self.patient, tomorrow_at(9) - timedelta(days=2))
+
+    def test_taken_slot_is_rejected(self):
+        book_appointment(self.doctor, self.patient, tomorrow_at(10))
+        with self.assertRaises(CustomValidationError) as context:
+            book_appointment(self.doctor, self.other, tomorrow_at(10))
+        self.assertEqual(context.exception.detail['message'], "Bu slot band qilingan")
+        self.assertEqual(Appointment.objects.filter(status=AppointmentStatusChoices.BOOKED).count(), 1)
+
+    def test_patient_overlap_with_another_doctor(self):
+        other_doctor = Doctor.objects.create(speciality='Nevrolog', working_hours=EVERY_DAY, slot_minutes=60)
+        book_appointment(self.doctor, self.patient, tomorrow_at(9, 30))
+        with self.assertRaises(CustomValidationError) as context:
+            book_appointment(other_doctor, self.patient, tomorrow_at(9))
+        self.assertEqual(context.exception.detail['message'], "Bu vaqtda sizda boshqa qabul bor")
+
+    def test_cancelled_slot_can_be_booked_again(self):
+        appointment = book_appointment(self.doctor, self.patient, tomorrow_at(10))
+        cancel_appointment(appointment.id, self.patient)
+        rebooked = book_appointment(self.doctor, self.other, tomorrow_at(10))
+        self.assertEqual(rebooked.patient, self.other)
+
+    def test_only_participants_can_cancel(self):
+        appointment = book_appointment(self.doctor, self.patient, tomorrow_at(10))
+        with self.assertRaises(CustomValidationError):
+            cancel_appointment(appointment.id, self.other)
+
+
+@skipUnless(connection.vendor == 'postgresql', "Slot conflicts are enforced by a PostgreSQL exclusion constraint")
+class ConcurrentBookingTests(TransactionTestCase):
+    # har worker thread o'z DB ulanishini ochadi: max_connections WORKERS dan katta bo'lishi kerak
+    ATTEMPTS = 300
+    WORKERS = 50
+
+    def setUp(self):
+        self.doctor = Doctor.objects.create(speciality='Kardiolog', working_hours=EVERY_DAY, slot_minutes=30)
+        self.patients = [
+            User.objects.create_user(f'patient{index}@example.com', full_name=f'Patient {index}')
+            for index in range(self.ATTEMPTS)
+        ]
+        self.starts_at = tomorrow_at(9)
+        self.day = timezone.localtime(self.starts_at).date()
+
+    def free_slots(self):
+        return DoctorAvailableDay.objects.get(doctor=self.doctor, date=self.day).free_slots
+
+    def test_one_of_many_simultaneous_bookings_wins(self):
+        free_before = self.free_slots()
+        barrier = Barrier(self.WORKERS)
+
+        def attempt(patient):
+            # har WORKERS ta urinish bir vaqtda INSERT qiladi
+            barrier.wait(timeout=30)
+            try:
+                book_appointment(self.doctor, patient, self.starts_at)
+                return True
+            except CustomValidationError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            results = list(executor.map(attempt, self.patients))
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(Appointment.objects.filter(status=AppointmentStatusChoices.BOOKED).count(), 1)
+        self.assertEqual(Appointment.objects.count(), 1)
+        self.assertEqual(self.free_slots(), free_before - 1)
+
+
+@override_settings(APPOINTMENT_REMINDER_MAX_ATTEMPTS=3, APPOINTMENT_REMINDER_RETRY_SECONDS=60)
+class ReminderDispatchTests(TestCase):
+    def setUp(self):
+        doctor = Doctor.objects.create(speciality='Kardiolog', working_hours=EVERY_DAY, slot_minutes=30)
+        patient = User.objects.create_user('patient@example.com', full_name='Patient',
+                                           contact_type=UserContactTypeChoices.EMAIL)
+        self.appointment = book_appointment(doctor, patient, tomorrow_at(10) + timedelta(days=1))
+        self.now = self.appointment.starts_at - timedelta(minutes=30)
+
+    def dispatch(self):
+        return dispatch_reminders(list(self.appointment.reminders.values_list('id', flat=True)), now=self.now)
+
+    def test_due_reminders_are_sent(self):
+        self.assertEqual(self.dispatch(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            set(self.appointment.reminders.values_list('status', flat=True)), {ReminderStatusChoices.SENT}
+        )
+
+    @override_settings(EMAIL_BACKEND='apps.users.tests.UnreachableEmailBackend')
+    def test_unreachable_smtp_requeues_reminders(self):
+        with self.assertLogs('apps.users.tasks', 'ERROR'):
+            self.assertEqual(self.dispatch(), 0)
+        for reminder in self.appointment.reminders.all():
+            self.assertEqual((reminder.status, reminder.attempts), (ReminderStatusChoices.PENDING, 1))
+            self.assertEqual(reminder.error, "SMTP server is unreachable")
+            self.assertGreater(reminder.due_at, timezone.now())
+
+
+class BookingAPITests(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create(speciality='Kardiolog', working_hours=EVERY_DAY, slot_minutes=30)
+        self.patient = User.objects.create_user('patient@example.com', full_name='Patient')
+        self.client = APIClient()
+        self.client.force_authenticate(self.patient)
+
+    def book(self, starts_at):
+        return self.client.post(
+            reverse('appointments:appointment-book'),
+            {"doctor": self.doctor.id, "starts_at": starts_at.isoformat()},
+            format='json'
+        )
+
+    def test_book_and_list(self):
+        response = self.book(tomorrow_at(9))
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['success'])
+        appointment = Appointment.objects.get(patient=self.patient)
+        self.assertEqual(response.data['data']['id'], appointment.id)
+
+        response = self.client.get(reverse('appointments:appointment-my-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"'id': {appointment.id}", str(response.data))
+
+    def test_double_booking_returns_error(self):
+        self.assertEqual(self.book(tomorrow_at(9)).status_code, 201)
+        other = User.objects.create_user('other@example.com', full_name='Other')
+        self.client.force_authenticate(other)
+        response = self.book(tomorrow_at(9))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['success'])
+
+    def test_slots_show_booked_slot(self):
+        self.book(tomorrow_at(9))
+        day = timezone.localdate() + timedelta(days=1)
+        response = self.client.get(
+            reverse('appointments:doctor-slots', args=[self.doctor.id]), {"date_from": day.isoformat(), "days": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        slots = response.data['data'][0]['slots']
+        self.assertEqual([slot['available'] for slot in slots], [False, True, True, True])
+
+    def test_cancel(self):
+        appointment_id = self.book(tomorrow_at(9)).data['data']['id']
+        response = self.client.post(reverse('appointments:appointment-cancel', args=[appointment_id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Appointment.objects.get(id=appointment_id).status, AppointmentStatusChoices.CANCELLED)
+
+
+class SlotCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.doctor = Doctor.objects.create(speciality='Kardiolog', working_hours=EVERY_DAY, slot_minutes=30)
+        self.patient = User.objects.create_user('patient@example.com', full_name='Patient')
+        self.day = timezone.localdate() + timedelta(days=1)
+
+    def available(self):
+        return [available for _, _, available in get_calendar(self.doctor, self.day, 1)[self.day]]
+
+    def test_calendar_matches_generated_slots_and_is_cached(self):
+        book_appointment(self.doctor, self.patient, tomorrow_at(9, 30))
+        self.assertEqual(get_calendar(self.doctor, self.day, 2), generate_slots(self.doctor, self.day, 2))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.available(), [True, False, True, True])
+
+    def test_booking_and_cancel_flip_one_bit(self):
+        self.available()
+        with self.captureOnCommitCallbacks(execute=True):
+            appointment = book_appointment(self.doctor, self.patient, tomorrow_at(10))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.available(), [True, True, False, True])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_appointment(appointment.id, self.patient)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.available(), [True, True, True, True])
+
+    def test_schedule_change_uses_new_key(self):
+        self.available()
+        version = schedule_version(self.doctor)
+        self.doctor.slot_minutes = 60
+        self.assertNotEqual(schedule_version(self.doctor), version)
+        self.assertEqual(self.available(), [True, True])
+
+    def test_mark_slot_without_cached_day_is_noop(self):
+        mark_slot(self.doctor, tomorrow_at(9), free=False)
+        self.assertEqual(self.available(), [True, True, True, True])
+
+
+class DoctorDirectoryTests(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.soon = self.create_doctor('Ali', 'Kardiolog', experience_year=10, gender='erkak', free_in=1)
+        self.later = self.create_doctor('Vali', 'kardiolog', experience_year=3, gender='ayol', free_in=10)
+        self.busy = self.create_doctor('Sami', 'Nevrolog', experience_year=20, free_in=None)
+        self.hidden = self.create_doctor('Hidden', 'Kardiolog', free_in=1)
+        Doctor.objects.filter(id=self.hidden.id).update(status=False)
+        Doctor.objects.filter(id=self.soon.id).update(rating=4.5)
+
+        # band kun va o'tgan kun "bo'sh" hisoblanmaydi
+        DoctorAvailableDay.objects.create(doctor=self.busy, date=today, total_slots=4, free_slots=0)
+        DoctorAvailableDay.objects.create(doctor=self.busy, date=today - timedelta(days=1), total_slots=4,
+                                          free_slots=4)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('patient@example.com', full_name='Patient'))
+
+    def create_doctor(self, name, speciality, free_in=None, **fields):
+        user = User.objects.create_user(f'{name.lower()}@example.com', full_name=name)
+        doctor = Doctor.objects.create(user=user, speciality=speciality, working_hours=EVERY_DAY, **fields)
+        if free_in is not None:
+            DoctorAvailableDay.objects.create(
+                doctor=doctor, date=timezone.localdate() + timedelta(days=free_in), total_slots=4, free_slots=2
+            )
+        return doctor
+
+    def filtered(self, **params):
+        return list(DoctorListFilter(params, queryset=Doctor.objects.order_by('id')).qs)
+
+    def doctor_ids(self, **params):
+        response = self.client.get(reverse('appointments:doctor-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_filter_available_days(self):
+        self.assertEqual(self.filtered(available_days=3), [self.soon, self.hidden])
+        self.assertEqual(self.filtered(available_days=30), [self.soon, self.later, self.hidden])
+        # 1 dan kichik qiymat bugungi kun sifatida olinadi
+        self.assertEqual(self.filtered(available_days=0), [])
+
+    @override_settings(DOCTOR_AVAILABILITY_DAYS=5)
+    def test_filter_available_days_is_capped(self):
+        self.assertEqual(self.filtered(available_days=365), [self.soon, self.hidden])
+
+    def test_field_filters(self):
+        self.assertEqual(self.filtered(speciality='KARDIOLOG'), [self.soon, self.later, self.hidden])
+        self.assertEqual(self.filtered(gender='ayol'), [self.later])
+        self.assertEqual(self.filtered(experience_year__gte=10), [self.soon, self.busy])
+        self.assertEqual(self.filtered(rating__gte=4.5), [self.soon])
+
+    def test_directory_lists_active_doctors(self):
+        self.assertEqual(self.doctor_ids(), [self.soon.id, self.later.id, self.busy.id])
+        self.assertEqual(self.doctor_ids(search='vali'), [self.later.id])
+        self.assertEqual(self.doctor_ids(ordering='-experience_year'), [self.busy.id, self.soon.id, self.later.id])
+
+        response = self.client.get(reverse('appointments:doctor-detail', args=[self.soon.id]))
+        self.assertEqual(response.data['full_name'], 'Ali')
+        self.assertEqual(response.data['next_available_date'], str(timezone.localdate() + timedelta(days=1)))
+        response = self.client.get(reverse('appointments:doctor-detail', args=[self.hidden.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def available_days(self, doctor):
+        today = timezone.localdate()
+        return [((day - today).days, free) for day, free in
+                DoctorAvailableDay.objects.filter(doctor=doctor).order_by('date').values_list('date', 'free_slots')]
+
+    def test_refresh_extends_horizon_and_drops_past_days(self):
+        call_command('refresh_doctor_availability', '--days', '3', stdout=StringIO())
+        # faqat oxirgi indekslangan kundan keyingi kunlar qo'shiladi
+        self.assertEqual(self.available_days(self.busy), [(0, 0), (1, 4), (2, 4)])
+        self.assertEqual(self.available_days(self.later), [(10, 2)])
+        self.assertEqual(self.available_days(self.hidden), [(1, 2)])
+
+    def test_refresh_rebuild_recomputes_window(self):
+        book_appointment(self.later, User.objects.get(contact='patient@example.com'), tomorrow_at(9))
+        call_command('refresh_doctor_availability', '--days', '3', '--rebuild', stdout=StringIO())
+        # oynadan tashqaridagi qatorlar ham olib tashlanadi
+        self.assertEqual(self.available_days(self.later), [(0, 4), (1, 3), (2, 4)])
+
+
+class GeohashTests(SimpleTestCase):
+    def test_known_geohashes(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(42.6, -5.6, 5), 'ezs42')
+        self.assertEqual(encode_geohash(-90, -180, 3), '000')
+
+    def test_nearby_points_share_prefix(self):
+        self.assertEqual(encode_geohash(41.3111, 69.2406, 6), encode_geohash(41.3112, 69.2407, 6))
+
+    def test_cell_size_halves_per_bit(self):
+        self.assertEqual(cell_size(1), (45.0, 45.0))
+        self.assertEqual(cell_size(2), (45.0 / 8, 45.0 / 4))
+
+    def test_cover_cells_cover_box_corners(self):
+        box = bounding_box(41.311081, 69.240562, 5)
+        cells = cover_cells(box)
+        self.assertLessEqual(len(cells), MAX_COVER_CELLS)
+        self.assertEqual(len({len(cell) for cell in cells}), 1)
+        min_lat, max_lat, min_lng, max_lng = box
+        for lat in (min_lat, 41.311081, max_lat):
+            for lng in (min_lng, 69.240562, max_lng):
+                with self.subTest(lat=lat, lng=lng):
+                    self.assertTrue(any(encode_geohash(lat, lng).startswith(cell) for cell in cells))
+
+    def test_cover_cells_prefers_longer_prefix_for_small_box(self):
+        small = cover_cells(bounding_box(41.3, 69.2, 0.5))
+        large = cover_cells(bounding_box(41.3, 69.2, 50))
+        self.assertGreater(len(small[0]), len(large[0]))
+
+
+class RatingDeltaTests(SimpleTestCase):
+    def test_new_review(self):
+        self.assertEqual(rating_deltas(None, (1, 5)), {1: {'rating_count': 1, 'rating_sum': 5, 'stars_5': 1}})
+
+    def test_deleted_review(self):
+        self.assertEqual(rating_deltas((1, 2), None), {1: {'rating_count': -1, 'rating_sum': -2, 'stars_2': -1}})
+
+    def test_changed_stars(self):
+        self.assertEqual(
+            rating_deltas((1, 2), (1, 4)),
+            {1: {'rating_count': 0, 'rating_sum': 2, 'stars_2': -1, 'stars_4': 1}}
+        )
+
+    def test_moved_to_another_doctor(self):
+        deltas = rating_deltas((1, 3), (2, 3))
+        self.assertEqual(deltas[1], {'rating_count': -1, 'rating_sum': -3, 'stars_3': -1})
+        self.assertEqual(deltas[2], {'rating_count': 1, 'rating_sum': 3, 'stars_3': 1})
+
+    def test_unchanged_review_has_no_deltas(self):
+        self.assertEqual(rating_deltas((1, 4), (1, 4)), {})
+        self.assertEqual(rating_deltas(None, None), {})
+
+
+@override_settings(DOCTOR_RATING_PRIOR_MEAN=4.0, DOCTOR_RATING_PRIOR_COUNT=5)
+class ApplyRatingDeltaTests(TestCase):
+    def setUp(self):
+        self.doctor = Doctor.objects.create(speciality='Kardiolog')
+        self.patients = [
+            User.objects.create_user(f'patient{index}@example.com', full_name=f'Patient {index}') for index in range(3)
+        ]
+
+    def test_apply_updates_counters_and_bayesian_rating(self):
+        apply_rating_deltas(rating_deltas(None, (self.doctor.id, 5)))
+        apply_rating_deltas(rating_deltas(None, (self.doctor.id, 2)))
+        self.doctor.refresh_from_db()
+        self.assertEqual((self.doctor.rating_count, self.doctor.rating_sum), (2, 7))
+        self.assertEqual((self.doctor.stars_5, self.doctor.stars_2), (1, 1))
+        self.assertAlmostEqual(self.doctor.rating, (5 * 4.0 + 7) / 7)
+        self.assertAlmostEqual(self.doctor.rating, bayesian_rating(2, 7))
+
+    def test_review_signals_keep_aggregate_in_sync(self):
+        reviews = [
+            Review.objects.create(doctor=self.doctor, patient=patient, rating=rating)
+            for patient, rating in zip(self.patients, (5, 4, 1))
+        ]
+        reviews[2].rating = 3
+        reviews[2].save()
+        reviews[0].delete()
+
+        self.doctor.refresh_from_db()
+        self.assertEqual((self.doctor.rating_count, self.doctor.rating_sum), (2, 7))
+        self.assertEqual(self.doctor.rating_histogram, {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
+        self.assertEqual(find_rating_drift([self.doctor]), {})
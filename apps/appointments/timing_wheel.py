@@ -0,0 +1,84 @@
+import math
+
+
+class HierarchicalTimingWheel:
+    """
+    Ierarxik timing wheel: level 0 da har slot bitta tick, level L da slots ** L tick.
+    add() va advance() dagi har element uchun ish O(levels) - navbatdagi elementlar soniga bog'liq emas.
+    Uzoq muddatli elementlar yuqori levelda turadi va vaqti yaqinlashganda pastki levelga tushiriladi.
+    """
+
+    def __init__(self, start, tick=1.0, slots=60, levels=3):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.current = int(start // tick)
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+        self.ready = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, item, due):
+        """
+        due: epoch sekund. Muddati o'tgan element keyingi advance() da darhol qaytadi.
+        """
+        self.size += 1
+        self._place(math.ceil(due / self.tick), item)
+
+    def _place(self, due_tick, item):
+        delta = due_tick - self.current
+        if delta <= 0:
+            self.ready.append(item)
+            return
+        for level in range(self.levels):
+            if delta < self.slots ** (level + 1):
+                self.wheels[level][(due_tick // self.slots ** level) % self.slots].append((due_tick, item))
+                return
+        self.overflow.append((due_tick, item))
+
+    def _drain(self, entries):
+        for due_tick, item in entries:
+            self._place(due_tick, item)
+
+    def _rebuild(self, target):
+        # uzoq uxlab qolgan worker: ticklarni bittalab aylanmasdan hamma element qayta joylanadi
+        entries = self.overflow
+        self.overflow = []
+        for wheel in self.wheels:
+            for index, bucket in enumerate(wheel):
+                entries.extend(bucket)
+                wheel[index] = []
+        self.current = target
+        self._drain(entries)
+
+    def advance(self, now):
+        """
+        Vaqtni now gacha suradi va muddati kelgan elementlarni qaytaradi.
+        """
+        target = int(now // self.tick)
+        if target - self.current > self.slots:
+            self._rebuild(target)
+
+        while self.current < target:
+            self.current += 1
+            # yuqori leveldan pastga: slot chegarasiga yetgan bucketlar pastki levelga tushiriladi
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.current % span == 0:
+                    index = (self.current // span) % self.slots
+                    bucket, self.wheels[level][index] = self.wheels[level][index], []
+                    self._drain(bucket)
+            if self.overflow and self.current % self.slots ** (self.levels - 1) == 0:
+                overflow, self.overflow = self.overflow, []
+                self._drain(overflow)
+
+            index = self.current % self.slots
+            bucket, self.wheels[0][index] = self.wheels[0][index], []
+            self._drain(bucket)
+
+        expired, self.ready = self.ready, []
+        self.size -= len(expired)
+        return expired
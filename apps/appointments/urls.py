@@ -1,5 +1,22 @@
 from django.urls import path
 
+from apps.appointments.views.appointment_views import DoctorSlotListAPIView, AppointmentBookAPIView, \
+    AppointmentCancelAPIView, UserAppointmentListAPIView
+from apps.appointments.views.clinic_views import ClinicNearbyAPIView, DoctorNearbyAPIView
+from apps.appointments.views.doctor_views import DoctorListAPIView, DoctorDetailAPIView
+from apps.appointments.views.review_views import DoctorReviewListCreateAPIView, ReviewUpdateDeleteAPIView
+
 app_name = 'appointments'
 
-urlpatterns = []
\ No newline at end of file
+urlpatterns = [
+    path('doctors/', DoctorListAPIView.as_view(), name='doctor-list'),
+    path('doctors/nearby/', DoctorNearbyAPIView.as_view(), name='doctor-nearby'),
+    path('doctors/<int:pk>/', DoctorDetailAPIView.as_view(), name='doctor-detail'),
+    path('doctors/<int:pk>/slots/', DoctorSlotListAPIView.as_view(), name='doctor-slots'),
+    path('doctors/<int:pk>/reviews/', DoctorReviewListCreateAPIView.as_view(), name='doctor-reviews'),
+    path('reviews/<int:pk>/', ReviewUpdateDeleteAPIView.as_view(), name='review-detail'),
+    path('clinics/nearby/', ClinicNearbyAPIView.as_view(), name='clinic-nearby'),
+    path('book/', AppointmentBookAPIView.as_view(), name='appointment-book'),
+    path('my/', UserAppointmentListAPIView.as_view(), name='appointment-my-list'),
+    path('<int:pk>/cancel/', AppointmentCancelAPIView.as_view(), name='appointment-cancel'),
+]
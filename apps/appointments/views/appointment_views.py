@@ -0,0 +1,87 @@
+from datetime import date
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.status import HTTP_201_CREATED
+from rest_framework.views import APIView
+
+from apps.appointments.booking import book_appointment, cancel_appointment
+from apps.appointments.slot_cache import get_calendar
+from apps.appointments.models import Appointment, Doctor
+from apps.appointments.paginations import AppointmentListPagination
+from apps.appointments.serializers.appointment import AppointmentBookSerializer, AppointmentSerializer, \
+    DoctorDaySlotsSerializer
+from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
+
+SLOT_WINDOW_MAX_DAYS = 14
+
+
+class DoctorSlotListAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        doctor = get_object_or_404(Doctor, pk=pk, status=True)
+        try:
+            start_date = date.fromisoformat(request.query_params.get('date_from', '')) \
+                if request.query_params.get('date_from') else timezone.localdate()
+            days = int(request.query_params.get('days', 7))
+        except ValueError:
+            return CustomResponse.error_response(message="date_from (YYYY-MM-DD) yoki days noto'g'ri")
+
+        start_date = max(start_date, timezone.localdate())
+        days = min(max(days, 1), SLOT_WINDOW_MAX_DAYS)
+        slots = get_calendar(doctor, start_date, days)
+        data = [
+            {
+                "date": day,
+                "slots": [
+                    {"starts_at": starts_at, "ends_at": ends_at, "available": available}
+                    for starts_at, ends_at, available in day_slots
+                ]
+            }
+            for day, day_slots in slots.items()
+        ]
+        return CustomResponse.success_response(data=DoctorDaySlotsSerializer(data, many=True).data)
+
+
+class AppointmentBookAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = AppointmentBookSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        appointment = book_appointment(
+            serializer.validated_data['doctor'],
+            request.user,
+            serializer.validated_data['starts_at'],
+            serializer.validated_data.get('note')
+        )
+        return CustomResponse.success_response(
+            data=AppointmentSerializer(appointment).data, message="Qabulga yozildingiz", code=HTTP_201_CREATED
+        )
+
+
+class AppointmentCancelAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        appointment = cancel_appointment(pk, request.user)
+        return CustomResponse.success_response(
+            data=AppointmentSerializer(appointment).data, message="Qabul bekor qilindi"
+        )
+
+
+class UserAppointmentListAPIView(ReadReplicaMixin, ListAPIView):
+    serializer_class = AppointmentSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = AppointmentListPagination
+
+    def get_queryset(self):
+        return (
+            Appointment.objects.filter(patient=self.request.user)
+            .select_related('doctor__user')
+            .order_by('-starts_at')
+        )
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from apps.appointments.geo import nearby
+from apps.appointments.models import Clinic, Doctor
+from apps.appointments.serializers.clinic import NearbyQuerySerializer, ClinicNearbySerializer, \
+    DoctorNearbySerializer
+from apps.appointments.views.doctor_views import directory_queryset
+from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
+
+DEFAULT_NEARBY_K = 20
+
+
+def nearby_params(request):
+    """
+    ?lat=&lng=&radius_km= - radius ichidagilar (eng yaqini birinchi), ?lat=&lng=&k= - eng yaqin k ta.
+    """
+    serializer = NearbyQuerySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    params = serializer.validated_data
+    radius_km = params.get('radius_km')
+    limit = params.get('k') or (settings.GEO_NEARBY_MAX_RESULTS if radius_km else DEFAULT_NEARBY_K)
+    return params, radius_km, limit
+
+
+class ClinicNearbyAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params, radius_km, limit = nearby_params(request)
+        queryset = Clinic.objects.filter(status=True)
+        if params.get('speciality'):
+            queryset = queryset.filter(Exists(
+                Doctor.objects.filter(clinic=OuterRef('pk'), status=True, speciality__iexact=params['speciality'])
+            ))
+
+        clinics = nearby(queryset, params['lat'], params['lng'], radius_km=radius_km, limit=limit)
+        return CustomResponse.success_response(data=ClinicNearbySerializer(clinics, many=True).data)
+
+
+class DoctorNearbyAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params, radius_km, limit = nearby_params(request)
+        queryset = directory_queryset().filter(clinic__status=True).select_related('clinic')
+        if params.get('speciality'):
+            queryset = queryset.filter(speciality__iexact=params['speciality'])
+
+        doctors = nearby(queryset, params['lat'], params['lng'], radius_km=radius_km, limit=limit,
+                         location='clinic__')
+        return CustomResponse.success_response(data=DoctorNearbySerializer(doctors, many=True).data)
@@ -0,0 +1,48 @@
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.appointments.filters import DoctorListFilter
+from apps.appointments.models import Doctor, DoctorAvailableDay
+from apps.appointments.paginations import DoctorListPagination
+from apps.appointments.serializers.doctor import DoctorListSerializer, DoctorDetailSerializer
+from apps.utils.db_router import ReadReplicaMixin
+
+
+def directory_queryset():
+    next_available = DoctorAvailableDay.objects.filter(
+        doctor=OuterRef('pk'),
+        date__gte=timezone.localdate(),
+        free_slots__gt=0
+    ).order_by('date').values('date')[:1]
+    return (
+        Doctor.objects.filter(status=True)
+        .select_related('user')
+        .annotate(next_available_date=Subquery(next_available))
+    )
+
+
+class DoctorListAPIView(ReadReplicaMixin, ListAPIView):
+    serializer_class = DoctorListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = DoctorListPagination
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = DoctorListFilter
+    search_fields = ['speciality', 'user__full_name']
+    # rating - Doctor qatoridagi saqlangan Bayes agregat, sharhlar jadvali o'qilmaydi
+    ordering_fields = ['rating', 'rating_count', 'experience_year', 'next_available_date']
+    ordering = ['-rating', 'id']
+
+    def get_queryset(self):
+        return directory_queryset()
+
+
+class DoctorDetailAPIView(ReadReplicaMixin, RetrieveAPIView):
+    serializer_class = DoctorDetailSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return directory_queryset()
@@ -0,0 +1,52 @@
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.status import HTTP_201_CREATED
+from rest_framework.views import APIView
+
+from apps.appointments.models import Doctor, Review
+from apps.appointments.paginations import ReviewListPagination
+from apps.appointments.ratings import create_review, update_review, delete_review
+from apps.appointments.serializers.review import ReviewCreateSerializer, ReviewUpdateSerializer, ReviewSerializer
+from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
+
+
+class DoctorReviewListCreateAPIView(ReadReplicaMixin, ListAPIView):
+    serializer_class = ReviewSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ReviewListPagination
+
+    def get_queryset(self):
+        return (
+            Review.objects.filter(doctor_id=self.kwargs['pk'])
+            .select_related('patient')
+            .order_by('-created_at')
+        )
+
+    def post(self, request, pk):
+        doctor = get_object_or_404(Doctor, pk=pk, status=True)
+        serializer = ReviewCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        review = create_review(
+            doctor, request.user, serializer.validated_data['rating'], serializer.validated_data.get('comment')
+        )
+        return CustomResponse.success_response(
+            data=ReviewSerializer(review).data, message="Sharh qo'shildi", code=HTTP_201_CREATED
+        )
+
+
+class ReviewUpdateDeleteAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, pk):
+        serializer = ReviewUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        review = update_review(
+            pk, request.user, serializer.validated_data.get('rating'), serializer.validated_data.get('comment')
+        )
+        return CustomResponse.success_response(data=ReviewSerializer(review).data, message="Sharh yangilandi")
+
+    def delete(self, request, pk):
+        delete_review(pk, request.user)
+        return CustomResponse.success_response(message="Sharh o'chirildi")
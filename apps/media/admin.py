@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from apps.media.models import MediaBlob
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    search_fields = ('sha256', 'name')
+    list_per_page = 20
+    ordering = ('-created_at',)
+    readonly_fields = ('sha256', 'name', 'size', 'ref_count')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MediaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.media'
+
+    def ready(self):
+        from apps.media.signals import connect_blob_ref_signals
+        connect_blob_ref_signals()
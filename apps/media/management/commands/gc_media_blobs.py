@@ -0,0 +1,83 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from apps.media.models import MediaBlob
+from apps.media.signals import BLOB_FIELDS
+from apps.media.storage import content_addressed_storage, is_blob_name
+
+
+class Command(BaseCommand):
+    help = ("Hech bir yozuv ishlatmaydigan media bloblarni o'chiradi. O'chirishdan oldin ref_count har doim "
+            "file fieldlardan qayta sanaladi: signallar queryset.update() va bulk_create ni ko'rmaydi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help="Yangi yuklangan, hali modelga bog'lanmagan bloblarni saqlab turish vaqti")
+        parser.add_argument('--skip-recount', action='store_true',
+                            help="ref_count ni qayta sanamaslik. Faqat --stats yoki --dry-run bilan xavfsiz")
+        parser.add_argument('--stats', action='store_true', help="Deduplikatsiya tejamini ko'rsatadi")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['skip_recount'] and not options['dry_run']:
+            # noto'g'ri ref_count hali ishlatilayotgan blobni o'chirib yuboradi
+            raise CommandError("--skip-recount faqat --dry-run bilan ishlatiladi")
+        if not options['skip_recount']:
+            self.recount(options['batch_size'])
+
+        if options['stats']:
+            self.stats()
+
+        deleted = self.collect(options['batch_size'], options['grace_hours'], options['dry_run'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta blob o'chirildi"))
+
+    def recount(self, batch_size):
+        counts = Counter()
+        for model, fields in BLOB_FIELDS.items():
+            # soft-delete qilingan qatorlar ham blobga havola qiladi (restore qilinishi mumkin): objects emas
+            for names in model._base_manager.values_list(*fields).iterator(chunk_size=batch_size):
+                counts.update(name for name in names if is_blob_name(name))
+
+        blob_ids = MediaBlob.objects.values_list('id', 'name').order_by('id')
+        for blob_id, name in blob_ids.iterator(chunk_size=batch_size):
+            MediaBlob.objects.filter(id=blob_id).exclude(ref_count=counts[name]).update(ref_count=counts[name])
+
+    def stats(self):
+        totals = MediaBlob.objects.filter(ref_count__gt=0).aggregate(
+            physical=Sum('size'),
+            logical=Sum(F('size') * F('ref_count')),
+        )
+        physical = totals['physical'] or 0
+        logical = totals['logical'] or 0
+        saved = logical - physical
+        percent = (saved / logical * 100) if logical else 0
+        self.stdout.write(
+            f"Mantiqiy hajm: {logical} bayt, diskda: {physical} bayt, tejaldi: {saved} bayt ({percent:.1f}%)"
+        )
+
+    def collect(self, batch_size, grace_hours, dry_run):
+        threshold = timezone.now() - timedelta(hours=grace_hours)
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                blobs = list(
+                    MediaBlob.objects.select_for_update(skip_locked=True)
+                    .filter(ref_count__lte=0, last_uploaded_at__lt=threshold)
+                    .order_by('id')[:batch_size]
+                )
+                if not blobs:
+                    break
+                if dry_run:
+                    return len(blobs)
+
+                for blob in blobs:
+                    content_addressed_storage.delete_blob(blob.name)
+                MediaBlob.objects.filter(id__in=[blob.id for blob in blobs]).delete()
+                deleted += len(blobs)
+        return deleted
@@ -0,0 +1,23 @@
+from django.db import models
+from django.utils import timezone
+
+
+class MediaBlob(models.Model):
+    sha256 = models.CharField(max_length=64, db_index=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # har qayta yuklashda yangilanadi: GC yaqinda yuklangan (hali modelga bog'lanmagan) blobni o'chirmaydi
+    last_uploaded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'media_blob'
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
+        indexes = [
+            models.Index(fields=['ref_count', 'last_uploaded_at'], name='media_blob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from apps.media.signing import sign_media_path
+
+
+class SignedMediaField(serializers.FileField):
+    """
+    Faylni imzolangan, muddati cheklangan URL sifatida qaytaradi. Muddat obyektning
+    expires_at (masalan Story) dan oshmaydi.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+
+        request = self.context.get('request')
+        expires_at = getattr(value.instance, 'expires_at', None)
+        url = sign_media_path(value.name, limit=expires_at.timestamp() if expires_at else None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
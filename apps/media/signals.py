@@ -0,0 +1,60 @@
+from django.apps import apps
+from django.db.models import F, FileField
+from django.db.models.signals import post_init, post_save, post_delete
+
+from apps.media.models import MediaBlob
+from apps.media.storage import ContentAddressedStorage, is_blob_name
+
+# ref_count faqat model.save()/delete() signallari bilan yuritiladi. queryset.update(), bulk_create va
+# raw SQL signal yubormaydi, shuning uchun ref_count taxminiy: gc_media_blobs har doim avval qayta sanaydi.
+
+# {model: [file field nomlari]} - faqat ContentAddressedStorage ishlatadigan fieldlar
+BLOB_FIELDS = {}
+
+
+def _file_names(instance, fields):
+    return {field: getattr(instance, field).name or None for field in fields}
+
+
+def change_blob_refs(name, delta):
+    if is_blob_name(name):
+        MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + delta)
+
+
+def remember_blob_names(sender, instance, **kwargs):
+    instance._media_blob_names = _file_names(instance, BLOB_FIELDS[sender])
+
+
+def update_blob_refs_on_save(sender, instance, created, **kwargs):
+    old_names = {} if created else getattr(instance, '_media_blob_names', {})
+    new_names = _file_names(instance, BLOB_FIELDS[sender])
+
+    for field, new_name in new_names.items():
+        old_name = old_names.get(field)
+        if old_name == new_name:
+            continue
+        change_blob_refs(new_name, 1)
+        change_blob_refs(old_name, -1)
+
+    instance._media_blob_names = new_names
+
+
+def release_blob_refs_on_delete(sender, instance, **kwargs):
+    for name in _file_names(instance, BLOB_FIELDS[sender]).values():
+        change_blob_refs(name, -1)
+
+
+def connect_blob_ref_signals():
+    for model in apps.get_models():
+        fields = [
+            field.name for field in model._meta.get_fields()
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+        ]
+        if not fields:
+            continue
+
+        BLOB_FIELDS[model] = fields
+        uid = f"media_blob_refs_{model._meta.label_lower}"
+        post_init.connect(remember_blob_names, sender=model, dispatch_uid=uid)
+        post_save.connect(update_blob_refs_on_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(release_blob_refs_on_delete, sender=model, dispatch_uid=uid)
@@ -0,0 +1,57 @@
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils.encoding import force_bytes
+from django.utils.functional import SimpleLazyObject
+
+_signing_key = SimpleLazyObject(
+    lambda: hashlib.sha256(force_bytes('media-url:' + (settings.MEDIA_SIGNING_KEY or settings.SECRET_KEY))).digest()
+)
+
+
+def _signature(path, expires):
+    mac = hmac.new(bytes(_signing_key), f"{path}\n{expires}".encode(), hashlib.sha256)
+    return base64.urlsafe_b64encode(mac.digest()[:16]).rstrip(b'=').decode()
+
+
+def signed_expiry(limit=None, now=None):
+    # muddat MEDIA_SIGNED_URL_BUCKET ga yaxlitlanadi: shu oraliqda URL o'zgarmaydi va keshlanadi
+    now = int(now or time.time())
+    bucket = settings.MEDIA_SIGNED_URL_BUCKET
+    expires = (now + settings.MEDIA_SIGNED_URL_TTL) // bucket * bucket + bucket
+    if limit is not None:
+        expires = min(expires, int(limit))
+    return expires
+
+
+def sign_media_path(path, limit=None):
+    """
+    Imzolangan URL bearer token: uni olgan har kim muddat tugaguncha faylni ocha oladi. User ga bog'lanmaydi,
+    chunki <img>/<video> so'rovlari JWT header yubormaydi va serve_media so'rov egasini bila olmaydi.
+    Himoya - qisqa TTL (MEDIA_SIGNED_URL_TTL) va storis expires_at dan oshmaydigan muddat.
+    """
+    expires = signed_expiry(limit)
+    query = urlencode({"exp": expires, "sig": _signature(path, expires)})
+    return f"{settings.MEDIA_URL}{path}?{query}"
+
+
+def verify_media_signature(path, expires, signature, now=None):
+    """
+    DB ga murojaat qilmaydigan tekshiruv: media serving qatlamida har so'rovda chaqiriladi.
+    """
+    try:
+        if int(expires) < (now or time.time()):
+            return False
+    except (TypeError, ValueError):
+        return False
+    if not signature:
+        return False
+    return hmac.compare_digest(_signature(path, expires), signature)
+
+
+def requires_signature(path):
+    return path.startswith(settings.MEDIA_SIGNED_PREFIXES)
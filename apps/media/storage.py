@@ -0,0 +1,113 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.functional import LazyObject
+
+CAS_ROOT = 'cas'
+CAS_NAME_RE = re.compile(rf'^{CAS_ROOT}/([a-z]+/)?[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.[a-z0-9]+)?$')
+
+STORY_NAMESPACE = 'stories'
+
+
+def blob_name(digest, original_name, namespace=''):
+    ext = os.path.splitext(original_name)[1].lower()
+    root = f"{CAS_ROOT}/{namespace}" if namespace else CAS_ROOT
+    return f"{root}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_blob_name(name):
+    return bool(name and CAS_NAME_RE.match(name))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Fayllarni sha256 bo'yicha cas/[namespace/]ab/cd/<sha256>.<ext> ga saqlaydi. Bir xil kontent bir marta
+    yoziladi, havolalar soni MediaBlob.ref_count da yuritiladi (signallar orqali, taxminiy), o'chirish
+    gc_media_blobs da - u o'chirishdan oldin ref_count ni file fieldlardan qayta sanaydi.
+    namespace alohida himoya qilinadigan fayllar (masalan storislar) uchun.
+    """
+
+    def __init__(self, namespace='', **kwargs):
+        self.namespace = namespace
+        super().__init__(**kwargs)
+
+    def get_available_name(self, name, max_length=None):
+        # yakuniy nom _save ichida kontent hash idan olinadi, random suffix kerak emas
+        return name
+
+    def _save(self, name, content):
+        tmp_dir = self.path(os.path.join(CAS_ROOT, 'tmp'))
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            # fayl xotiraga to'liq yuklanmaydi: chunk bo'yicha hash qilinadi va yoziladi
+            with os.fdopen(fd, 'wb') as tmp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+                    size += len(chunk)
+
+            name = blob_name(digest.hexdigest(), name, self.namespace)
+            full_path = self.path(name)
+
+            # GC shu blobni o'chirayotgan bo'lsa, update uning tranzaksiyasi tugashini kutadi va 0 qaytaradi
+            MediaBlob = apps.get_model('media', 'MediaBlob')
+            touched = MediaBlob.objects.filter(name=name).update(last_uploaded_at=timezone.now())
+
+            if touched and os.path.exists(full_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+                os.replace(tmp_path, full_path)
+                MediaBlob.objects.get_or_create(
+                    name=name,
+                    defaults={"sha256": digest.hexdigest(), "size": size}
+                )
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return name
+
+    def delete(self, name):
+        # blob boshqa yozuvlarga ham tegishli bo'lishi mumkin, uni faqat GC o'chiradi
+        if is_blob_name(name):
+            return
+        super().delete(name)
+
+    def delete_blob(self, name):
+        super().delete(name)
+
+
+class DefaultContentAddressedStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+class StoryContentAddressedStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage(namespace=STORY_NAMESPACE)
+
+
+content_addressed_storage = DefaultContentAddressedStorage()
+story_storage = StoryContentAddressedStorage()
+
+
+def get_content_addressed_storage():
+    return content_addressed_storage
+
+
+def get_story_storage():
+    return story_storage
@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.media.models import MediaBlob
+from apps.media.storage import content_addressed_storage, get_story_storage
+from apps.media.signing import sign_media_path, signed_expiry, verify_media_signature, requires_signature
+
+STORY_PATH = 'cas/stories/ab/cd/' + 'a' * 64 + '.jpg'
+IMAGE_PATH = 'cas/ab/cd/' + 'b' * 64 + '.jpg'
+
+
+def signed_query(url):
+    query = parse_qs(urlsplit(url).query)
+    return query['exp'][0], query['sig'][0]
+
+
+@override_settings(MEDIA_SIGNING_KEY='test-key', MEDIA_SIGNED_URL_TTL=3600, MEDIA_SIGNED_URL_BUCKET=300)
+class MediaSigningTests(SimpleTestCase):
+    def test_expiry_is_bucketed(self):
+        self.assertEqual(signed_expiry(now=1000), 4800)
+        self.assertEqual(signed_expiry(now=1001), signed_expiry(now=1199))
+
+    def test_expiry_is_capped_by_limit(self):
+        self.assertEqual(signed_expiry(limit=2000, now=1000), 2000)
+
+    def test_signed_url_verifies(self):
+        url = sign_media_path(STORY_PATH)
+        self.assertTrue(url.startswith(f'/media/{STORY_PATH}?'))
+        expires, signature = signed_query(url)
+        self.assertTrue(verify_media_signature(STORY_PATH, expires, signature))
+
+    def test_tampered_path_or_expiry_is_rejected(self):
+        expires, signature = signed_query(sign_media_path(STORY_PATH))
+        self.assertFalse(verify_media_signature(STORY_PATH.replace('ab/cd', 'ab/ce'), expires, signature))
+        self.assertFalse(verify_media_signature(STORY_PATH, str(int(expires) + 300), signature))
+        tampered = signature[:-1] + ('B' if signature.endswith('A') else 'A')
+        self.assertFalse(verify_media_signature(STORY_PATH, expires, tampered))
+
+    def test_expired_or_malformed_signature_is_rejected(self):
+        expires, signature = signed_query(sign_media_path(STORY_PATH))
+        self.assertFalse(verify_media_signature(STORY_PATH, expires, signature, now=int(expires) + 1))
+        self.assertFalse(verify_media_signature(STORY_PATH, 'soon', signature))
+        self.assertFalse(verify_media_signature(STORY_PATH, None, signature))
+        self.assertFalse(verify_media_signature(STORY_PATH, expires, None))
+
+    def test_only_story_media_requires_signature(self):
+        self.assertTrue(requires_signature(STORY_PATH))
+        self.assertFalse(requires_signature('cas/ab/cd/' + 'b' * 64 + '.jpg'))
+
+
+@override_settings(MEDIA_SIGNING_KEY='test-key', MEDIA_ACCEL_REDIRECT_PREFIX='')
+class ServeSignedMediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        full_path = os.path.join(self.media_root, STORY_PATH)
+        os.makedirs(os.path.dirname(full_path))
+        with open(full_path, 'wb') as f:
+            f.write(b'story-bytes')
+
+    def test_unsigned_story_is_forbidden(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(f'/media/{STORY_PATH}')
+        self.assertEqual(response.status_code, 403)
+
+    def test_signed_story_is_served(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(sign_media_path(STORY_PATH))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'story-bytes')
+
+    def test_non_canonical_story_paths_are_forbidden(self):
+        directory, name = STORY_PATH.rsplit('/', 1)
+        for path in (
+                STORY_PATH.replace('cas/', 'cas//'),
+                './' + STORY_PATH,
+                'users/%2e%2e/' + STORY_PATH,
+                f'{directory}/./{name}',
+        ):
+            with self.subTest(path=path), self.settings(MEDIA_ROOT=self.media_root):
+                response = self.client.get(f'/media/{path}')
+                self.assertEqual(response.status_code, 403)
+
+    def test_signature_of_canonical_path_accepts_equivalent_form(self):
+        url = sign_media_path(STORY_PATH)
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(url.replace('/media/', '/media/./', 1))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Cache-Control'], 'private, max-age=3600')
+
+
+class BlobRefCountTests(TestCase):
+    def setUp(self):
+        self.blob = MediaBlob.objects.create(sha256='b' * 64, name=IMAGE_PATH)
+        user = get_user_model().objects.create_user('blob@example.com', full_name='blob')
+        self.profile = user.profile
+        self.profile.image = IMAGE_PATH
+        self.profile.save()
+
+    def test_save_and_delete_change_refs(self):
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.ref_count, 1)
+        self.profile.delete()
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.ref_count, 0)
+
+    def test_partially_loaded_instance_keeps_refs(self):
+        profile = type(self.profile).objects.only('id', 'bio').get(id=self.profile.id)
+        profile.bio = 'bio'
+        profile.save()
+        self.profile.refresh_from_db(fields=['bio'])
+
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.ref_count, 1)
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_same_content_is_stored_once(self):
+        first = content_addressed_storage.save('avatar.JPG', ContentFile(b'same bytes'))
+        second = content_addressed_storage.save('other.jpg', ContentFile(b'same bytes'))
+        story = get_story_storage().save('story.jpg', ContentFile(b'same bytes'))
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('cas/') and first.endswith('.jpg'))
+        self.assertTrue(story.startswith('cas/stories/'))
+        self.assertEqual(MediaBlob.objects.filter(name=first).get().size, len(b'same bytes'))
+        self.assertEqual(MediaBlob.objects.count(), 2)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'cas', 'tmp')), [])
+
+    def test_delete_keeps_shared_blob(self):
+        name = content_addressed_storage.save('avatar.jpg', ContentFile(b'shared'))
+        content_addressed_storage.delete(name)
+        self.assertTrue(content_addressed_storage.exists(name))
+
+    def test_gc_recounts_and_deletes_unreferenced_blobs(self):
+        used = content_addressed_storage.save('used.jpg', ContentFile(b'used'))
+        unused = content_addressed_storage.save('unused.jpg', ContentFile(b'unused'))
+        fresh = content_addressed_storage.save('fresh.jpg', ContentFile(b'fresh'))
+        profile = get_user_model().objects.create_user('gc@example.com', full_name='gc').profile
+        profile.image = used
+        profile.save()
+
+        # update() signallarni chetlab o'tadi: GC ref_count ni qayta sanashi kerak
+        MediaBlob.objects.filter(name=used).update(ref_count=0)
+        MediaBlob.objects.exclude(name=fresh).update(last_uploaded_at=timezone.now() - timedelta(days=2))
+
+        call_command('gc_media_blobs', stdout=StringIO())
+        self.assertEqual(set(MediaBlob.objects.values_list('name', 'ref_count')), {(used, 1), (fresh, 0)})
+        self.assertTrue(content_addressed_storage.exists(used))
+        self.assertFalse(content_addressed_storage.exists(unused))
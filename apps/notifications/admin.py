@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from apps.notifications.models import NotificationDigest
+
+
+@admin.register(NotificationDigest)
+class NotificationDigestAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'kind', 'window_start', 'actor_count', 'event_count', 'status', 'sent_at')
+    list_filter = ('kind', 'status')
+    list_per_page = 50
+    raw_id_fields = ('recipient', 'last_actor')
+    ordering = ('-window_start',)
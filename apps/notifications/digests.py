@@ -0,0 +1,196 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, Q
+from django.utils import timezone
+
+from apps.notifications.models import NotificationEvent, NotificationDigest, NotificationKindChoices, \
+    DigestStatusChoices
+from apps.profile.models import Follow, FollowChoices, PatientProfile
+from apps.users.choices import UserContactTypeChoices
+from apps.users.tasks import send_mail_batch
+
+# oxirgi yig'ilgan oyna oxiri. Kesh yo'qolsa lookback oynalar qayta yig'iladi: unique constraint dublikat bermaydi
+DIGESTED_UNTIL_KEY = 'notifications:digested_until'
+
+DIGEST_VERBS = {
+    NotificationKindChoices.FOLLOW: "sizni follow qildi",
+    NotificationKindChoices.FOLLOW_REQUEST: "sizga follow so'rovi yubordi",
+    NotificationKindChoices.STORY_VIEW: "storisingizni ko'rdi",
+}
+
+
+def window_floor(at, seconds):
+    epoch = int(at.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+
+def _follow_still_active():
+    # oyna ichida unfollow qilingan yoki rad etilgan so'rov digest ga kirmaydi
+    return Exists(Follow.objects.filter(
+        profile_id=OuterRef('actor_id'), following_id=OuterRef('recipient_id'),
+        status__in=[FollowChoices.follow, FollowChoices.requested]
+    ))
+
+
+def _profile_alive(field):
+    # hodisalarda FK constraint yo'q: o'chirilgan profilga ishora qilgan qator digest ga (FK bilan) tushmasligi kerak
+    return Exists(PatientProfile.objects.filter(id=OuterRef(field)))
+
+
+def aggregate_window(start, end):
+    """
+    [start, end) oynadagi hodisalarni (recipient, kind) bo'yicha bitta GROUP BY bilan digest qatorlariga yig'adi.
+    Bir kishi bir necha storisni ko'rsa ham bir marta sanaladi (actor_count).
+    """
+    rows = list(
+        NotificationEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+        .filter(_profile_alive('recipient_id'), _profile_alive('actor_id'))
+        .filter(Q(kind=NotificationKindChoices.STORY_VIEW) | Q(_follow_still_active()))
+        .values('recipient_id', 'kind')
+        .annotate(actor_count=Count('actor_id', distinct=True), event_count=Count('id'), last_event_id=Max('id'))
+        .order_by()
+    )
+    if not rows:
+        return 0
+
+    last_actors = dict(
+        NotificationEvent.objects.filter(id__in=[row['last_event_id'] for row in rows]).values_list('id', 'actor_id')
+    )
+    NotificationDigest.objects.bulk_create(
+        [
+            NotificationDigest(
+                recipient_id=row['recipient_id'], kind=row['kind'], window_start=start,
+                actor_count=row['actor_count'], event_count=row['event_count'],
+                last_actor_id=last_actors.get(row['last_event_id'])
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+    return len(rows)
+
+
+def aggregate_closed_windows(now=None):
+    """
+    Yopilgan oynalarni ketma-ket yig'adi. Oyna oxiridan NOTIFICATION_DIGEST_GRACE_SECONDS o'tgach yopilgan
+    hisoblanadi: shundan uzoq davom etgan tranzaksiyaning hodisasi digest ga kirmay qoladi.
+    """
+    now = now or timezone.now()
+    seconds = settings.NOTIFICATION_DIGEST_WINDOW_SECONDS
+    closed_until = window_floor(now - timedelta(seconds=settings.NOTIFICATION_DIGEST_GRACE_SECONDS), seconds)
+    start = cache.get(DIGESTED_UNTIL_KEY) or (
+        closed_until - timedelta(seconds=seconds * settings.NOTIFICATION_DIGEST_LOOKBACK_WINDOWS)
+    )
+
+    digests = 0
+    while start < closed_until:
+        end = start + timedelta(seconds=seconds)
+        digests += aggregate_window(start, end)
+        cache.set(DIGESTED_UNTIL_KEY, end, None)
+        start = end
+    return digests
+
+
+def pending_digest_ids(limit):
+    return list(
+        NotificationDigest.objects.filter(status=DigestStatusChoices.PENDING)
+        .order_by('id').values_list('id', flat=True)[:limit]
+    )
+
+
+def recover_stuck_digests(now=None):
+    # reminders dagi kabi: SENDING da qolgan digest qayta yuborilmaydi, dublikat xatdan ko'ra FAILED afzal
+    now = now or timezone.now()
+    return NotificationDigest.objects.filter(
+        status=DigestStatusChoices.SENDING,
+        claimed_at__lt=now - timedelta(seconds=settings.NOTIFICATION_DIGEST_CLAIM_TIMEOUT)
+    ).update(
+        status=DigestStatusChoices.FAILED,
+        error="Worker yuborish vaqtida to'xtagan, digest qayta yuborilmadi",
+        updated_at=now
+    )
+
+
+def digest_text(digest):
+    verb = DIGEST_VERBS[digest.kind]
+    name = digest.last_actor.full_name if digest.last_actor else None
+    if not name:
+        return f"{digest.actor_count} kishi {verb}"
+    if digest.actor_count > 1:
+        return f"{name} va yana {digest.actor_count - 1} kishi {verb}"
+    return f"{name} {verb}"
+
+
+def digest_message(recipient, digests):
+    subject = "Yangi bildirishnomalar"
+    message = "\n".join(digest_text(digest) for digest in digests)
+    return recipient.user.contact, subject, message
+
+
+def _deliverable(recipient):
+    return recipient.deleted_at is None and recipient.user.contact_type == UserContactTypeChoices.EMAIL
+
+
+def dispatch_digests(ids, now=None):
+    """
+    Digestlarni partiya qilib yuboradi: PENDING -> SENDING claim (skip_locked), keyin har recipient ga
+    uning barcha digestlari bitta xatda, xatlar bitta SMTP ulanish orqali. Email manzili yo'qlar SKIPPED
+    bo'ladi (ilova ichida baribir ko'rinadi).
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        digests = list(
+            NotificationDigest.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(id__in=ids, status=DigestStatusChoices.PENDING)
+            .select_related('recipient__user', 'last_actor')
+            .order_by('id')
+        )
+        if not digests:
+            return 0
+        NotificationDigest.objects.filter(id__in=[digest.id for digest in digests]).update(
+            status=DigestStatusChoices.SENDING, claimed_at=now, attempts=F('attempts') + 1, updated_at=now
+        )
+
+    by_recipient = defaultdict(list)
+    for digest in digests:
+        by_recipient[digest.recipient_id].append(digest)
+
+    skipped, groups = [], []
+    for recipient_digests in by_recipient.values():
+        if _deliverable(recipient_digests[0].recipient):
+            groups.append(recipient_digests)
+        else:
+            skipped.extend(digest.id for digest in recipient_digests)
+    NotificationDigest.objects.filter(id__in=skipped).update(
+        status=DigestStatusChoices.SKIPPED, error="Email manzili yo'q", updated_at=timezone.now()
+    )
+
+    errors = send_mail_batch([digest_message(group[0].recipient, group) for group in groups])
+
+    sent_ids = [digest.id for index, group in enumerate(groups) if index not in errors for digest in group]
+    NotificationDigest.objects.filter(id__in=sent_ids).update(
+        status=DigestStatusChoices.SENT, sent_at=timezone.now(), error=None, updated_at=timezone.now()
+    )
+    for index, error in errors.items():
+        for digest in groups[index]:
+            status = DigestStatusChoices.FAILED if digest.attempts + 1 >= settings.NOTIFICATION_DIGEST_MAX_ATTEMPTS \
+                else DigestStatusChoices.PENDING
+            NotificationDigest.objects.filter(id=digest.id).update(
+                status=status, error=error, updated_at=timezone.now()
+            )
+    return len(sent_ids)
+
+
+def prune_events(before, batch_size=5000):
+    # log faqat digest yig'ilguncha kerak: eski qatorlar qisqa tranzaksiyalar bilan partiyalab o'chiriladi
+    deleted = 0
+    while ids := list(
+        NotificationEvent.objects.filter(created_at__lt=before).values_list('id', flat=True)[:batch_size]
+    ):
+        deleted += NotificationEvent.objects.filter(id__in=ids).delete()[0]
+    return deleted
@@ -0,0 +1,18 @@
+from apps.notifications.models import NotificationEvent
+
+
+def record_event(kind, recipient_id, actor_id, object_id=None):
+    # hodisa chaqiruvchi tranzaksiyasida yoziladi: follow/ko'rish rollback bo'lsa, hodisa ham yo'qoladi
+    if recipient_id is None or recipient_id == actor_id:
+        return None
+    return NotificationEvent.objects.create(kind=kind, recipient_id=recipient_id, actor_id=actor_id,
+                                            object_id=object_id)
+
+
+def record_events(kind, recipient_id, actor_ids, object_id=None):
+    # bulk_create: minglab follow so'rovi tasdiqlanganda bitta INSERT
+    events = [
+        NotificationEvent(kind=kind, recipient_id=recipient_id, actor_id=actor_id, object_id=object_id)
+        for actor_id in actor_ids if actor_id != recipient_id
+    ]
+    return NotificationEvent.objects.bulk_create(events, batch_size=1000)
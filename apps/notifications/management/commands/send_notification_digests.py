@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.notifications.digests import aggregate_closed_windows, pending_digest_ids, dispatch_digests, \
+    recover_stuck_digests, prune_events
+
+
+class Command(BaseCommand):
+    help = "Follow va storis ko'rish hodisalarini oynalar bo'yicha digest ga yig'adi va email orqali yuboradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_DIGEST_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Worker rejimi: yopilgan oynalarni doimiy kuzatadi")
+        parser.add_argument('--sleep', type=int, default=60)
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options['batch_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+    def run_once(self, batch_size):
+        recovered = recover_stuck_digests()
+        if recovered:
+            self.stderr.write(f"{recovered} ta to'xtab qolgan digest FAILED deb belgilandi")
+
+        digests = aggregate_closed_windows()
+        sent, previous = 0, None
+        # bir xil partiya qaytsa - ularni boshqa worker lock qilgan, kutilmaydi
+        while (ids := pending_digest_ids(batch_size)) and ids != previous:
+            sent += dispatch_digests(ids)
+            previous = ids
+
+        pruned = prune_events(timezone.now() - timedelta(days=settings.NOTIFICATION_EVENT_RETENTION_DAYS))
+        if digests or sent or pruned:
+            self.stdout.write(self.style.SUCCESS(
+                f"{digests} ta digest yig'ildi, {sent} tasi yuborildi, {pruned} ta eski hodisa o'chirildi"
+            ))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:21
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('profile', '0013_follow_requests'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('kind', models.CharField(choices=[('follow', 'Follow'), ('follow_request', 'Follow request'), ('story_view', 'Story view')], max_length=20)),
+                ('window_start', models.DateTimeField()),
+                ('actor_count', models.PositiveIntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('last_actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='profile.patientprofile')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_digests', to='profile.patientprofile')),
+            ],
+            options={
+                'verbose_name': 'Notification Digest',
+                'verbose_name_plural': 'Notification Digests',
+                'db_table': 'notification_digest',
+                'indexes': [models.Index(fields=['recipient', '-window_start'], name='notification_digest_inbox_idx'), models.Index(condition=models.Q(('status', 'pending')), fields=['id'], name='notif_digest_pending_idx'), models.Index(condition=models.Q(('status', 'sending')), fields=['claimed_at'], name='notif_digest_sending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('recipient', 'kind', 'window_start'), name='notification_digest_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('follow', 'Follow'), ('follow_request', 'Follow request'), ('story_view', 'Story view')], max_length=20)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='profile.patientprofile')),
+                ('recipient', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='profile.patientprofile')),
+            ],
+            options={
+                'verbose_name': 'Notification Event',
+                'verbose_name_plural': 'Notification Events',
+                'db_table': 'notification_event',
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='notification_event_created_brin')],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models
+from django.db.models import Q
+
+from apps.profile.models import PatientProfile
+from apps.utils.base_models import CreateUpdateBaseModel
+
+
+class NotificationKindChoices(models.TextChoices):
+    FOLLOW = ('follow', 'Follow')
+    FOLLOW_REQUEST = ('follow_request', 'Follow request')
+    STORY_VIEW = ('story_view', 'Story view')
+
+
+class DigestStatusChoices(models.TextChoices):
+    PENDING = ('pending', 'Pending')
+    SENDING = ('sending', 'Sending')
+    SENT = ('sent', 'Sent')
+    # yetkazib bo'lmaydi (email yo'q, profil o'chirilgan) - faqat ilova ichida ko'rinadi
+    SKIPPED = ('skipped', 'Skipped')
+    FAILED = ('failed', 'Failed')
+
+
+class NotificationEvent(models.Model):
+    """
+    Append-only log: har follow/storis ko'rish uchun bitta INSERT, qator keyin hech qachon yangilanmaydi.
+    Yozish arzon bo'lishi uchun FK constraint va btree indekslar yo'q: created_at bo'yicha BRIN
+    (vaqt bo'yicha o'sib boruvchi jadval uchun bir necha sahifa), eski qatorlar retention bilan o'chiriladi.
+    BRIN faqat PostgreSQL da: SQLite (lokal dev, testlar) da Django USING qismini tashlab oddiy indeks yaratadi.
+    """
+    recipient = models.ForeignKey(PatientProfile, on_delete=models.DO_NOTHING, related_name='+',
+                                  db_constraint=False, db_index=False)
+    actor = models.ForeignKey(PatientProfile, on_delete=models.DO_NOTHING, related_name='+',
+                              db_constraint=False, db_index=False)
+    kind = models.CharField(max_length=20, choices=NotificationKindChoices.choices)
+    # story_view uchun story id si
+    object_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'notification_event'
+        verbose_name = 'Notification Event'
+        verbose_name_plural = 'Notification Events'
+        indexes = [
+            BrinIndex(fields=['created_at'], name='notification_event_created_brin'),
+        ]
+
+    def __str__(self):
+        return f"{self.actor_id} -> {self.recipient_id} {self.kind}"
+
+
+class NotificationDigest(CreateUpdateBaseModel):
+    """
+    Bitta oynadagi (window_start, +NOTIFICATION_DIGEST_WINDOW_SECONDS) bir turdagi hodisalar yig'indisi:
+    "12 kishi sizni follow qildi". Har (recipient, kind, oyna) uchun bitta qator.
+    """
+    recipient = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='notification_digests')
+    kind = models.CharField(max_length=20, choices=NotificationKindChoices.choices)
+    window_start = models.DateTimeField()
+    actor_count = models.PositiveIntegerField(default=0)
+    event_count = models.PositiveIntegerField(default=0)
+    last_actor = models.ForeignKey(PatientProfile, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='+')
+    status = models.CharField(max_length=20, choices=DigestStatusChoices.choices, default=DigestStatusChoices.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_digest'
+        verbose_name = 'Notification Digest'
+        verbose_name_plural = 'Notification Digests'
+        constraints = [
+            models.UniqueConstraint(fields=['recipient', 'kind', 'window_start'], name='notification_digest_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['recipient', '-window_start'], name='notification_digest_inbox_idx'),
+            models.Index(fields=['id'], name='notif_digest_pending_idx',
+                         condition=Q(status=DigestStatusChoices.PENDING)),
+            models.Index(fields=['claimed_at'], name='notif_digest_sending_idx',
+                         condition=Q(status=DigestStatusChoices.SENDING)),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} {self.kind} {self.window_start:%Y-%m-%d %H:%M}: {self.actor_count}"
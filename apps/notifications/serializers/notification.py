@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from apps.notifications.digests import digest_text
+from apps.notifications.models import NotificationDigest
+from apps.profile.serializers.follow import FollowProfileSerializer
+
+
+class NotificationDigestSerializer(serializers.ModelSerializer):
+    last_actor = FollowProfileSerializer(read_only=True)
+    text = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NotificationDigest
+        fields = ['id', 'kind', 'text', 'actor_count', 'event_count', 'last_actor', 'window_start']
+        read_only_fields = fields
+
+    def get_text(self, obj):
+        return digest_text(obj)
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from apps.notifications.events import record_event
+from apps.notifications.models import NotificationKindChoices
+from apps.profile.models import Follow, FollowChoices
+
+# Follow statusi -> hodisa turi. Storis ko'rish hodisasi profile.signals da yoziladi (muallif id si o'sha yerda bor)
+FOLLOW_EVENT_KINDS = {
+    FollowChoices.follow: NotificationKindChoices.FOLLOW,
+    FollowChoices.requested: NotificationKindChoices.FOLLOW_REQUEST,
+}
+
+
+@receiver(post_init, sender=Follow)
+def remember_follow_status(sender, instance, **kwargs):
+    # __dict__ dan: .only() bilan yuklangan qatorda status uchun qo'shimcha so'rov ketmasligi uchun
+    instance._notification_status = instance.__dict__.get('status') if instance.pk else None
+
+
+@receiver(post_save, sender=Follow)
+def record_follow_event(sender, instance, created, **kwargs):
+    # unfollow -> follow qayta follow ham hodisa; status o'zgarmagan save lar yozilmaydi
+    previous = None if created else getattr(instance, '_notification_status', None)
+    kind = FOLLOW_EVENT_KINDS.get(instance.status)
+    if kind and instance.status != previous:
+        record_event(kind, instance.following_id, instance.profile_id)
+    instance._notification_status = instance.status
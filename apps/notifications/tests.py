@@ -0,0 +1,159 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.notifications.digests import aggregate_window, dispatch_digests, pending_digest_ids, window_floor
+from apps.notifications.events import record_event
+from apps.notifications.models import NotificationDigest, NotificationEvent, NotificationKindChoices, \
+    DigestStatusChoices
+from apps.profile.deletion import process_account_deletion, request_account_deletion
+from apps.profile.follows import follow_profile, unfollow_profile
+from apps.profile.models import PatientProfile
+from apps.users.choices import UserContactTypeChoices
+
+User = get_user_model()
+
+
+def create_profile(contact):
+    user = User.objects.create_user(contact, full_name=contact.split('@')[0], contact_type=UserContactTypeChoices.EMAIL)
+    return PatientProfile.objects.get(user=user)
+
+
+class NotificationTestCase(TestCase):
+    def setUp(self):
+        self.recipient = create_profile('recipient@example.com')
+        self.actors = [create_profile(f'actor{index}@example.com') for index in range(3)]
+        self.window_start = window_floor(timezone.now(), 3600)
+        self.window_end = self.window_start + timedelta(hours=1)
+
+    def aggregate(self):
+        return aggregate_window(self.window_start, self.window_end)
+
+
+class AggregateWindowTests(NotificationTestCase):
+    def test_follows_are_grouped_per_recipient_and_kind(self):
+        for actor in self.actors:
+            follow_profile(actor, self.recipient)
+        record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.actors[0].id, object_id=1)
+        record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.actors[0].id, object_id=2)
+
+        self.assertEqual(self.aggregate(), 2)
+        follow_digest = NotificationDigest.objects.get(recipient=self.recipient, kind=NotificationKindChoices.FOLLOW)
+        self.assertEqual((follow_digest.actor_count, follow_digest.event_count), (3, 3))
+        self.assertEqual(follow_digest.last_actor, self.actors[2])
+        self.assertEqual(follow_digest.window_start, self.window_start)
+
+        view_digest = NotificationDigest.objects.get(recipient=self.recipient, kind=NotificationKindChoices.STORY_VIEW)
+        self.assertEqual((view_digest.actor_count, view_digest.event_count), (1, 2))
+
+    def test_unfollowed_within_window_is_skipped(self):
+        follow_profile(self.actors[0], self.recipient)
+        follow_profile(self.actors[1], self.recipient)
+        unfollow_profile(self.actors[1], self.recipient)
+
+        self.aggregate()
+        digest = NotificationDigest.objects.get(recipient=self.recipient, kind=NotificationKindChoices.FOLLOW)
+        self.assertEqual(digest.actor_count, 1)
+
+    def test_events_outside_window_are_ignored(self):
+        follow_profile(self.actors[0], self.recipient)
+        self.assertEqual(aggregate_window(self.window_end, self.window_end + timedelta(hours=1)), 0)
+        self.assertFalse(NotificationDigest.objects.exists())
+
+    def test_reaggregation_does_not_duplicate(self):
+        follow_profile(self.actors[0], self.recipient)
+        self.aggregate()
+        self.aggregate()
+        self.assertEqual(NotificationDigest.objects.count(), 1)
+
+    def test_events_of_deleted_profiles_are_skipped(self):
+        follow_profile(self.actors[0], self.recipient)
+        record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.actors[1].id, object_id=1)
+        record_event(NotificationKindChoices.STORY_VIEW, self.actors[2].id, self.actors[1].id, object_id=2)
+        PatientProfile.all_objects.filter(id=self.actors[1].id).delete()
+        PatientProfile.all_objects.filter(id=self.actors[2].id).soft_delete()
+
+        self.assertEqual(self.aggregate(), 1)
+        self.assertEqual(NotificationDigest.objects.get().kind, NotificationKindChoices.FOLLOW)
+
+    def test_account_deletion_removes_events(self):
+        follow_profile(self.actors[0], self.recipient)
+        record_event(NotificationKindChoices.STORY_VIEW, self.actors[1].id, self.actors[0].id, object_id=1)
+        record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.actors[1].id, object_id=2)
+
+        process_account_deletion(request_account_deletion(self.actors[0].user), batch_size=1)
+        self.assertEqual(list(NotificationEvent.objects.values_list('actor_id', flat=True)), [self.actors[1].id])
+        self.assertEqual(self.aggregate(), 1)
+
+    def test_self_events_are_not_recorded(self):
+        self.assertIsNone(record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.recipient.id))
+        self.assertFalse(NotificationEvent.objects.exists())
+
+
+class DispatchDigestTests(NotificationTestCase):
+    def test_one_mail_per_recipient(self):
+        for actor in self.actors:
+            follow_profile(actor, self.recipient)
+        record_event(NotificationKindChoices.STORY_VIEW, self.recipient.id, self.actors[0].id, object_id=1)
+        self.aggregate()
+
+        self.assertEqual(dispatch_digests(pending_digest_ids(10)), 2)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['recipient@example.com'])
+        self.assertIn("actor2 va yana 2 kishi sizni follow qildi", mail.outbox[0].body)
+        self.assertEqual(
+            set(NotificationDigest.objects.values_list('status', flat=True)), {DigestStatusChoices.SENT}
+        )
+        self.assertEqual(dispatch_digests(pending_digest_ids(10)), 0)
+
+    @override_settings(EMAIL_BACKEND='apps.users.tests.UnreachableEmailBackend', NOTIFICATION_DIGEST_MAX_ATTEMPTS=3)
+    def test_unreachable_smtp_requeues_digests(self):
+        follow_profile(self.actors[0], self.recipient)
+        self.aggregate()
+
+        with self.assertLogs('apps.users.tasks', 'ERROR'):
+            self.assertEqual(dispatch_digests(pending_digest_ids(10)), 0)
+        digest = NotificationDigest.objects.get()
+        self.assertEqual((digest.status, digest.attempts), (DigestStatusChoices.PENDING, 1))
+
+    def test_recipient_without_email_is_skipped(self):
+        User.objects.filter(id=self.recipient.user_id).update(contact_type=UserContactTypeChoices.PHONE)
+        follow_profile(self.actors[0], self.recipient)
+        self.aggregate()
+
+        self.assertEqual(dispatch_digests(pending_digest_ids(10)), 0)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(NotificationDigest.objects.get().status, DigestStatusChoices.SKIPPED)
+
+
+class NotificationAPITests(NotificationTestCase):
+    def test_lists_own_digests_newest_first(self):
+        follow_profile(self.actors[0], self.recipient)
+        self.aggregate()
+        NotificationDigest.objects.create(
+            recipient=self.recipient, kind=NotificationKindChoices.STORY_VIEW,
+            window_start=self.window_start - timedelta(hours=1), actor_count=2, event_count=2
+        )
+        NotificationDigest.objects.create(
+            recipient=self.actors[1], kind=NotificationKindChoices.FOLLOW, window_start=self.window_start,
+            actor_count=1, event_count=1
+        )
+
+        client = APIClient()
+        client.force_authenticate(self.recipient.user)
+        response = client.get(reverse('notifications:notification-list'))
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([row['kind'] for row in results],
+                         [NotificationKindChoices.FOLLOW, NotificationKindChoices.STORY_VIEW])
+        self.assertEqual(results[0]['text'], "actor0 sizni follow qildi")
+        self.assertEqual(results[1]['text'], "2 kishi storisingizni ko'rdi")
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse('notifications:notification-list'))
+        self.assertEqual(response.status_code, 401)
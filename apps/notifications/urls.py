@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.notifications.views.notification_views import NotificationListAPIView
+
+app_name = 'notifications'
+
+urlpatterns = [
+    path('', NotificationListAPIView.as_view(), name='notification-list'),
+]
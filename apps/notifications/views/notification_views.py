@@ -0,0 +1,24 @@
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.notifications.models import NotificationDigest
+from apps.notifications.paginations import NotificationListPagination
+from apps.notifications.serializers.notification import NotificationDigestSerializer
+from apps.profile.relationships import viewer_profile_id
+from apps.utils.db_router import ReadReplicaMixin
+
+
+class NotificationListAPIView(ReadReplicaMixin, ListAPIView):
+    """
+    Ilova ichidagi bildirishnomalar: yopilgan oynalar digestlari, eng yangisi birinchi.
+    """
+    serializer_class = NotificationDigestSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = NotificationListPagination
+
+    def get_queryset(self):
+        return (
+            NotificationDigest.objects.filter(recipient_id=viewer_profile_id(self.request.user))
+            .select_related('last_actor')
+            .order_by('-window_start', '-id')
+        )
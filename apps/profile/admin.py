@@ -1,13 +1,14 @@
 from django.contrib import admin
-from apps.profile.models import Profile, Story, StoryView
+from apps.profile.models import PatientProfile, Story, StoryView, StoryAffinity, StoryUpload, AccountDeletion, \
+    FollowSuggestion
 
 
-@admin.register(Profile)
+@admin.register(PatientProfile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = (
-    'public_id', 'username', 'full_name', 'user', 'followers_count', 'slug', 'following_count', 'posts_count',
+    'public_id', 'full_name', 'user', 'followers_count', 'slug', 'following_count', 'posts_count',
     'is_private')
-    search_fields = ('username', 'full_name', 'user__email')
+    search_fields = ('full_name', 'user__contact')
     list_filter = ('is_private',)
     list_per_page = 20
     ordering = ('-created_at',)
@@ -15,8 +16,8 @@ class ProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Story)
 class StoryAdmin(admin.ModelAdmin):
-    list_display = ['id', 'public_id', 'profile', 'content_type', 'view_count', 'expires_at', 'is_expired_display']
-    search_fields = ['profile__username', 'profile__full_name']
+    list_display = ['id', 'public_id', 'user', 'content_type', 'view_count', 'expires_at', 'is_expired_display']
+    search_fields = ['user__full_name', 'user__contact']
     list_filter = ['content_type']
     list_per_page = 20
     ordering = ['-created_at']
@@ -32,7 +33,42 @@ class StoryAdmin(admin.ModelAdmin):
 @admin.register(StoryView)
 class StoryViewAdmin(admin.ModelAdmin):
     list_display = ('story', 'view_profile', 'viewed_at')
-    search_fields = ('story__profile__username', 'view_profile__username')
+    search_fields = ('story__user__full_name', 'view_profile__full_name')
     list_filter = ('story__content_type', 'viewed_at')
+    list_select_related = ('story', 'view_profile')
     list_per_page = 20
     ordering = ('-viewed_at',)
+    # count(*) barcha partitionlarni o'qiydi
+    show_full_result_count = False
+
+
+@admin.register(StoryAffinity)
+class StoryAffinityAdmin(admin.ModelAdmin):
+    list_display = ('viewer', 'author', 'score', 'updated_at')
+    list_per_page = 20
+    ordering = ('viewer', '-score')
+
+
+@admin.register(FollowSuggestion)
+class FollowSuggestionAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'suggested', 'score', 'mutual_count', 'computed_at')
+    raw_id_fields = ('profile', 'suggested')
+    list_per_page = 20
+    ordering = ('profile', '-score')
+
+
+@admin.register(StoryUpload)
+class StoryUploadAdmin(admin.ModelAdmin):
+    list_display = ('upload_id', 'user', 'content_type', 'offset', 'size', 'status', 'expires_at')
+    list_filter = ('status',)
+    list_per_page = 20
+    ordering = ('-created_at',)
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'profile_id', 'status', 'stage', 'processed', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    list_per_page = 20
+    ordering = ('-created_at',)
+    readonly_fields = ('processed', 'stage', 'error', 'finished_at')
@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.notifications.models import NotificationEvent, NotificationDigest
+from apps.profile.models import (PatientProfile, Story, StoryView, Follow, FollowChoices, StoryAffinity,
+                                 FollowSuggestion, AccountDeletion, AccountDeletionStatusChoices)
+
+User = get_user_model()
+
+DELETION_BATCH_SIZE = 1000
+
+
+def request_account_deletion(user):
+    """
+    Akkaunt darhol deaktiv qilinadi, og'ir o'chirish ishi process_account_deletions ga qoldiriladi.
+    """
+    with transaction.atomic():
+        User.objects.filter(id=user.id).update(is_active=False)
+        profile_id = PatientProfile.all_objects.filter(user=user).values_list('id', flat=True).first()
+        PatientProfile.all_objects.filter(id=profile_id).soft_delete()
+        job, created = AccountDeletion.objects.get_or_create(user=user, defaults={"profile_id": profile_id})
+    return job
+
+
+def _batches(queryset, fields, batch_size):
+    # har partiya o'chirilgani uchun navbatdagi partiya yana boshidan olinadi
+    while True:
+        rows = list(queryset.order_by('id').values_list('id', *fields)[:batch_size])
+        if not rows:
+            return
+        yield rows
+
+
+def _delete_outgoing_follows(profile_id, batch_size):
+    for rows in _batches(Follow.all_objects.filter(profile_id=profile_id), ['following_id', 'status'], batch_size):
+        with transaction.atomic():
+            followed_ids = [following_id for _, following_id, status in rows if status == FollowChoices.follow]
+            PatientProfile.objects.filter(id__in=followed_ids).update(
+                followers_count=Greatest(F('followers_count') - 1, 0)
+            )
+            Follow.all_objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_incoming_follows(profile_id, batch_size):
+    for rows in _batches(Follow.all_objects.filter(following_id=profile_id), ['profile_id', 'status'], batch_size):
+        with transaction.atomic():
+            follower_ids = [follower_id for _, follower_id, status in rows if status == FollowChoices.follow]
+            PatientProfile.objects.filter(id__in=follower_ids).update(
+                following_count=Greatest(F('following_count') - 1, 0)
+            )
+            Follow.all_objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_views_made(profile_id, batch_size):
+    for rows in _batches(StoryView.objects.filter(view_profile_id=profile_id), ['story_id'], batch_size):
+        with transaction.atomic():
+            Story.objects.filter(id__in=[story_id for _, story_id in rows]).update(
+                view_count=Greatest(F('view_count') - 1, 0)
+            )
+            StoryView.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_views_received(user_id, batch_size):
+    for rows in _batches(StoryView.objects.filter(story__user_id=user_id), [], batch_size):
+        with transaction.atomic():
+            StoryView.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_stories(user_id, batch_size):
+    for rows in _batches(Story.all_objects.filter(user_id=user_id), [], batch_size):
+        with transaction.atomic():
+            # queryset.delete post_delete yuboradi: media blob havolalari shu yerda kamayadi, fayllarni GC o'chiradi
+            Story.all_objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_affinities(profile_id, batch_size):
+    queryset = StoryAffinity.objects.filter(Q(viewer_id=profile_id) | Q(author_id=profile_id))
+    for rows in _batches(queryset, [], batch_size):
+        StoryAffinity.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_follow_suggestions(profile_id, batch_size):
+    # mashhur akkaunt minglab boshqa profillarning tavsiyalarida turadi: profil cascade i ularni bitta so'rovda o'chirardi
+    queryset = FollowSuggestion.objects.filter(Q(profile_id=profile_id) | Q(suggested_id=profile_id))
+    for rows in _batches(queryset, [], batch_size):
+        FollowSuggestion.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_notifications(profile_id, batch_size):
+    for rows in _batches(NotificationDigest.objects.filter(recipient_id=profile_id), [], batch_size):
+        NotificationDigest.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+    # boshqalarning digestlarida oxirgi actor sifatida (SET_NULL) - ular o'chirilmaydi
+    for rows in _batches(NotificationDigest.objects.filter(last_actor_id=profile_id), [], batch_size):
+        NotificationDigest.objects.filter(id__in=[row[0] for row in rows]).update(last_actor=None)
+        yield len(rows)
+
+
+def _delete_notification_events(profile_id, batch_size):
+    # hodisalarda FK constraint yo'q: cascade ularga yetmaydi, shuning uchun alohida o'chiriladi
+    queryset = NotificationEvent.objects.filter(Q(recipient_id=profile_id) | Q(actor_id=profile_id))
+    for rows in _batches(queryset, [], batch_size):
+        NotificationEvent.objects.filter(id__in=[row[0] for row in rows]).delete()
+        yield len(rows)
+
+
+def _delete_profile(profile_id, batch_size):
+    deleted, _ = PatientProfile.all_objects.filter(id=profile_id).delete()
+    yield deleted
+
+
+def deletion_stages(job):
+    return [
+        ('outgoing_follows', _delete_outgoing_follows, job.profile_id),
+        ('incoming_follows', _delete_incoming_follows, job.profile_id),
+        ('views_made', _delete_views_made, job.profile_id),
+        ('views_received', _delete_views_received, job.user_id),
+        ('stories', _delete_stories, job.user_id),
+        ('affinities', _delete_affinities, job.profile_id),
+        ('follow_suggestions', _delete_follow_suggestions, job.profile_id),
+        ('notifications', _delete_notifications, job.profile_id),
+        ('notification_events', _delete_notification_events, job.profile_id),
+        ('profile', _delete_profile, job.profile_id),
+    ]
+
+
+def process_account_deletion(job, batch_size=DELETION_BATCH_SIZE):
+    """
+    Har partiya alohida qisqa tranzaksiyada bajariladi, uzoq lock ushlanmaydi.
+    Ish to'xtab qolsa qayta ishga tushirish xavfsiz: qolgan qatorlardan davom etadi.
+    """
+    for stage, handler, object_id in deletion_stages(job):
+        if object_id is None:
+            continue
+        AccountDeletion.objects.filter(id=job.id).update(stage=stage, updated_at=timezone.now())
+        for processed in handler(object_id, batch_size):
+            AccountDeletion.objects.filter(id=job.id).update(processed=F('processed') + processed)
+
+    AccountDeletion.objects.filter(id=job.id).update(
+        status=AccountDeletionStatusChoices.DONE,
+        finished_at=timezone.now(),
+        updated_at=timezone.now()
+    )
+
+
+def claim_next_deletion():
+    with transaction.atomic():
+        job = (
+            AccountDeletion.objects.select_for_update(skip_locked=True)
+            .filter(status=AccountDeletionStatusChoices.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job:
+            job.status = AccountDeletionStatusChoices.RUNNING
+            job.save(update_fields=['status', 'updated_at'])
+    return job
@@ -1,5 +1,5 @@
 import django_filters
-from apps.profile.models import Profile, Story
+from apps.profile.models import PatientProfile, Story
 
 
 class UserProfileListFilter(django_filters.FilterSet):
@@ -9,7 +9,7 @@ class UserProfileListFilter(django_filters.FilterSet):
     updated_at__lte = django_filters.DateTimeFilter(field_name='updated_at', lookup_expr='lte')
 
     class Meta:
-        model = Profile
+        model = PatientProfile
         fields = ['created_at__gte', 'created_at__lte', 'updated_at__gte', 'updated_at__lte']
 
 
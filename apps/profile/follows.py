@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.notifications.events import record_events
+from apps.notifications.models import NotificationKindChoices
+from apps.profile.models import Follow, FollowChoices, PatientProfile
+from apps.profile.ranking import record_follows
+from apps.utils.CustomValidationError import CustomValidationError
+
+APPROVE_BATCH_SIZE = 500
+
+
+def _change_counts(follower_id, following_id, delta):
+    PatientProfile.objects.filter(id=follower_id).update(following_count=Greatest(F('following_count') + delta, 0))
+    PatientProfile.objects.filter(id=following_id).update(followers_count=Greatest(F('followers_count') + delta, 0))
+
+
+def follow_profile(profile, target):
+    """
+    Ochiq profil darhol follow qilinadi, yopiq (is_private) profilga so'rov (requested) yuboriladi.
+    Hisoblagichlar faqat status follow bo'lganda o'zgaradi.
+    """
+    if profile.id == target.id:
+        raise CustomValidationError(detail="O'zingizni follow qila olmaysiz")
+
+    status = FollowChoices.requested if target.is_private else FollowChoices.follow
+    with transaction.atomic():
+        follow_obj, created = Follow.objects.select_for_update().get_or_create(
+            profile=profile, following=target, defaults={"status": status}
+        )
+        if not created:
+            if follow_obj.status == FollowChoices.follow:
+                raise CustomValidationError(detail="Siz allaqachon follow qilgansiz")
+            if follow_obj.status == FollowChoices.requested:
+                raise CustomValidationError(detail="Follow so'rovi allaqachon yuborilgan")
+            follow_obj.status = status
+            follow_obj.save(update_fields=['status', 'updated_at'])
+
+        if status == FollowChoices.follow:
+            _change_counts(profile.id, target.id, 1)
+    return follow_obj
+
+
+def unfollow_profile(profile, target):
+    # kutilayotgan so'rovni bekor qilish ham shu yerda: hisoblagichlarga tegmaydi
+    if profile.id == target.id:
+        raise CustomValidationError(detail="O'zingizni unfollow qila olmaysiz")
+
+    with transaction.atomic():
+        follow_obj = Follow.objects.select_for_update().filter(
+            profile=profile, following=target, status__in=[FollowChoices.follow, FollowChoices.requested]
+        ).first()
+        if follow_obj is None:
+            raise CustomValidationError(detail="Siz bu userni follow qilmagansiz")
+
+        was_following = follow_obj.status == FollowChoices.follow
+        follow_obj.status = FollowChoices.unfollow
+        follow_obj.save(update_fields=['status', 'updated_at'])
+        if was_following:
+            _change_counts(profile.id, target.id, -1)
+    return follow_obj
+
+
+def follow_requests(target_id):
+    return Follow.objects.filter(following_id=target_id, status=FollowChoices.requested)
+
+
+def approve_follow_requests(target_id, request_ids=None):
+    """
+    Kutilayotgan so'rovlarni (request_ids=None - hammasini) bitta tranzaksiyada tasdiqlaydi. So'rov qatorlari
+    lock qilinadi va APPROVE_BATCH_SIZE lik partiyalarda: Follow statuslari bitta UPDATE, followerlarning
+    following_count i bitta UPDATE ((profile, following) unique - har biriga +1), notification hodisalari
+    bitta bulk INSERT. target ning followers_count i oxirida umumiy delta bilan.
+    queryset.update() post_save yubormaydi, shuning uchun hodisa va affinity shu yerda yoziladi.
+    """
+    queryset = follow_requests(target_id)
+    if request_ids is not None:
+        queryset = queryset.filter(id__in=request_ids)
+
+    approved = 0
+    with transaction.atomic():
+        # target qatori lock: bir profilning parallel approve/reject lari ketma-ket bajariladi
+        PatientProfile.objects.select_for_update().filter(id=target_id).values_list('id').first()
+        # so'rov qatorlari lock: follower shu paytda so'rovini bekor qila olmaydi
+        rows = list(queryset.select_for_update().order_by('id').values_list('id', 'profile_id'))
+        now = timezone.now()
+        for start in range(0, len(rows), APPROVE_BATCH_SIZE):
+            batch = rows[start:start + APPROVE_BATCH_SIZE]
+            follower_ids = [profile_id for _, profile_id in batch]
+            Follow.objects.filter(id__in=[follow_id for follow_id, _ in batch]).update(
+                status=FollowChoices.follow, updated_at=now
+            )
+            PatientProfile.objects.filter(id__in=follower_ids).update(following_count=F('following_count') + 1)
+            record_events(NotificationKindChoices.FOLLOW, target_id, follower_ids)
+            record_follows(follower_ids, target_id, now)
+            approved += len(batch)
+        if approved:
+            PatientProfile.objects.filter(id=target_id).update(followers_count=F('followers_count') + approved)
+    return approved
+
+
+def reject_follow_requests(target_id, request_ids=None):
+    # rad etilgan so'rov soft delete qilinadi: keyin qayta so'rov yuborish mumkin, hisoblagichlar o'zgarmaydi
+    queryset = follow_requests(target_id)
+    if request_ids is not None:
+        queryset = queryset.filter(id__in=request_ids)
+    return queryset.soft_delete()
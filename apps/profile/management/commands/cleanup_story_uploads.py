@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.profile.models import StoryUpload, StoryUploadStatusChoices
+from apps.profile.uploads import delete_parts
+
+
+class Command(BaseCommand):
+    help = "Muddati tugagan yoki bekor qilingan storis yuklashlarining partlarini o'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        uploads = StoryUpload.objects.filter(
+            status=StoryUploadStatusChoices.PENDING,
+            expires_at__lt=timezone.now()
+        ) | StoryUpload.objects.filter(status=StoryUploadStatusChoices.ABORTED)
+
+        removed = 0
+        for upload in uploads.only('upload_id', 'status').iterator(chunk_size=options['batch_size']):
+            delete_parts(upload)
+            removed += 1
+
+        expired = StoryUpload.objects.filter(
+            status=StoryUploadStatusChoices.PENDING,
+            expires_at__lt=timezone.now()
+        ).update(status=StoryUploadStatusChoices.ABORTED)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{removed} ta yuklashning partlari o'chirildi, {expired} ta yuklash bekor qilindi"
+        ))
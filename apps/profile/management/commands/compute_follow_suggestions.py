@@ -0,0 +1,50 @@
+import resource
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.profile.models import FollowSuggestion
+from apps.profile.suggestions import load_follow_graph, co_follow_graph, score_rows, top_suggestions, \
+    save_suggestions
+
+
+class Command(BaseCommand):
+    help = ("Follow grafidan (friends-of-friends + co-follow) har profil uchun top-K tavsiyalarni "
+            "sparse matritsalar bilan hisoblab follow_suggestion jadvaliga yozadi")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=settings.FOLLOW_SUGGESTION_TOP_K)
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help="Bir vaqtda hisoblanadigan profillar (qatorlar) soni")
+        parser.add_argument('--hub-limit', type=int, default=settings.FOLLOW_SUGGESTION_HUB_LIMIT,
+                            help="Shundan ko'p followerli akkauntlar co-follow o'xshashligida hisobga olinmaydi")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        computed_at = timezone.now()
+
+        graph, profile_ids = load_follow_graph()
+        co_rows, co_columns = co_follow_graph(graph, options['hub_limit'])
+        loaded = time.monotonic() - started
+
+        # faqat kimnidir follow qiladigan profillar uchun nomzod bor
+        sources = np.flatnonzero(np.diff(graph.indptr))
+        written = 0
+        for offset in range(0, len(sources), options['chunk_size']):
+            rows = sources[offset:offset + options['chunk_size']]
+            scores, fof = score_rows(graph, co_rows, co_columns, rows)
+            suggestions = top_suggestions(scores, fof, rows, profile_ids, options['top_k'])
+            written += save_suggestions([int(profile_ids[row]) for row in rows], suggestions, computed_at)
+
+        # endi hech kimni follow qilmaydigan profillarning eski tavsiyalari
+        stale, _ = FollowSuggestion.objects.filter(computed_at__lt=computed_at).delete()
+
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(profile_ids)} ta profil, {graph.nnz} ta follow: {len(sources)} ta profil uchun {written} ta "
+            f"tavsiya yozildi, {stale} ta eski o'chirildi. Graf {loaded:.1f}s, jami {time.monotonic() - started:.1f}s, "
+            f"xotira (peak RSS) {peak_mb:.0f} MB"
+        ))
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.profile.partitions import convert_to_partitioned, ensure_partitions, detach_old_partitions
+
+
+class Command(BaseCommand):
+    help = "story va story_view uchun kelgusi kunlik partitionlarni yaratadi va eskilarini arxivlaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help="Bir martalik: mavjud jadvallarni partitionlangan jadvalga almashtiradi")
+        parser.add_argument('--days-ahead', type=int, default=settings.STORY_PARTITION_DAYS_AHEAD)
+        parser.add_argument('--retention-days', type=int, default=settings.STORY_PARTITION_RETENTION_DAYS)
+        parser.add_argument('--archive-schema', default=settings.STORY_PARTITION_ARCHIVE_SCHEMA)
+        parser.add_argument('--drop', action='store_true',
+                            help="Eski partitionlarni arxivlash o'rniga butunlay o'chiradi")
+        parser.add_argument('--concurrently', action='store_true',
+                            help="DETACH PARTITION ... CONCURRENTLY (PostgreSQL 14+)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning faqat PostgreSQL da ishlaydi")
+
+        if options['convert']:
+            converted = convert_to_partitioned(
+                options['retention_days'], options['days_ahead'], options['archive_schema']
+            )
+            self.stdout.write(f"Partitionlangan jadvallar: {', '.join(converted) or '-'}")
+
+        created = ensure_partitions(options['days_ahead'])
+        self.stdout.write(f"{len(created)} ta yangi partition yaratildi")
+
+        detached = detach_old_partitions(
+            options['retention_days'], options['archive_schema'], options['drop'], options['concurrently']
+        )
+        action = "o'chirildi" if options['drop'] else f"{options['archive_schema']} sxemasiga ko'chirildi"
+        self.stdout.write(self.style.SUCCESS(f"{len(detached)} ta eski partition {action}"))
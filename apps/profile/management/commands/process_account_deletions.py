@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.profile.deletion import claim_next_deletion, process_account_deletion, DELETION_BATCH_SIZE
+from apps.profile.models import AccountDeletion, AccountDeletionStatusChoices
+
+
+class Command(BaseCommand):
+    help = "O'chirishga so'ralgan akkauntlarning storis, ko'rishlar, follow va media ma'lumotlarini partiyalab o'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETION_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Worker rejimi: navbatni doimiy kuzatadi")
+        parser.add_argument('--sleep', type=int, default=10)
+        parser.add_argument('--retry', action='store_true',
+                            help="Xato bilan tugagan yoki to'xtab qolgan ishlarni qayta navbatga qo'yadi")
+
+    def handle(self, *args, **options):
+        if options['retry']:
+            AccountDeletion.objects.filter(
+                status__in=[AccountDeletionStatusChoices.FAILED, AccountDeletionStatusChoices.RUNNING]
+            ).update(status=AccountDeletionStatusChoices.PENDING, error=None, updated_at=timezone.now())
+
+        while True:
+            job = claim_next_deletion()
+            if job is None:
+                if not options['loop']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            try:
+                process_account_deletion(job, options['batch_size'])
+                self.stdout.write(self.style.SUCCESS(f"User {job.user_id} ma'lumotlari o'chirildi"))
+            except Exception as e:
+                AccountDeletion.objects.filter(id=job.id).update(
+                    status=AccountDeletionStatusChoices.FAILED, error=str(e), updated_at=timezone.now()
+                )
+                self.stderr.write(f"User {job.user_id} ni o'chirishda xatolik: {e}")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.profile.models import Follow, FollowChoices
+from apps.profile.ranking import recompute_affinity
+
+
+class Command(BaseCommand):
+    help = "StoryView va Follow tarixidan (viewer, author) affinity scorelarini qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--viewer', type=int, action='append', dest='viewers',
+                            help="Faqat shu profile id lar uchun (bir necha marta berish mumkin)")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        viewer_ids = options['viewers'] or (
+            Follow.objects.filter(status=FollowChoices.follow)
+            .values_list('profile_id', flat=True)
+            .distinct()
+            .order_by('profile_id')
+            .iterator(chunk_size=batch_size)
+        )
+
+        batch, viewers, pairs = [], 0, 0
+        for viewer_id in viewer_ids:
+            batch.append(viewer_id)
+            if len(batch) >= batch_size:
+                pairs += recompute_affinity(batch)
+                viewers += len(batch)
+                batch = []
+        if batch:
+            pairs += recompute_affinity(batch)
+            viewers += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{viewers} ta viewer uchun {pairs} ta affinity yozildi"))
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_story_user(apps, schema_editor):
+    # story.profile -> story.user: muallif profil orqali emas, to'g'ridan-to'g'ri user ga bog'lanadi
+    Story = apps.get_model('profile', 'Story')
+    PatientProfile = apps.get_model('profile', 'PatientProfile')
+    user_ids = dict(PatientProfile.objects.values_list('id', 'user_id'))
+    for story in Story.objects.filter(user__isnull=True).only('id', 'profile_id').iterator():
+        Story.objects.filter(id=story.id).update(user_id=user_ids.get(story.profile_id))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0003_story_public_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='Profile',
+            new_name='PatientProfile',
+        ),
+        migrations.AlterModelTable(
+            name='patientprofile',
+            table='patient_profile',
+        ),
+        migrations.AlterModelOptions(
+            name='patientprofile',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Patient Profile',
+                     'verbose_name_plural': 'Patients Profile'},
+        ),
+        migrations.RemoveField(
+            model_name='patientprofile',
+            name='username',
+        ),
+        migrations.AlterField(
+            model_name='patientprofile',
+            name='full_name',
+            field=models.CharField(max_length=250, null=True),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='story',
+                                    to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='role',
+            field=models.CharField(choices=[('Shifokor', 'Shifokor'), ('Admin', 'Admin'),
+                                            ('SuperAdmin', 'SuperAdmin'), ('FOYDALANUVCHI', 'FOYDALANUVCHI'),
+                                            ('Klinika', 'Klinika'), ('PharmCompany', 'PharmCompany'),
+                                            ('MedBrat', 'MedBrat'), ('Menejer', 'Menejer')],
+                                   default='FOYDALANUVCHI', max_length=50),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_story_user, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='story',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='story',
+                                    to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='profile',
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0004_patientprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoryAffinity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profile.patientprofile')),
+                ('viewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='story_affinities', to='profile.patientprofile')),
+            ],
+            options={
+                'verbose_name': 'Story Affinity',
+                'verbose_name_plural': 'Story Affinities',
+                'db_table': 'story_affinity',
+                'unique_together': {('viewer', 'author')},
+            },
+        ),
+    ]
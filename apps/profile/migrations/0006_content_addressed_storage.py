@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:14
+
+import apps.media.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0005_storyaffinity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='patientprofile',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=apps.media.storage.get_content_addressed_storage, upload_to='users/profile/image/'),
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='content',
+            field=models.FileField(null=True, storage=apps.media.storage.get_content_addressed_storage, upload_to='users/profile/story/'),
+        ),
+    ]
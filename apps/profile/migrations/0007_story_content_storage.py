@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:15
+
+import apps.media.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0006_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='story',
+            name='content',
+            field=models.FileField(null=True, storage=apps.media.storage.get_story_storage, upload_to='users/profile/story/'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_story_created_at(apps, schema_editor):
+    # eski ko'rishlar mark_viewed dagi (story, view_profile, story_created_at) qidiruviga tushishi uchun
+    Story = apps.get_model('profile', 'Story')
+    StoryView = apps.get_model('profile', 'StoryView')
+    StoryView.objects.filter(story_created_at__isnull=True).update(
+        story_created_at=models.Subquery(Story.objects.filter(id=models.OuterRef('story_id')).values('created_at')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0010_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='storyview',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='storyview',
+            name='story_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_story_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='storyupload',
+            name='story',
+            field=models.OneToOneField(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='profile.story'),
+        ),
+        migrations.AlterField(
+            model_name='storyview',
+            name='story',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='story_view', to='profile.story'),
+        ),
+        migrations.AlterField(
+            model_name='story',
+            name='public_id',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='story',
+            constraint=models.UniqueConstraint(fields=('public_id', 'created_at'), name='story_public_id_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='storyview',
+            constraint=models.UniqueConstraint(fields=('story', 'view_profile', 'story_created_at'), name='story_view_story_viewer_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='storyview',
+            index=models.Index(fields=['view_profile', 'story_created_at'], name='story_view_viewer_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storyview',
+            index=models.Index(fields=['viewed_at'], name='story_view_viewed_at_idx'),
+        ),
+    ]
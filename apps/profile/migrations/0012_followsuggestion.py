@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0011_story_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('mutual_count', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Follow Suggestion',
+                'verbose_name_plural': 'Follow Suggestions',
+                'db_table': 'follow_suggestion',
+            },
+        ),
+        migrations.AddField(
+            model_name='followsuggestion',
+            name='profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follow_suggestions', to='profile.patientprofile'),
+        ),
+        migrations.AddField(
+            model_name='followsuggestion',
+            name='suggested',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profile.patientprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='followsuggestion',
+            index=models.Index(fields=['profile', '-score'], name='follow_suggestion_score_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='followsuggestion',
+            unique_together={('profile', 'suggested')},
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile', '0012_followsuggestion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='follow',
+            name='status',
+            field=models.CharField(choices=[('follow', 'Follow'), ('unfollow', 'Unfollow'), ('requested', 'Requested')], default='follow', max_length=50, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'requested')), fields=['following', '-created_at', '-id'], name='follow_requests_inbox_idx'),
+        ),
+    ]
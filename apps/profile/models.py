@@ -1,25 +1,29 @@
 import re
+import uuid
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
+from apps.media.storage import get_content_addressed_storage, get_story_storage
 from apps.users.choices import CustomUserRoleChoices
-from apps.utils.base_models import CreateUpdateBaseModel
+from apps.utils.base_models import CreateUpdateBaseModel, SoftDeleteBaseModel, SoftDeleteManager, SoftDeleteQuerySet
 from apps.utils.generate_code import generate_public_id
 
 User = get_user_model()
 
 
-class PatientProfile(CreateUpdateBaseModel):
+class PatientProfile(SoftDeleteBaseModel):
     public_id = models.PositiveIntegerField(unique=True, db_index=True)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     full_name = models.CharField(max_length=250, null=True)
     bio = models.CharField(max_length=255, null=True, blank=True)
-    image = models.ImageField(upload_to="users/profile/image/", null=True, blank=True)
+    image = models.ImageField(upload_to="users/profile/image/", storage=get_content_addressed_storage,
+                              null=True, blank=True)
     website = models.URLField(null=True, blank=True, max_length=250)
     followers_count = models.PositiveIntegerField(default=0)
     following_count = models.PositiveIntegerField(default=0)
@@ -32,6 +36,10 @@ class PatientProfile(CreateUpdateBaseModel):
         verbose_name = 'Patient Profile'
         verbose_name_plural = 'Patients Profile'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['public_id'], name='patient_profile_pid_alive_idx',
+                         condition=Q(deleted_at__isnull=True)),
+        ]
 
     def __str__(self):
         return self.full_name or  self.user.full_name or self.public_id
@@ -55,21 +63,43 @@ class StoryChoices(models.TextChoices):
     VIDEO = ('VIDEO', 'Video')
 
 
-class Story(CreateUpdateBaseModel):
-    public_id = models.PositiveIntegerField(unique=True, db_index=True, null=True)
+# storis yaratilgandan keyin ko'pi bilan shuncha vaqt tirik: aktiv so'rovlar created_at bo'yicha
+# cheklanadi va Postgres faqat oxirgi partitionlarni o'qiydi (apps.profile.partitions ga qarang)
+STORY_LIFETIME = timedelta(hours=24)
+
+
+class StoryQuerySet(SoftDeleteQuerySet):
+    def active(self, now=None):
+        now = now or timezone.now()
+        return self.filter(
+            created_at__gte=now - STORY_LIFETIME,
+            expires_at__gte=now,
+            expired=False
+        )
+
+
+class StoryManager(SoftDeleteManager.from_queryset(StoryQuerySet)):
+    pass
+
+
+class Story(SoftDeleteBaseModel):
+    # partitionlangan jadvalda unique partition kalitini (created_at) o'z ichiga olishi kerak: Meta.constraints
+    public_id = models.PositiveIntegerField(null=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='story')
     role = models.CharField(
                             max_length=50,
                             choices=CustomUserRoleChoices.choices
                             )
-    content = models.FileField(upload_to='users/profile/story/', null=True)
+    content = models.FileField(upload_to='users/profile/story/', storage=get_story_storage, null=True)
     content_type = models.CharField(max_length=100, null=True, choices=StoryChoices.choices)
     view_count = models.PositiveIntegerField(default=0)
     expires_at = models.DateTimeField(null=True, blank=True)
     expired = models.BooleanField(default=False)  # for delete
 
+    objects = StoryManager()
+
     def __str__(self):
-        return self.profile.full_name or ''
+        return self.user.full_name or ''
 
     @property
     def media_type(self):
@@ -82,8 +112,11 @@ class Story(CreateUpdateBaseModel):
         return 'unknown'
 
     def save(self, *args, **kwargs):
+        now = timezone.now()
+        # faqat oxirgi ikki kunlik partitionlar: undan eski storislar baribir active() ga tushmaydi
         Story.objects.filter(
-            expires_at__lt=timezone.now(),
+            created_at__gte=now - 2 * STORY_LIFETIME,
+            expires_at__lt=now,
             expired=False
         ).update(expired=True)
 
@@ -93,37 +126,71 @@ class Story(CreateUpdateBaseModel):
                 self.content_type = StoryChoices.VIDEO
             elif ext in ['jpg', 'jpeg', 'png', 'gif']:
                 self.content_type = StoryChoices.IMAGE
-        if not self.expires_at:
-            self.expires_at = timezone.now() + timedelta(hours=24)
+        if not self.public_id:
+            self.public_id = generate_public_id(Story)
+        max_expires_at = (self.created_at or now) + STORY_LIFETIME
+        if not self.expires_at or self.expires_at > max_expires_at:
+            self.expires_at = max_expires_at
         super().save(*args, **kwargs)
 
     def is_expired(self):
         return timezone.now() > self.expires_at
 
     def mark_viewed(self, viewer_profile):
-        view, created = StoryView.objects.get_or_create(story=self, view_profile=viewer_profile)
+        view, created = StoryView.objects.get_or_create(
+            story=self, story_created_at=self.created_at, view_profile=viewer_profile
+        )
         if created:
-            self.view_count = StoryView.objects.filter(story=self).count()
-            self.save(update_fields=['view_count'])
+            # ko'rishlar sanalmaydi: story_view ning barcha partitionlarini o'qimaslik uchun +1
+            Story.objects.filter(id=self.id, created_at=self.created_at).update(view_count=F('view_count') + 1)
+            self.refresh_from_db(fields=['view_count'])
 
     class Meta:
         db_table = 'story'
         verbose_name = 'Story'
         verbose_name_plural = 'Stories'
         ordering = ['-created_at']
+        # nomlar apps.profile.partitions.PARTITION_SPECS bilan bir xil: konvertatsiyadan keyingi migratsiyalar
+        # shu nomlar bo'yicha o'zgartiradi/o'chiradi
+        constraints = [
+            models.UniqueConstraint(fields=['public_id', 'created_at'], name='story_public_id_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='story_user_alive_idx',
+                         condition=Q(deleted_at__isnull=True)),
+            models.Index(fields=['expires_at'], name='story_active_alive_idx',
+                         condition=Q(deleted_at__isnull=True, expired=False)),
+        ]
 
 
 class StoryView(CreateUpdateBaseModel):
-    story = models.ForeignKey(Story, on_delete=models.CASCADE, related_name='story_view')
-    view_profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='viewed_stories')
+    # partitionlangan story ga bitta ustunli FK bo'lmaydi: (story_id, story_created_at) -> story(id, created_at)
+    # kompozit FK partitions.convert_to_partitioned da qo'yiladi
+    story = models.ForeignKey(Story, on_delete=models.CASCADE, related_name='story_view', db_constraint=False)
+    # story.created_at nusxasi: story_view shu ustun bo'yicha partitionlanadi, shuning uchun
+    # (story, view_profile, story_created_at) unique butun jadval bo'yicha (story, view_profile) bilan teng
+    story_created_at = models.DateTimeField(null=True, blank=True)
+    view_profile = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='viewed_stories')
     viewed_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.view_profile.full_name} kordi {self.story.profile.full_name} ni storysini"
+        return f"{self.view_profile.full_name} kordi {self.story.user.full_name} ni storysini"
+
+    def save(self, *args, **kwargs):
+        if self.story_created_at is None and self.story_id:
+            self.story_created_at = self.story.created_at
+        super().save(*args, **kwargs)
 
     class Meta:
-        unique_together = ('story', 'view_profile')
         ordering = ['-viewed_at']
+        constraints = [
+            models.UniqueConstraint(fields=['story', 'view_profile', 'story_created_at'],
+                                    name='story_view_story_viewer_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['view_profile', 'story_created_at'], name='story_view_viewer_recent_idx'),
+            models.Index(fields=['viewed_at'], name='story_view_viewed_at_idx'),
+        ]
 
         db_table = 'story_view'
         verbose_name = 'Story View'
@@ -133,17 +200,30 @@ class StoryView(CreateUpdateBaseModel):
 class FollowChoices(models.TextChoices):
     follow = ('follow', 'Follow')
     unfollow = ('unfollow', 'Unfollow')
+    # yopiq (is_private) profilga yuborilgan, hali tasdiqlanmagan so'rov
+    requested = ('requested', 'Requested')
 
 
-class Follow(CreateUpdateBaseModel):
-    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='following')
-    following = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='followers')
+class Follow(SoftDeleteBaseModel):
+    profile = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='following')
+    following = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='followers')
     status = models.CharField(max_length=50, null=True,
                               default=FollowChoices.follow,
                               choices=FollowChoices.choices)
 
     class Meta:
-        unique_together = ('profile', 'following')
+        # o'chirilgan follow qayta follow qilishga to'sqinlik qilmasligi uchun unique faqat tirik qatorlarda
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'following'], name='follow_unique_alive',
+                                    condition=Q(deleted_at__isnull=True)),
+        ]
+        indexes = [
+            models.Index(fields=['following', 'status'], name='follow_following_alive_idx',
+                         condition=Q(deleted_at__isnull=True)),
+            # so'rovlar inboxi: (created_at, id) keyset pagination
+            models.Index(fields=['following', '-created_at', '-id'], name='follow_requests_inbox_idx',
+                         condition=Q(deleted_at__isnull=True, status='requested')),
+        ]
 
         db_table = 'follow'
         verbose_name = 'Follow'
@@ -151,3 +231,112 @@ class Follow(CreateUpdateBaseModel):
 
     def __str__(self):
         return f"{self.profile.full_name} --> {self.following.full_name}"
+
+
+class StoryAffinity(models.Model):
+    # har (viewer, author) juftligi uchun bitta qator: CreateUpdateBaseModel ustunlari kerak emas.
+    # score vaqt bo'yicha normallashtirilgan log-score (apps.profile.ranking ga qarang), shuning uchun
+    # yangi ko'rish faqat score = log_add(score, w) bilan qo'shiladi va eski qatorlar qayta yozilmaydi.
+    viewer = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='story_affinities')
+    author = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('viewer', 'author')
+
+        db_table = 'story_affinity'
+        verbose_name = 'Story Affinity'
+        verbose_name_plural = 'Story Affinities'
+
+    def __str__(self):
+        return f"{self.viewer_id} -> {self.author_id}: {self.score:.2f}"
+
+
+class FollowSuggestion(models.Model):
+    # compute_follow_suggestions batch job natijasi: har profil uchun top-K, har qayta hisoblashda almashtiriladi
+    profile = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='follow_suggestions')
+    suggested = models.ForeignKey(PatientProfile, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(default=0)
+    # profile follow qiladigan va suggested ni follow qiladigan akkauntlar soni (friends-of-friends)
+    mutual_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('profile', 'suggested')
+        indexes = [
+            models.Index(fields=['profile', '-score'], name='follow_suggestion_score_idx'),
+        ]
+
+        db_table = 'follow_suggestion'
+        verbose_name = 'Follow Suggestion'
+        verbose_name_plural = 'Follow Suggestions'
+
+    def __str__(self):
+        return f"{self.profile_id} -> {self.suggested_id}: {self.score:.2f}"
+
+
+class StoryUploadStatusChoices(models.TextChoices):
+    PENDING = ('pending', 'Pending')
+    COMPLETED = ('completed', 'Completed')
+    ABORTED = ('aborted', 'Aborted')
+
+
+class StoryUpload(CreateUpdateBaseModel):
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='story_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, default=StoryUploadStatusChoices.PENDING,
+                              choices=StoryUploadStatusChoices.choices)
+    expires_at = models.DateTimeField()
+    story = models.OneToOneField(Story, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload',
+                                 db_constraint=False)
+    # qabul qilingan partlar nomlari (uploads.part_storage da), offset tartibida
+    parts = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        db_table = 'story_upload'
+        verbose_name = 'Story Upload'
+        verbose_name_plural = 'Story Uploads'
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='story_upload_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.upload_id} ({self.offset}/{self.size})"
+
+    def is_expired(self):
+        return timezone.now() > self.expires_at
+
+
+class AccountDeletionStatusChoices(models.TextChoices):
+    PENDING = ('pending', 'Pending')
+    RUNNING = ('running', 'Running')
+    DONE = ('done', 'Done')
+    FAILED = ('failed', 'Failed')
+
+
+class AccountDeletion(CreateUpdateBaseModel):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='account_deletion')
+    # profil oxirgi bosqichda o'chadi, shuning uchun FK emas
+    profile_id = models.BigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, default=AccountDeletionStatusChoices.PENDING,
+                              choices=AccountDeletionStatusChoices.choices)
+    stage = models.CharField(max_length=50, null=True, blank=True)
+    processed = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'account_deletion'
+        verbose_name = 'Account Deletion'
+        verbose_name_plural = 'Account Deletions'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='account_deletion_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.status} ({self.stage or '-'})"
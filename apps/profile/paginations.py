@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 
 
 class UserProfileListPagination(PageNumberPagination):
@@ -11,4 +11,12 @@ class UserProfileListPagination(PageNumberPagination):
 class UserStoryListPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
+
+
+class FollowRequestPagination(CursorPagination):
+    # keyset: OFFSET siz, minglab so'rovli inboxda ham har sahifa indeksdan o'qiladi
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
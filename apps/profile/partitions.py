@@ -0,0 +1,262 @@
+"""
+story va story_view uchun Postgres declarative partitioning (kunlik, RANGE).
+
+story created_at bo'yicha, story_view esa story.created_at nusxasi (story_created_at) bo'yicha
+partitionlanadi: bitta storisning ko'rishlari doim shu storis bilan bir kunlik partitionda turadi,
+eski kun ikkala jadvaldan birga ajratiladi va (story, view_profile) unique sharti saqlanadi.
+
+Partitionlangan jadvalda PK va unique indekslar partition kalitini o'z ichiga olishi kerak,
+shuning uchun story PK (id, created_at) bo'ladi, story.public_id (public_id, created_at) bo'yicha unique
+(global yagonalikni generate_public_id tekshiradi), story ga bitta ustunli FK lar (story_view, story_upload)
+olib tashlanadi va story_view uchun (story_id, story_created_at) kompozit FK qo'yiladi.
+
+Indeks va constraint nomlari modellarning Meta.indexes/constraints dagi nomlari bilan bir xil, shuning uchun
+migratsiya holati konvertatsiyadan keyin ham bazaga mos keladi. DEFAULT partition yaratilmaydi: u bor bo'lsa
+DETACH ... CONCURRENTLY ishlamaydi. Kelgusi kunlar partitionlarini ensure_partitions oldindan yaratadi.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.media.signals import change_blob_refs
+
+PARTITION_SPECS = {
+    'story': {
+        'key': 'created_at',
+        'indexes': [
+            'CREATE INDEX story_user_alive_idx ON story (user_id, created_at DESC) WHERE deleted_at IS NULL',
+            'CREATE INDEX story_active_alive_idx ON story (expires_at) '
+            'WHERE deleted_at IS NULL AND NOT expired',
+            'ALTER TABLE story ADD CONSTRAINT story_public_id_uniq UNIQUE (public_id, created_at)',
+        ],
+        'foreign_keys': [
+            'ALTER TABLE story ADD CONSTRAINT story_user_id_fk FOREIGN KEY (user_id) '
+            'REFERENCES custom_user (id) DEFERRABLE INITIALLY DEFERRED',
+        ],
+    },
+    'story_view': {
+        'key': 'story_created_at',
+        'indexes': [
+            'ALTER TABLE story_view ADD CONSTRAINT story_view_story_viewer_uniq '
+            'UNIQUE (story_id, view_profile_id, story_created_at)',
+            'CREATE INDEX story_view_viewer_recent_idx ON story_view (view_profile_id, story_created_at)',
+            'CREATE INDEX story_view_viewed_at_idx ON story_view (viewed_at)',
+        ],
+        'foreign_keys': [
+            'ALTER TABLE story_view ADD CONSTRAINT story_view_story_fk FOREIGN KEY (story_id, story_created_at) '
+            'REFERENCES story (id, created_at) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED',
+            'ALTER TABLE story_view ADD CONSTRAINT story_view_view_profile_id_fk FOREIGN KEY (view_profile_id) '
+            'REFERENCES patient_profile (id) DEFERRABLE INITIALLY DEFERRED',
+        ],
+    },
+}
+
+# story_view story ga murojaat qiladi: yaratishda story birinchi, ajratishda story_view birinchi
+CREATE_ORDER = ('story', 'story_view')
+DETACH_ORDER = ('story_view', 'story')
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+def partition_name(table, day):
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def partition_day(table, name):
+    prefix = f"{table}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix):], '%Y%m%d').date()
+    except ValueError:
+        return None
+
+
+def _day_bound(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _day_literal(day):
+    # DDL da parametr bog'lab bo'lmaydi; qiymat o'zimiz hosil qilgan sana
+    return f"'{_day_bound(day).isoformat()}'"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def list_partitions(cursor, table):
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.oid = to_regclass(%s)
+        """,
+        [table]
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def create_partition(cursor, table, day):
+    name = partition_name(table, day)
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {_qn(name)} PARTITION OF {_qn(table)} "
+        f"FOR VALUES FROM ({_day_literal(day)}) TO ({_day_literal(day + timedelta(days=1))})"
+    )
+    return name
+
+
+def ensure_partitions(days_ahead=None, today=None):
+    """
+    Bugundan days_ahead kun oldinga partitionlar yaratadi. Har kuni (cron) ishga tushiriladi.
+    """
+    days_ahead = settings.STORY_PARTITION_DAYS_AHEAD if days_ahead is None else days_ahead
+    today = today or timezone.now().astimezone(dt_timezone.utc).date()
+    created = []
+    with connection.cursor() as cursor:
+        for table in CREATE_ORDER:
+            if not is_partitioned(cursor, table):
+                continue
+            existing = set(list_partitions(cursor, table))
+            for offset in range(days_ahead + 1):
+                day = today + timedelta(days=offset)
+                if partition_name(table, day) not in existing:
+                    created.append(create_partition(cursor, table, day))
+    return created
+
+
+def _drop_foreign_keys(cursor, table):
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE contype = 'f' AND conrelid = to_regclass(%s)", [table]
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {_qn(table)} DROP CONSTRAINT {_qn(name)}")
+
+
+def _release_story_media(cursor, table):
+    cursor.execute(f"SELECT content FROM {_qn(table)} WHERE content IS NOT NULL AND content <> ''")
+    for (name,) in cursor.fetchall():
+        change_blob_refs(name, -1)
+
+
+def detach_old_partitions(retention_days=None, archive_schema=None, drop=False, concurrently=False, today=None):
+    """
+    Saqlash muddatidan eski kunlik partitionlarni ajratadi va archive sxemasiga ko'chiradi
+    (drop=True bo'lsa butunlay o'chiradi, storis media havolalari kamaytiriladi).
+    DETACH ... CONCURRENTLY tranzaksiya ichida ishlamaydi, shuning uchun har qadam alohida.
+    """
+    retention_days = settings.STORY_PARTITION_RETENTION_DAYS if retention_days is None else retention_days
+    archive_schema = archive_schema or settings.STORY_PARTITION_ARCHIVE_SCHEMA
+    today = today or timezone.now().astimezone(dt_timezone.utc).date()
+    threshold = today - timedelta(days=retention_days)
+
+    detached = []
+    with connection.cursor() as cursor:
+        if not drop:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {_qn(archive_schema)}")
+
+        for table in DETACH_ORDER:
+            if not is_partitioned(cursor, table):
+                continue
+            for name in sorted(list_partitions(cursor, table)):
+                day = partition_day(table, name)
+                if day is None or day >= threshold:
+                    continue
+
+                mode = ' CONCURRENTLY' if concurrently else ''
+                cursor.execute(f"ALTER TABLE {_qn(table)} DETACH PARTITION {_qn(name)}{mode}")
+                with transaction.atomic():
+                    # ajratilgan jadval endi live story ga bog'lanmaydi
+                    _drop_foreign_keys(cursor, name)
+                    if drop:
+                        if table == 'story':
+                            _release_story_media(cursor, name)
+                        cursor.execute(f"DROP TABLE {_qn(name)}")
+                    else:
+                        cursor.execute(f"ALTER TABLE {_qn(name)} SET SCHEMA {_qn(archive_schema)}")
+                detached.append(name)
+    return detached
+
+
+def _drop_referencing_foreign_keys(cursor, table):
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint WHERE contype = 'f' AND confrelid = to_regclass(%s)",
+        [table]
+    )
+    for referencing_table, name in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE {referencing_table} DROP CONSTRAINT {_qn(name)}")
+
+
+def _convert_table(cursor, table, retention_days, days_ahead, archive_schema, today):
+    spec = PARTITION_SPECS[table]
+    key = spec['key']
+    legacy = f"{table}_legacy"
+    first_day = today - timedelta(days=retention_days)
+
+    _drop_referencing_foreign_keys(cursor, table)
+    # eski jadval indekslari bilan birga archive sxemasiga o'tadi: indeks nomlari to'qnashmaydi
+    cursor.execute(f"ALTER TABLE {_qn(table)} RENAME TO {_qn(legacy)}")
+    cursor.execute(f"ALTER TABLE {_qn(legacy)} SET SCHEMA {_qn(archive_schema)}")
+    legacy = f"{_qn(archive_schema)}.{_qn(legacy)}"
+
+    cursor.execute(
+        f"CREATE TABLE {_qn(table)} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({_qn(key)})"
+    )
+    cursor.execute(f"ALTER TABLE {_qn(table)} ADD PRIMARY KEY (id, {_qn(key)})")
+    for sql in spec['indexes']:
+        cursor.execute(sql)
+
+    for offset in range(-retention_days, days_ahead + 1):
+        create_partition(cursor, table, today + timedelta(days=offset))
+
+    # NULL yoki partition oralig'idan tashqaridagi kalitli qatorlar legacy da qoladi (DEFAULT partition yo'q)
+    bounds = [_day_bound(first_day), _day_bound(today + timedelta(days=days_ahead + 1))]
+    cursor.execute(
+        f"INSERT INTO {_qn(table)} SELECT * FROM {legacy} WHERE {_qn(key)} >= %s AND {_qn(key)} < %s", bounds
+    )
+    cursor.execute(f"DELETE FROM {legacy} WHERE {_qn(key)} >= %s AND {_qn(key)} < %s", bounds)
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), GREATEST((SELECT COALESCE(MAX(id), 0) FROM {legacy}), "
+        f"(SELECT COALESCE(MAX(id), 0) FROM {_qn(table)})) + 1, false)",
+        [table]
+    )
+
+
+def convert_to_partitioned(retention_days=None, days_ahead=None, archive_schema=None, today=None):
+    """
+    Bir martalik migratsiya: mavjud story/story_view jadvallarini partitionlangan jadvalga almashtiradi.
+    Saqlash muddati ichidagi qatorlar ko'chiriladi, eskilari archive.<table>_legacy da qoladi.
+    Yozuvlar to'xtatilgan holda (maintenance oynasida) bajarilishi kerak.
+    """
+    retention_days = settings.STORY_PARTITION_RETENTION_DAYS if retention_days is None else retention_days
+    days_ahead = settings.STORY_PARTITION_DAYS_AHEAD if days_ahead is None else days_ahead
+    archive_schema = archive_schema or settings.STORY_PARTITION_ARCHIVE_SCHEMA
+    today = today or timezone.now().astimezone(dt_timezone.utc).date()
+
+    converted = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {_qn(archive_schema)}")
+        cursor.execute(
+            "UPDATE story_view SET story_created_at = story.created_at FROM story "
+            "WHERE story.id = story_view.story_id AND story_view.story_created_at IS NULL"
+        )
+
+        for table in CREATE_ORDER:
+            if is_partitioned(cursor, table):
+                continue
+            _convert_table(cursor, table, retention_days, days_ahead, archive_schema, today)
+            converted.append(table)
+
+        for table in converted:
+            for sql in PARTITION_SPECS[table]['foreign_keys']:
+                cursor.execute(sql)
+    return converted
@@ -0,0 +1,158 @@
+import math
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from apps.profile.models import StoryAffinity, StoryView, Follow, FollowChoices
+
+AFFINITY_HALF_LIFE = timedelta(days=7)
+AFFINITY_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+AFFINITY_VIEW_WINDOW = timedelta(days=60)
+VIEW_WEIGHT = 1.0
+FOLLOW_WEIGHT = 0.5
+
+
+def log_time_factor(at=None):
+    # score = log(sum(w * 2^((t - epoch) / half_life))). Bitta viewer ning barcha authorlari uchun
+    # hozirgi decay koeffitsienti bir xil, shuning uchun saqlangan score bo'yicha tartib
+    # decay qilingan score tartibi bilan bir xil va eski qatorlarni yangilash shart emas.
+    # Log ko'rinishda saqlanadi: 2^x epoch dan ~20 yil o'tib float dan toshib ketadi, log esa chiziqli o'sadi.
+    at = at or timezone.now()
+    return (at - AFFINITY_EPOCH) / AFFINITY_HALF_LIFE * math.log(2)
+
+
+def log_add(a, b):
+    # log(e^a + e^b) toshib ketmasdan
+    if a == -math.inf:
+        return b
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+def event_score(weight, at=None):
+    return math.log(weight) + log_time_factor(at)
+
+
+def _log_add_score(increment):
+    # score = log_add(score, increment) bitta UPDATE da
+    return Greatest(F('score'), Value(increment)) + Ln(1 + Exp(-Abs(F('score') - Value(increment))))
+
+
+def add_affinity(viewer_id, author_id, weight, at=None):
+    increment = event_score(weight, at)
+    queryset = StoryAffinity.objects.filter(viewer_id=viewer_id, author_id=author_id)
+    combined = _log_add_score(increment)
+    if queryset.update(score=combined, updated_at=timezone.now()):
+        return
+
+    try:
+        with transaction.atomic():
+            StoryAffinity.objects.create(viewer_id=viewer_id, author_id=author_id, score=increment)
+    except IntegrityError:
+        queryset.update(score=combined, updated_at=timezone.now())
+
+
+def add_affinities(viewer_ids, author_id, weight, at=None):
+    """
+    add_affinity ning partiya ko'rinishi (bitta author, ko'p viewer): mavjud qatorlar bitta UPDATE da
+    log_add qilinadi, qolganlari bitta INSERT (ignore_conflicts) bilan yoziladi. Ikki so'rov orasida
+    parallel yaratilgan qatorga bu hodisa qo'shilmay qoladi - recompute_affinity tuzatadi.
+    """
+    increment = event_score(weight, at)
+    StoryAffinity.objects.filter(viewer_id__in=viewer_ids, author_id=author_id).update(
+        score=_log_add_score(increment), updated_at=timezone.now()
+    )
+    StoryAffinity.objects.bulk_create(
+        [StoryAffinity(viewer_id=viewer_id, author_id=author_id, score=increment) for viewer_id in viewer_ids],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+
+
+def record_story_view(viewer_id, author_id, at=None):
+    add_affinity(viewer_id, author_id, VIEW_WEIGHT, at)
+
+
+def record_follow(viewer_id, author_id, at=None):
+    # recompute_affinity ham aynan shu og'irlikni follow vaqti bilan qo'shadi: ikki yo'l bir xil natija beradi
+    add_affinity(viewer_id, author_id, FOLLOW_WEIGHT, at)
+
+
+def record_follows(viewer_ids, author_id, at=None):
+    add_affinities(viewer_ids, author_id, FOLLOW_WEIGHT, at)
+
+
+def rank_tray(viewer_id, authors):
+    """
+    authors: {author_id: (has_unseen, latest_story_created_at)}
+    Ko'rilmagan storisi borlar oldin, keyin affinity, keyin eng yangi storis bo'yicha.
+    """
+    scores = dict(
+        StoryAffinity.objects.filter(viewer_id=viewer_id, author_id__in=list(authors))
+        .values_list('author_id', 'score')
+    )
+    return sorted(
+        authors,
+        key=lambda author_id: (
+            not authors[author_id][0],
+            -scores.get(author_id, -math.inf),
+            -authors[author_id][1].timestamp(),
+        )
+    )
+
+
+def build_story_tray(viewer_id, stories, seen_story_ids):
+    """
+    stories: user__profile bilan select_related qilingan, created_at bo'yicha tartiblangan aktiv storislar.
+    """
+    groups = OrderedDict()
+    for story in stories:
+        author = story.user.profile
+        group = groups.setdefault(author.id, {"profile": author, "stories": [], "has_unseen": False})
+        group["stories"].append(story)
+        story.seen = story.id in seen_story_ids
+        if not story.seen:
+            group["has_unseen"] = True
+
+    authors = {
+        author_id: (group["has_unseen"], group["stories"][-1].created_at)
+        for author_id, group in groups.items()
+    }
+    return [groups[author_id] for author_id in rank_tray(viewer_id, authors)]
+
+
+def recompute_affinity(viewer_ids, at=None):
+    at = at or timezone.now()
+    scores = {}
+
+    views = StoryView.objects.filter(
+        view_profile_id__in=viewer_ids,
+        viewed_at__gte=at - AFFINITY_VIEW_WINDOW
+    ).values_list('view_profile_id', 'story__user__profile__id', 'viewed_at')
+    for viewer_id, author_id, viewed_at in views.iterator(chunk_size=2000):
+        if author_id is None or author_id == viewer_id:
+            continue
+        key = (viewer_id, author_id)
+        scores[key] = log_add(scores.get(key, -math.inf), event_score(VIEW_WEIGHT, viewed_at))
+
+    follows = Follow.objects.filter(
+        profile_id__in=viewer_ids,
+        status=FollowChoices.follow
+    ).values_list('profile_id', 'following_id', 'created_at')
+    for viewer_id, author_id, followed_at in follows.iterator(chunk_size=2000):
+        key = (viewer_id, author_id)
+        scores[key] = log_add(scores.get(key, -math.inf), event_score(FOLLOW_WEIGHT, followed_at))
+
+    with transaction.atomic():
+        StoryAffinity.objects.filter(viewer_id__in=viewer_ids).delete()
+        StoryAffinity.objects.bulk_create(
+            [
+                StoryAffinity(viewer_id=viewer_id, author_id=author_id, score=score)
+                for (viewer_id, author_id), score in scores.items()
+            ],
+            batch_size=1000
+        )
+    return len(scores)
@@ -0,0 +1,78 @@
+from django.db.models import Q
+
+from apps.profile.models import Follow, FollowChoices, PatientProfile
+
+
+def viewer_profile_id(user):
+    if not user or not user.is_authenticated:
+        return None
+    return PatientProfile.objects.filter(user=user).values_list('id', flat=True).first()
+
+
+def relationship_map(viewer_id, profile_ids):
+    """
+    Viewer ning profillar sahifasiga munosabati bitta so'rovda: {profile_id: {"following", "followed_by"}}.
+    following - viewer shu profilni follow qiladi, followed_by - profil viewer ni follow qiladi.
+    """
+    profile_ids = [profile_id for profile_id in set(profile_ids) if profile_id != viewer_id]
+    relationships = {profile_id: {"following": False, "followed_by": False} for profile_id in profile_ids}
+    if viewer_id is None or not profile_ids:
+        return relationships
+
+    edges = Follow.objects.filter(
+        Q(profile_id=viewer_id, following_id__in=profile_ids) | Q(profile_id__in=profile_ids, following_id=viewer_id),
+        status=FollowChoices.follow
+    ).values_list('profile_id', 'following_id')
+    for follower_id, following_id in edges:
+        if follower_id == viewer_id:
+            relationships[following_id]["following"] = True
+        else:
+            relationships[follower_id]["followed_by"] = True
+    return relationships
+
+
+class RelationshipContextMixin:
+    """
+    List/retrieve view lar uchun: serializer ga sahifadagi barcha profillar munosabati context orqali beriladi,
+    serializer har qator uchun alohida so'rov yubormaydi.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if args and args[0] is not None:
+            profiles = args[0] if kwargs.get('many') else [args[0]]
+            context = kwargs.setdefault('context', self.get_serializer_context())
+            context['relationships'] = relationship_map(
+                viewer_profile_id(self.request.user), [profile.id for profile in profiles]
+            )
+        return super().get_serializer(*args, **kwargs)
+
+
+def intersect_sorted(left, right):
+    """
+    Ikkita o'sish tartibidagi id oqimining kesishmasi (merge join): xotirada faqat joriy elementlar turadi.
+    """
+    left, right = iter(left), iter(right)
+    a, b = next(left, None), next(right, None)
+    while a is not None and b is not None:
+        if a == b:
+            yield a
+            a, b = next(left, None), next(right, None)
+        elif a < b:
+            a = next(left, None)
+        else:
+            b = next(right, None)
+
+
+def mutual_follower_ids(viewer_id, profile_id, chunk_size=2000):
+    """
+    Viewer follow qiladigan va profile_id ni follow qiladigan profillar (o'sish tartibida).
+    """
+    viewer_following = (
+        Follow.objects.filter(profile_id=viewer_id, status=FollowChoices.follow)
+        .order_by('following_id').values_list('following_id', flat=True).iterator(chunk_size=chunk_size)
+    )
+    profile_followers = (
+        Follow.objects.filter(following_id=profile_id, status=FollowChoices.follow)
+        .order_by('profile_id').values_list('profile_id', flat=True).iterator(chunk_size=chunk_size)
+    )
+    return intersect_sorted(viewer_following, profile_followers)
@@ -0,0 +1,136 @@
+import struct
+import time
+from array import array
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.profile.models import StoryView, STORY_LIFETIME
+
+SEEN_STATE_TTL = 60 * 60 * 24
+ARRAY_CONTAINER_LIMIT = 4096
+BITMAP_CONTAINER_BYTES = 8192
+
+_HEADER = struct.Struct('<dI')
+_CONTAINER_HEADER = struct.Struct('<QBI')
+
+
+class SeenBitmap:
+    """
+    Roaring uslubidagi story id to'plami: id ning yuqori bitlari bo'yicha 65536 lik
+    bo'laklarga ajratiladi, kam elementli bo'lak saralangan uint16 massiv (2 bayt/id),
+    4096 dan ko'p bo'lsa 8 KB bitmap sifatida saqlanadi.
+    """
+    __slots__ = ('containers', 'built_at')
+
+    def __init__(self, values=(), built_at=None):
+        self.containers = {}
+        self.built_at = built_at or time.time()
+        for value in sorted(values):
+            self.add(value)
+
+    def add(self, value):
+        high, low = value >> 16, value & 0xFFFF
+        container = self.containers.get(high)
+        if container is None:
+            self.containers[high] = array('H', [low])
+            return
+
+        if isinstance(container, bytearray):
+            container[low >> 3] |= 1 << (low & 7)
+            return
+
+        index = bisect_left(container, low)
+        if index < len(container) and container[index] == low:
+            return
+        container.insert(index, low)
+        if len(container) > ARRAY_CONTAINER_LIMIT:
+            bitmap = bytearray(BITMAP_CONTAINER_BYTES)
+            for item in container:
+                bitmap[item >> 3] |= 1 << (item & 7)
+            self.containers[high] = bitmap
+
+    def __contains__(self, value):
+        container = self.containers.get(value >> 16)
+        if container is None:
+            return False
+
+        low = value & 0xFFFF
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        index = bisect_left(container, low)
+        return index < len(container) and container[index] == low
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(self.built_at, len(self.containers))]
+        for high, container in sorted(self.containers.items()):
+            if isinstance(container, bytearray):
+                parts.append(_CONTAINER_HEADER.pack(high, 1, len(container)))
+                parts.append(bytes(container))
+            else:
+                parts.append(_CONTAINER_HEADER.pack(high, 0, len(container)))
+                parts.append(container.tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        built_at, count = _HEADER.unpack_from(data, 0)
+        bitmap = cls(built_at=built_at)
+        offset = _HEADER.size
+        for _ in range(count):
+            high, is_bitmap, length = _CONTAINER_HEADER.unpack_from(data, offset)
+            offset += _CONTAINER_HEADER.size
+            if is_bitmap:
+                bitmap.containers[high] = bytearray(data[offset:offset + length])
+                offset += length
+            else:
+                container = array('H')
+                container.frombytes(data[offset:offset + length * 2])
+                bitmap.containers[high] = container
+                offset += length * 2
+        return bitmap
+
+
+def _cache_key(viewer_id):
+    return f"story:seen:{viewer_id}"
+
+
+def rebuild_seen_state(viewer_id):
+    now = timezone.now()
+    story_ids = StoryView.objects.filter(
+        view_profile_id=viewer_id,
+        story_created_at__gte=now - STORY_LIFETIME,
+        story__expires_at__gte=now
+    ).values_list('story_id', flat=True)
+    bitmap = SeenBitmap(story_ids)
+    cache.set(_cache_key(viewer_id), bitmap.to_bytes(), timeout=SEEN_STATE_TTL)
+    return bitmap
+
+
+def get_seen_state(viewer_id):
+    data = cache.get(_cache_key(viewer_id))
+    if data is None:
+        return rebuild_seen_state(viewer_id)
+
+    bitmap = SeenBitmap.from_bytes(data)
+    # 24 soatdan eski bitmap tugagan storislarni ham saqlaydi, qayta quriladi
+    if time.time() - bitmap.built_at > SEEN_STATE_TTL:
+        return rebuild_seen_state(viewer_id)
+    return bitmap
+
+
+def get_seen_story_ids(viewer_id, story_ids):
+    bitmap = get_seen_state(viewer_id)
+    return {story_id for story_id in story_ids if story_id in bitmap}
+
+
+def mark_story_seen(viewer_id, story_id):
+    # bitta viewer bir vaqtda ikki storisni belgilasa bitta bit yo'qolishi mumkin;
+    # bu faqat storis "ko'rilmagan" bo'lib qolishiga olib keladi va keyingi rebuild da tuzaladi
+    data = cache.get(_cache_key(viewer_id))
+    if data is None:
+        return
+    bitmap = SeenBitmap.from_bytes(data)
+    bitmap.add(story_id)
+    cache.set(_cache_key(viewer_id), bitmap.to_bytes(), timeout=SEEN_STATE_TTL)
@@ -0,0 +1,36 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from apps.profile.models import PatientProfile, Follow
+
+
+class FollowProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PatientProfile
+        fields = ['id', 'public_id', 'full_name', 'image', 'followers_count', 'is_private']
+
+
+class FollowSuggestionSerializer(FollowProfileSerializer):
+    mutual_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta(FollowProfileSerializer.Meta):
+        fields = FollowProfileSerializer.Meta.fields + ['mutual_count']
+
+
+class FollowRequestSerializer(serializers.ModelSerializer):
+    profile = FollowProfileSerializer(read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['id', 'profile', 'created_at']
+
+
+class FollowRequestActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+                                max_length=settings.FOLLOW_REQUEST_BULK_MAX)
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['all'] == bool(attrs.get('ids')):
+            raise serializers.ValidationError("ids yoki all=true dan bittasi yuborilishi kerak")
+        return attrs
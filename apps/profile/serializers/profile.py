@@ -1,28 +1,39 @@
 from rest_framework import serializers
 
-from apps.profile.models import Profile
+from apps.profile.models import PatientProfile
 from apps.users.serializers import UserSerializer
 
 
 class UserProfileCreateSerializer(serializers.ModelSerializer):
     class Meta:
-        model = Profile
-        fields = ['username', 'full_name', 'bio', 'image', 'website']
+        model = PatientProfile
+        fields = ['full_name', 'bio', 'image', 'website']
 
 
-class UserProfileListSerializer(serializers.ModelSerializer):
+class RelationshipSerializerMixin(serializers.Serializer):
+    # view dagi RelationshipContextMixin butun sahifa uchun bitta so'rovda to'ldiradi
+    relationship = serializers.SerializerMethodField()
+
+    def get_relationship(self, obj):
+        relationships = self.context.get('relationships')
+        if relationships is None:
+            return None
+        return relationships.get(obj.id)
+
+
+class UserProfileListSerializer(RelationshipSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
-        model = Profile
+        model = PatientProfile
         fields = [
-            'id', 'user', 'username', 'full_name', 'bio', 'image', 'website',
+            'id', 'user', 'public_id', 'full_name', 'bio', 'image', 'website',
             'followers_count', 'following_count', 'posts_count', 'is_private',
-            'slug', 'created_at', 'updated_at', 'deleted_at'
+            'slug', 'created_at', 'updated_at', 'deleted_at', 'relationship'
         ]
 
 
 class UserProfileDetailSerializer(serializers.ModelSerializer):
     class Meta:
-        model = Profile
-        fields = ['id', 'username', 'full_name', 'bio', 'image', 'website', 'is_private']
+        model = PatientProfile
+        fields = ['id', 'public_id', 'full_name', 'bio', 'image', 'website', 'is_private']
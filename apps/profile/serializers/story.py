@@ -1,7 +1,11 @@
+from django.conf import settings
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from apps.profile.models import Story, StoryChoices
-from apps.profile.serializers.profile import UserProfileListSerializer
+from apps.media.serializers import SignedMediaField
+from apps.profile.models import Story, StoryChoices, StoryUpload
+from apps.profile.uploads import ALLOWED_EXTENSIONS, media_kind
+from apps.profile.serializers.profile import UserProfileListSerializer, UserProfileDetailSerializer
 from apps.utils.CustomValidationError import CustomValidationError
 
 
@@ -30,21 +34,24 @@ class UserStoryCreateSerializer(serializers.ModelSerializer):
 
 
 class UserStoryListSerializer(serializers.ModelSerializer):
-    profile = UserProfileListSerializer(read_only=True)
+    profile = UserProfileListSerializer(source='user.profile', read_only=True)
+    content = SignedMediaField()
 
     class Meta:
         model = Story
         fields = [
-            'id', 'profile', 'content', 'content_type',
+            'id', 'public_id', 'profile', 'content', 'content_type',
             'view_count', 'expires_at',
             'created_at', 'updated_at', 'deleted_at'
         ]
 
 
 class StoryElementSerializer(serializers.ModelSerializer):
+    content = SignedMediaField()
+
     class Meta:
         model = Story
-        fields = ['id', 'content', 'content_type', 'view_count', 'expires_at', 'created_at', 'updated_at', 'deleted_at']
+        fields = ['id', 'public_id', 'content', 'content_type', 'view_count', 'expires_at', 'created_at', 'updated_at', 'deleted_at']
 
 
 class UserActiveStoriesSerializer(serializers.Serializer):
@@ -55,3 +62,48 @@ class UserActiveStoriesSerializer(serializers.Serializer):
 class UserStoryMarkViewedSerializer(serializers.Serializer):
     profile = UserProfileListSerializer()
     story = StoryElementSerializer()
+
+
+class StoryTrayElementSerializer(StoryElementSerializer):
+    seen = serializers.BooleanField(read_only=True)
+
+    class Meta(StoryElementSerializer.Meta):
+        fields = StoryElementSerializer.Meta.fields + ['seen']
+
+
+class UserStoryTraySerializer(serializers.Serializer):
+    profile = UserProfileDetailSerializer(read_only=True)
+    has_unseen = serializers.BooleanField(read_only=True)
+    stories = StoryTrayElementSerializer(many=True, read_only=True)
+
+
+class StoryUploadInitSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+    def validate(self, attrs):
+        kind = media_kind(attrs['content_type'])
+        if kind not in ALLOWED_EXTENSIONS:
+            raise CustomValidationError(detail="Faqat rasm yoki video yuklash mumkin.")
+
+        ext = attrs['filename'].rsplit('.', 1)[-1].lower()
+        if ext not in ALLOWED_EXTENSIONS[kind]:
+            raise CustomValidationError(detail=f"{ext} formatidagi fayl yuklab bo'lmaydi")
+
+        if attrs['size'] > settings.STORY_UPLOAD_MAX_SIZE:
+            raise CustomValidationError(detail=f"Fayl hajmi {settings.STORY_UPLOAD_MAX_SIZE} baytdan oshmasligi kerak")
+        return attrs
+
+
+class StoryUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = StoryUpload
+        fields = ['upload_id', 'filename', 'content_type', 'size', 'offset', 'status', 'chunk_size',
+                  'expires_at', 'created_at']
+
+    @extend_schema_field(serializers.IntegerField())
+    def get_chunk_size(self, obj):
+        return settings.STORY_UPLOAD_CHUNK_SIZE
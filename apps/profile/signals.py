@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.profile.models import PatientProfile
+from apps.notifications.events import record_event
+from apps.notifications.models import NotificationKindChoices
+from apps.profile.models import PatientProfile, StoryView, Story, Follow, FollowChoices
+from apps.profile.ranking import record_story_view, record_follow
+from apps.profile.seen_state import mark_story_seen
 
 User = get_user_model()
 
@@ -11,3 +16,23 @@ User = get_user_model()
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         PatientProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=StoryView)
+def update_story_affinity_on_view(sender, instance, created, **kwargs):
+    if not created:
+        return
+    transaction.on_commit(lambda: mark_story_seen(instance.view_profile_id, instance.story_id))
+
+    author_id = Story.objects.filter(
+        id=instance.story_id, created_at=instance.story_created_at
+    ).values_list('user__profile__id', flat=True).first()
+    if author_id and author_id != instance.view_profile_id:
+        record_story_view(instance.view_profile_id, author_id, instance.viewed_at)
+        record_event(NotificationKindChoices.STORY_VIEW, author_id, instance.view_profile_id, instance.story_id)
+
+
+@receiver(post_save, sender=Follow)
+def update_story_affinity_on_follow(sender, instance, created, **kwargs):
+    if created and instance.status == FollowChoices.follow:
+        record_follow(instance.profile_id, instance.following_id)
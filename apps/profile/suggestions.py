@@ -0,0 +1,136 @@
+from itertools import chain
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from scipy import sparse
+
+from apps.profile.models import Follow, FollowChoices, FollowSuggestion
+
+FOF_WEIGHT = 1.0
+CO_FOLLOW_WEIGHT = 0.5
+# co-follow uchun har profilga eng o'xshash shuncha profil olinadi
+SIMILAR_PROFILES = 50
+
+
+def load_follow_graph(chunk_size=100_000):
+    """
+    Tirik follow qirralaridan CSR matritsa: A[i, j] = 1 - i profil j ni follow qiladi.
+    Natija: (A, profile_ids), profile_ids[i] - i-indeksdagi profil id si.
+    Qirralar Python ro'yxatiga emas, to'g'ridan-to'g'ri numpy massivga o'qiladi.
+    """
+    edges = (
+        Follow.objects.filter(status=FollowChoices.follow)
+        .exclude(profile_id=F('following_id'))
+        .values_list('profile_id', 'following_id')
+        .iterator(chunk_size=chunk_size)
+    )
+    flat = np.fromiter(chain.from_iterable(edges), dtype=np.int64)
+    profile_ids, inverse = np.unique(flat, return_inverse=True)
+    pairs = inverse.astype(np.int32).reshape(-1, 2)
+
+    size = len(profile_ids)
+    graph = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (pairs[:, 0], pairs[:, 1])), shape=(size, size)
+    )
+    graph.sum_duplicates()
+    graph.data[:] = 1
+    return graph, profile_ids
+
+
+def co_follow_graph(graph, hub_limit):
+    """
+    Co-follow o'xshashligi uchun normallashtirilgan matritsa: ikki profil qancha umumiy akkauntni follow qilsa,
+    shuncha o'xshash (kosinus). hub_limit dan ko'p followerli akkauntlar tashlanadi: ular deyarli hammani
+    bir-biriga "o'xshash" qiladi va A @ A.T ni zich qilib yuboradi.
+    """
+    in_degree = np.asarray(graph.sum(axis=0)).ravel()
+    keep = sparse.diags((in_degree <= hub_limit).astype(np.float32))
+    pruned = (graph @ keep).tocsr()
+    pruned.eliminate_zeros()
+
+    out_degree = np.asarray(pruned.sum(axis=1)).ravel()
+    norm = sparse.diags(np.divide(1.0, np.sqrt(out_degree), out=np.zeros_like(out_degree), where=out_degree > 0))
+    normalized = (norm @ pruned).tocsr()
+    return normalized, normalized.T.tocsr()
+
+
+def _keep_top(matrix, k):
+    # CSR qatorlarida eng katta k ta qiymat qoladi
+    matrix = matrix.tocsr()
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        if end - start > k:
+            data = matrix.data[start:end]
+            data[np.argpartition(data, end - start - k)[:end - start - k]] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def score_rows(graph, co_rows, co_columns, rows):
+    """
+    rows indeksli profillar uchun nomzodlar: (score, fof) CSR matritsalari (len(rows) x n).
+    fof = A[rows] @ A - profil follow qiladiganlar orqali 2 qadamli yo'llar soni;
+    co = o'xshash profillar (umumiy follow lar bo'yicha) follow qiladigan akkauntlar.
+    O'zi va allaqachon follow qilinganlar natijadan chiqariladi.
+    """
+    followed = graph[rows]
+    own = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.arange(len(rows)), rows)), shape=(len(rows), graph.shape[1])
+    )
+    fof = (followed @ graph).tocsr()
+
+    similar = (co_rows[rows] @ co_columns).tocsr()
+    similar = _keep_top(similar - similar.multiply(own), SIMILAR_PROFILES)
+    co = similar @ graph
+
+    scores = (FOF_WEIGHT * fof + CO_FOLLOW_WEIGHT * co).tocsr()
+    excluded = ((followed + own) > 0).astype(np.float32)
+    scores = (scores - scores.multiply(excluded)).tocsr()
+    scores.eliminate_zeros()
+    return scores, fof
+
+
+def top_suggestions(scores, fof, rows, profile_ids, top_k):
+    """
+    Har qator uchun eng yuqori top_k ta: [(profile_id, suggested_id, score, mutual_count)].
+    """
+    fof.sort_indices()
+    results = []
+    for index, row in enumerate(rows):
+        start, end = scores.indptr[index], scores.indptr[index + 1]
+        if start == end:
+            continue
+        columns, values = scores.indices[start:end], scores.data[start:end]
+        if len(values) > top_k:
+            best = np.argpartition(-values, top_k)[:top_k]
+            columns, values = columns[best], values[best]
+
+        fof_start, fof_end = fof.indptr[index], fof.indptr[index + 1]
+        fof_columns, fof_values = fof.indices[fof_start:fof_end], fof.data[fof_start:fof_end]
+        mutual = np.zeros(len(columns), dtype=np.int64)
+        if len(fof_columns):
+            positions = np.minimum(np.searchsorted(fof_columns, columns), len(fof_columns) - 1)
+            found = fof_columns[positions] == columns
+            mutual[found] = fof_values[positions[found]]
+
+        profile_id = int(profile_ids[row])
+        for column, value, mutual_count in zip(columns, values, mutual):
+            results.append((profile_id, int(profile_ids[column]), float(value), int(mutual_count)))
+    return results
+
+
+def save_suggestions(profile_ids, suggestions, computed_at):
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(profile_id__in=profile_ids).delete()
+        FollowSuggestion.objects.bulk_create(
+            [
+                FollowSuggestion(
+                    profile_id=profile_id, suggested_id=suggested_id, score=score,
+                    mutual_count=mutual_count, computed_at=computed_at
+                )
+                for profile_id, suggested_id, score, mutual_count in suggestions
+            ],
+            batch_size=1000
+        )
+    return len(suggestions)
@@ -1,3 +1,593 @@
-from django.test import TestCase
+import io
+import math
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.http import UnreadablePostError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.notifications.models import NotificationDigest, NotificationEvent, NotificationKindChoices
+from apps.profile.deletion import process_account_deletion, deletion_stages
+from apps.profile.follows import follow_profile
+from apps.profile.models import Follow, FollowChoices, PatientProfile, Story, StoryAffinity, StoryView, \
+    FollowSuggestion, AccountDeletion, AccountDeletionStatusChoices, StoryUpload, StoryUploadStatusChoices
+from apps.profile.ranking import add_affinity, add_affinities, VIEW_WEIGHT, FOLLOW_WEIGHT, event_score, log_add, \
+    recompute_affinity
+from apps.profile.relationships import intersect_sorted
+from apps.profile.seen_state import SeenBitmap, ARRAY_CONTAINER_LIMIT, SEEN_STATE_TTL, get_seen_story_ids, \
+    rebuild_seen_state
+from apps.profile.suggestions import load_follow_graph, co_follow_graph, score_rows, top_suggestions
+from apps.profile.uploads import write_chunk
+
+User = get_user_model()
+
+
+def create_story(profile):
+    return Story.objects.create(user=profile.user, role=profile.user.active_role)
+
+
+def create_profile(contact, **fields):
+    user = User.objects.create_user(contact, full_name=contact.split('@')[0])
+    profile = PatientProfile.objects.get(user=user)
+    if fields:
+        PatientProfile.objects.filter(id=profile.id).update(**fields)
+        profile.refresh_from_db()
+    return profile
+
+
+class AffinityScoreTests(SimpleTestCase):
+    def test_log_add(self):
+        self.assertAlmostEqual(log_add(math.log(2), math.log(3)), math.log(5))
+        self.assertEqual(log_add(-math.inf, 1.5), 1.5)
+
+    def test_scores_grow_linearly_with_time(self):
+        now = timezone.now()
+        week = event_score(VIEW_WEIGHT, now + timedelta(days=7)) - event_score(VIEW_WEIGHT, now)
+        self.assertAlmostEqual(week, math.log(2))
+        self.assertTrue(math.isfinite(event_score(VIEW_WEIGHT, now + timedelta(days=365 * 100))))
+
+
+class StoryTrayTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.viewer = create_profile('viewer@example.com')
+        self.quiet, self.favourite, self.seen = [
+            create_profile(f'{name}@example.com') for name in ('quiet', 'favourite', 'seen')
+        ]
+        for author in (self.favourite, self.quiet, self.seen):
+            Follow.objects.create(profile=self.viewer, following=author, status=FollowChoices.follow)
+
+        StoryView.objects.create(story=create_story(self.favourite), view_profile=self.viewer)
+        create_story(self.favourite)
+        create_story(self.quiet)
+        StoryView.objects.create(story=create_story(self.seen), view_profile=self.viewer)
+        create_story(create_profile('stranger@example.com'))
+
+    def scores(self):
+        return dict(StoryAffinity.objects.filter(viewer=self.viewer).values_list('author_id', 'score'))
+
+    def test_unseen_first_then_affinity(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer.user)
+        response = client.get(reverse('profile:story_tray'))
+        self.assertEqual(response.status_code, 200)
+
+        tray = response.data['data']
+        self.assertEqual([group['profile']['id'] for group in tray],
+                         [self.favourite.id, self.quiet.id, self.seen.id])
+        self.assertEqual([group['has_unseen'] for group in tray], [True, True, False])
+        self.assertEqual([story['seen'] for story in tray[0]['stories']], [True, False])
+
+    def test_recompute_matches_incremental_scores(self):
+        incremental = self.scores()
+        self.assertEqual(recompute_affinity([self.viewer.id]), 3)
+        recomputed = self.scores()
+        self.assertEqual(recomputed.keys(), incremental.keys())
+        for author_id, score in incremental.items():
+            self.assertAlmostEqual(recomputed[author_id], score, places=5)
+
+
+class SeenBitmapTests(SimpleTestCase):
+    def test_membership_across_containers(self):
+        bitmap = SeenBitmap([5, 70000, 3, 5])
+        bitmap.add(1 << 33)
+        for value in (3, 5, 70000, 1 << 33):
+            self.assertIn(value, bitmap)
+        for value in (4, 65536 + 5, 1 << 32):
+            self.assertNotIn(value, bitmap)
+
+    def test_dense_container_becomes_bitmap(self):
+        values = range(0, 2 * (ARRAY_CONTAINER_LIMIT + 1), 2)
+        bitmap = SeenBitmap(values)
+        self.assertIsInstance(bitmap.containers[0], bytearray)
+        self.assertTrue(all(value in bitmap for value in values))
+        self.assertNotIn(1, bitmap)
+
+    def test_bytes_round_trip(self):
+        bitmap = SeenBitmap(list(range(ARRAY_CONTAINER_LIMIT + 1)) + [70000, 70002], built_at=1000.5)
+        restored = SeenBitmap.from_bytes(bitmap.to_bytes())
+        self.assertEqual(restored.built_at, 1000.5)
+        self.assertEqual(restored.to_bytes(), bitmap.to_bytes())
+        self.assertIn(70002, restored)
+        self.assertNotIn(70001, restored)
+
+
+class SeenStateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = create_profile('author@example.com')
+        self.viewer = create_profile('viewer@example.com')
+        self.stories = [create_story(self.author) for _ in range(3)]
+
+    def story_ids(self):
+        return [story.id for story in self.stories]
+
+    def test_rebuilds_from_views_and_follows_new_views(self):
+        StoryView.objects.create(story=self.stories[0], view_profile=self.viewer)
+        self.assertEqual(get_seen_story_ids(self.viewer.id, self.story_ids()), {self.stories[0].id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StoryView.objects.create(story=self.stories[1], view_profile=self.viewer)
+        with self.assertNumQueries(0):
+            seen = get_seen_story_ids(self.viewer.id, self.story_ids())
+        self.assertEqual(seen, {self.stories[0].id, self.stories[1].id})
+
+    def test_expired_stories_are_not_loaded(self):
+        Story.objects.filter(id=self.stories[0].id).update(expires_at=timezone.now() - timedelta(minutes=1))
+        StoryView.objects.create(story=self.stories[0], view_profile=self.viewer)
+        self.assertEqual(get_seen_story_ids(self.viewer.id, self.story_ids()), set())
+
+    def test_old_bitmap_is_rebuilt(self):
+        rebuild_seen_state(self.viewer.id)
+        StoryView.objects.create(story=self.stories[2], view_profile=self.viewer)
+        self.assertEqual(get_seen_story_ids(self.viewer.id, self.story_ids()), set())
+
+        later = timezone.now().timestamp() + SEEN_STATE_TTL + 1
+        with mock.patch('apps.profile.seen_state.time.time', return_value=later):
+            self.assertEqual(get_seen_story_ids(self.viewer.id, self.story_ids()), {self.stories[2].id})
+
+
+class FollowSuggestionTests(TestCase):
+    # 0 -> 1, 2; 1 -> 3; 2 -> 3, 4; 5 -> 1, 2, 4
+    EDGES = [(0, 1), (0, 2), (1, 3), (2, 3), (2, 4), (5, 1), (5, 2), (5, 4)]
+    # 0 va 5 ning umumiy follow lari {1, 2}: kosinus 2 / sqrt(2 * 3)
+    CO_FOLLOW_SCORE = 0.5 * 2 / math.sqrt(6)
+
+    def setUp(self):
+        self.profiles = [create_profile(f'user{index}@example.com') for index in range(6)]
+        for source, target in self.EDGES:
+            Follow.objects.create(profile=self.profiles[source], following=self.profiles[target],
+                                  status=FollowChoices.follow)
+        Follow.objects.create(profile=self.profiles[3], following=self.profiles[0], status=FollowChoices.requested)
+
+    def compute(self, *args):
+        call_command('compute_follow_suggestions', *args, stdout=io.StringIO())
+
+    def suggestions(self, index):
+        return {
+            suggested_id: (score, mutual_count) for suggested_id, score, mutual_count in
+            FollowSuggestion.objects.filter(profile=self.profiles[index])
+            .values_list('suggested_id', 'score', 'mutual_count')
+        }
+
+    def assertSuggestions(self, index, expected):
+        actual = self.suggestions(index)
+        self.assertEqual(set(actual), {self.profiles[target].id for target in expected})
+        for target, (score, mutual_count) in expected.items():
+            self.assertAlmostEqual(actual[self.profiles[target].id][0], score, places=5)
+            self.assertEqual(actual[self.profiles[target].id][1], mutual_count)
+
+    def test_csr_scores_friends_of_friends_and_co_follows(self):
+        graph, profile_ids = load_follow_graph()
+        self.assertEqual(graph.nnz, len(self.EDGES))
+        co_rows, co_columns = co_follow_graph(graph, hub_limit=100)
+        rows = [list(profile_ids).index(self.profiles[0].id)]
+        scores, fof = score_rows(graph, co_rows, co_columns, rows)
+        suggestions = sorted(top_suggestions(scores, fof, rows, profile_ids, top_k=10), key=lambda row: -row[2])
+        self.assertEqual([(suggested_id, mutual) for _, suggested_id, _, mutual in suggestions],
+                         [(self.profiles[3].id, 2), (self.profiles[4].id, 1)])
+        self.assertAlmostEqual(suggestions[1][2], 1 + self.CO_FOLLOW_SCORE, places=5)
+
+    def test_command_writes_top_k_and_drops_stale_rows(self):
+        FollowSuggestion.objects.create(profile=self.profiles[4], suggested=self.profiles[0],
+                                        computed_at=timezone.now() - timedelta(days=1))
+        self.compute()
+        self.assertSuggestions(0, {3: (2.0, 2), 4: (1 + self.CO_FOLLOW_SCORE, 1)})
+        # 5 ning 2 bilan umumiy follow i {4}: kosinus 1 / sqrt(3 * 2), 2 esa 3 ni follow qiladi
+        self.assertSuggestions(5, {3: (2.0 + 0.5 / math.sqrt(6), 2)})
+        self.assertFalse(FollowSuggestion.objects.filter(profile=self.profiles[4]).exists())
+
+        self.compute('--top-k', '1')
+        self.assertSuggestions(0, {3: (2.0, 2)})
+
+    def test_hub_accounts_are_ignored_for_co_follow(self):
+        self.compute('--hub-limit', '1')
+        self.assertSuggestions(0, {3: (2.0, 2), 4: (1.0, 1)})
+
+    def test_api_filters_followed_and_deleted_profiles(self):
+        self.compute()
+        client = APIClient()
+        client.force_authenticate(self.profiles[0].user)
+        response = client.get(reverse('profile:follow-suggestions'))
+        self.assertEqual([(row['id'], row['mutual_count']) for row in response.data['data']],
+                         [(self.profiles[3].id, 2), (self.profiles[4].id, 1)])
+
+        follow_profile(self.profiles[0], self.profiles[3])
+        PatientProfile.objects.filter(id=self.profiles[4].id).soft_delete()
+        response = client.get(reverse('profile:follow-suggestions'))
+        self.assertNotIn(self.profiles[3].id, [row['id'] for row in response.data['data']])
+        self.assertNotIn(self.profiles[4].id, [row['id'] for row in response.data['data']])
+
+    def test_new_profile_gets_popular_public_profiles(self):
+        newcomer = create_profile('new@example.com')
+        PatientProfile.objects.filter(id=self.profiles[0].id).update(followers_count=3)
+        PatientProfile.objects.filter(id=self.profiles[1].id).update(followers_count=10)
+        PatientProfile.objects.filter(id=self.profiles[2].id).update(followers_count=20, is_private=True)
+        PatientProfile.objects.filter(id=self.profiles[3].id).update(followers_count=5)
+        Follow.objects.create(profile=newcomer, following=self.profiles[3], status=FollowChoices.requested)
+
+        client = APIClient()
+        client.force_authenticate(newcomer.user)
+        response = client.get(reverse('profile:follow-suggestions'), {"limit": 2})
+        self.assertEqual([row['id'] for row in response.data['data']], [self.profiles[1].id, self.profiles[0].id])
+
+
+class IntersectSortedTests(SimpleTestCase):
+    def test_common_ids_in_order(self):
+        self.assertEqual(list(intersect_sorted([1, 3, 5, 7, 9], [2, 3, 4, 7, 10])), [3, 7])
+
+    def test_empty_and_disjoint(self):
+        self.assertEqual(list(intersect_sorted([], [1, 2])), [])
+        self.assertEqual(list(intersect_sorted([1, 2], [])), [])
+        self.assertEqual(list(intersect_sorted([1, 2], [3, 4])), [])
+
+    def test_identical_streams(self):
+        self.assertEqual(list(intersect_sorted(range(5), range(5))), [0, 1, 2, 3, 4])
+
+    def test_consumes_iterators_lazily(self):
+        left = iter([1, 2, 100])
+        right = iter([2, 3, 4])
+        result = intersect_sorted(left, right)
+        self.assertEqual(next(result), 2)
+        self.assertEqual(list(left), [100])
+
+
+class FollowRequestAPITests(TestCase):
+    def setUp(self):
+        self.target = create_profile('target@example.com', is_private=True)
+        self.followers = [create_profile(f'follower{index}@example.com') for index in range(3)]
+        self.client = APIClient()
+
+    def follow(self, profile):
+        self.client.force_authenticate(profile.user)
+        return self.client.post(reverse('profile:following', args=[self.target.public_id]))
+
+    def test_private_profile_gets_request_without_counters(self):
+        response = self.follow(self.followers[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['status'], FollowChoices.requested)
+
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.followers_count, 0)
+        self.assertTrue(NotificationEvent.objects.filter(
+            kind=NotificationKindChoices.FOLLOW_REQUEST, recipient_id=self.target.id,
+            actor_id=self.followers[0].id
+        ).exists())
+
+    def test_duplicate_request_is_rejected(self):
+        self.follow(self.followers[0])
+        response = self.follow(self.followers[0])
+        self.assertEqual(response.status_code, 400)
+
+    def test_inbox_lists_pending_requests(self):
+        for follower in self.followers:
+            self.follow(follower)
+        self.client.force_authenticate(self.target.user)
+        response = self.client.get(reverse('profile:follow-requests'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_approve_selected_requests(self):
+        for follower in self.followers:
+            self.follow(follower)
+        request_ids = list(
+            Follow.objects.filter(profile__in=self.followers[:2]).values_list('id', flat=True)
+        )
+
+        self.client.force_authenticate(self.target.user)
+        response = self.client.post(reverse('profile:follow-requests-approve'), {"ids": request_ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['count'], 2)
+
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.followers_count, 2)
+        for follower, following_count in zip(self.followers, (1, 1, 0)):
+            follower.refresh_from_db()
+            self.assertEqual(follower.following_count, following_count)
+        self.assertEqual(
+            Follow.objects.filter(following=self.target, status=FollowChoices.follow).count(), 2
+        )
+        self.assertEqual(
+            set(NotificationEvent.objects.filter(kind=NotificationKindChoices.FOLLOW, recipient_id=self.target.id)
+                .values_list('actor_id', flat=True)),
+            {self.followers[0].id, self.followers[1].id}
+        )
+        self.assertEqual(StoryAffinity.objects.filter(author=self.target).count(), 2)
+
+    def test_batched_affinity_matches_single_updates(self):
+        at = timezone.now()
+        viewers = self.followers[:2]
+        add_affinity(viewers[0].id, self.target.id, VIEW_WEIGHT, at)
+        add_affinity(viewers[0].id, self.target.id, FOLLOW_WEIGHT, at)
+        add_affinity(viewers[1].id, self.target.id, FOLLOW_WEIGHT, at)
+        expected = dict(StoryAffinity.objects.values_list('viewer_id', 'score'))
+        StoryAffinity.objects.all().delete()
+
+        add_affinity(viewers[0].id, self.target.id, VIEW_WEIGHT, at)
+        with self.assertNumQueries(2):
+            add_affinities([viewer.id for viewer in viewers], self.target.id, FOLLOW_WEIGHT, at)
+        for viewer_id, score in StoryAffinity.objects.values_list('viewer_id', 'score'):
+            self.assertAlmostEqual(score, expected[viewer_id])
+        self.assertEqual(StoryAffinity.objects.count(), 2)
+
+    def test_approve_all_and_reject(self):
+        for follower in self.followers:
+            self.follow(follower)
+        self.client.force_authenticate(self.target.user)
+        rejected_id = Follow.objects.get(profile=self.followers[2]).id
+        response = self.client.post(reverse('profile:follow-requests-reject'), {"ids": [rejected_id]}, format='json')
+        self.assertEqual(response.data['data']['count'], 1)
+
+        response = self.client.post(reverse('profile:follow-requests-approve'), {"all": True}, format='json')
+        self.assertEqual(response.data['data']['count'], 2)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.followers_count, 2)
+        self.assertFalse(Follow.objects.filter(id=rejected_id).exists())
+
+    def test_action_requires_ids_or_all(self):
+        self.client.force_authenticate(self.target.user)
+        response = self.client.post(reverse('profile:follow-requests-approve'), {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_cannot_approve_requests_of_another_profile(self):
+        self.follow(self.followers[0])
+        request_id = Follow.objects.get(profile=self.followers[0]).id
+        self.client.force_authenticate(self.followers[1].user)
+        response = self.client.post(reverse('profile:follow-requests-approve'), {"ids": [request_id]}, format='json')
+        self.assertEqual(response.data['data']['count'], 0)
+        self.assertEqual(Follow.objects.get(id=request_id).status, FollowChoices.requested)
+
+
+class StoryMarkViewedAPITests(TestCase):
+    def setUp(self):
+        self.author = create_profile('author@example.com')
+        self.viewer = create_profile('viewer@example.com')
+        self.story = create_story(self.author)
+        self.client = APIClient()
+
+    def view(self, profile, story):
+        self.client.force_authenticate(profile.user)
+        return self.client.post(reverse('profile:story_view', args=[story.public_id]))
+
+    def test_story_gets_public_id(self):
+        self.assertIsNotNone(self.story.public_id)
+        self.assertEqual(str(self.story), 'author')
+
+    def test_view_is_recorded_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.view(self.viewer, self.story)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['profile']['id'], self.author.id)
+        self.assertEqual(response.data['data']['story']['view_count'], 1)
+
+        self.view(self.viewer, self.story)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.view_count, 1)
+        view = StoryView.objects.get()
+        self.assertEqual((view.view_profile, view.story_created_at), (self.viewer, self.story.created_at))
+        self.assertEqual(str(view), 'viewer kordi author ni storysini')
+        self.assertTrue(StoryAffinity.objects.filter(viewer=self.viewer, author=self.author).exists())
+        self.assertTrue(NotificationEvent.objects.filter(
+            kind=NotificationKindChoices.STORY_VIEW, recipient_id=self.author.id, actor_id=self.viewer.id
+        ).exists())
+
+    def test_own_story_is_not_counted(self):
+        response = self.view(self.author, self.story)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StoryView.objects.exists())
+
+    def test_unknown_story(self):
+        self.client.force_authenticate(self.viewer.user)
+        response = self.client.post(reverse('profile:story_view', args=[1]))
+        self.assertEqual(response.status_code, 400)
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.profile = create_profile('deleted@example.com')
+        self.others = [create_profile(f'other{index}@example.com') for index in range(3)]
+        self.client = APIClient()
+
+    def request_deletion(self):
+        self.client.force_authenticate(self.profile.user)
+        return self.client.delete(reverse('profile:my-profile-detail'))
+
+    def test_request_deactivates_immediately(self):
+        response = self.request_deletion()
+        self.assertEqual(response.status_code, 204)
+
+        self.profile.user.refresh_from_db()
+        self.assertFalse(self.profile.user.is_active)
+        self.assertFalse(PatientProfile.objects.filter(id=self.profile.id).exists())
+        job = AccountDeletion.objects.get(user=self.profile.user)
+        self.assertEqual((job.profile_id, job.status), (self.profile.id, AccountDeletionStatusChoices.PENDING))
+
+    def test_batches_remove_rows_and_fix_counters(self):
+        for other in self.others:
+            follow_profile(self.profile, other)
+            follow_profile(other, self.profile)
+            FollowSuggestion.objects.create(profile=other, suggested=self.profile, computed_at=timezone.now())
+        story = create_story(self.others[0])
+        story.mark_viewed(self.profile)
+        create_story(self.profile).mark_viewed(self.others[1])
+        digest = NotificationDigest.objects.create(
+            recipient=self.others[0], kind=NotificationKindChoices.FOLLOW, window_start=timezone.now(),
+            last_actor=self.profile
+        )
+        NotificationDigest.objects.create(
+            recipient=self.profile, kind=NotificationKindChoices.FOLLOW, window_start=timezone.now()
+        )
+
+        self.request_deletion()
+        job = AccountDeletion.objects.get(user=self.profile.user)
+        process_account_deletion(job, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.stage), (AccountDeletionStatusChoices.DONE, 'profile'))
+        self.assertFalse(PatientProfile.all_objects.filter(id=self.profile.id).exists())
+        for other in self.others:
+            other.refresh_from_db()
+            self.assertEqual((other.followers_count, other.following_count), (0, 0))
+        story.refresh_from_db()
+        self.assertEqual(story.view_count, 0)
+        self.assertFalse(Story.all_objects.filter(user=self.profile.user).exists())
+        self.assertFalse(FollowSuggestion.objects.exists())
+        self.assertFalse(StoryAffinity.objects.filter(author=self.profile).exists())
+        self.assertEqual(list(NotificationDigest.objects.values_list('id', 'last_actor')), [(digest.id, None)])
+        self.assertFalse(NotificationEvent.objects.filter(actor_id=self.profile.id).exists())
+
+    def test_rerun_after_interruption_continues(self):
+        for other in self.others:
+            follow_profile(other, self.profile)
+        self.request_deletion()
+        job = AccountDeletion.objects.get(user=self.profile.user)
+        # worker birinchi partiyadan keyin to'xtagan
+        next(deletion_stages(job)[1][1](job.profile_id, 1))
+
+        process_account_deletion(job)
+        self.assertFalse(Follow.all_objects.exists())
+        for other in self.others:
+            other.refresh_from_db()
+            self.assertEqual(other.following_count, 0)
+        self.assertEqual(AccountDeletion.objects.get(id=job.id).status, AccountDeletionStatusChoices.DONE)
+
+
+class InterruptedStream(io.BytesIO):
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            raise UnreadablePostError("Connection reset by peer")
+        return data
+
+
+JPEG_BYTES = b'\xff\xd8\xff\xe0' + bytes(range(256)) * 4
+
+
+@override_settings(STORY_UPLOAD_CHUNK_SIZE=512, MEDIA_SIGNING_KEY='test-key')
+class StoryUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.part_storage = FileSystemStorage(location=f'{media_root}/parts')
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        patcher = mock.patch('apps.profile.uploads.part_storage', self.part_storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.profile = create_profile('uploader@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.profile.user)
+        response = self.client.post(reverse('profile:story_upload_init'), {
+            "filename": "photo.jpg", "content_type": "image/jpeg", "size": len(JPEG_BYTES)
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.upload_id = response.data['data']['upload_id']
+
+    def url(self):
+        return reverse('profile:story_upload_chunk', args=[self.upload_id])
+
+    def put(self, offset, data):
+        return self.client.generic(
+            'PUT', self.url(), data, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def finalize(self):
+        return self.client.post(reverse('profile:story_upload_finalize', args=[self.upload_id]))
+
+    def stored_parts(self):
+        try:
+            return self.part_storage.listdir(str(self.upload_id))[1]
+        except FileNotFoundError:
+            return []
+
+    def test_resume_after_interrupted_chunk(self):
+        # mijoz 512 bayt e'lon qildi, lekin ulanish 300 baytdan keyin uzildi
+        upload = write_chunk(self.upload_id, self.profile.user, 0, InterruptedStream(JPEG_BYTES[:300]), 512)
+        self.assertEqual(upload.offset, 300)
+
+        self.assertEqual(self.client.get(self.url()).data['data']['offset'], 300)
+        for offset in range(300, len(JPEG_BYTES), 512):
+            self.assertEqual(self.put(offset, JPEG_BYTES[offset:offset + 512]).status_code, 200)
+
+        response = self.finalize()
+        self.assertEqual(response.status_code, 201)
+        story = Story.objects.get(user=self.profile.user)
+        with story.content.open('rb') as f:
+            self.assertEqual(f.read(), JPEG_BYTES)
+        self.assertEqual(self.stored_parts(), [])
+        # takroriy finalize shu storisni qaytaradi
+        self.assertEqual(self.finalize().data['data']['id'], story.id)
+
+    def test_out_of_order_and_duplicate_offsets_are_rejected(self):
+        self.assertEqual(self.put(0, JPEG_BYTES[:512]).status_code, 200)
+
+        self.assertEqual(self.put(1024, JPEG_BYTES[1024:]).status_code, 400)
+        self.assertEqual(self.put(0, JPEG_BYTES[:512]).status_code, 400)
+        self.assertEqual(StoryUpload.objects.get(upload_id=self.upload_id).offset, 512)
+        self.assertEqual(len(self.stored_parts()), 1)
+
+        self.assertEqual(self.finalize().status_code, 400)
+
+    def test_duplicate_offset_lost_race_drops_its_part(self):
+        self.put(0, JPEG_BYTES[:512])
+        upload = StoryUpload.objects.get(upload_id=self.upload_id)
+        original_save = self.part_storage.save
+
+        def save_after_competitor(name, content):
+            # bir xil offsetli parallel so'rov lock olishdan oldin yozib bo'ldi
+            StoryUpload.objects.filter(id=upload.id).update(offset=1024)
+            return original_save(name, content)
+
+        with mock.patch.object(self.part_storage, 'save', save_after_competitor):
+            self.assertEqual(self.put(512, JPEG_BYTES[512:1024]).status_code, 400)
+        self.assertEqual(len(self.stored_parts()), 1)
+
+    def test_chunk_larger_than_limit_is_rejected(self):
+        self.assertEqual(self.put(0, JPEG_BYTES[:600]).status_code, 400)
+        self.assertEqual(self.stored_parts(), [])
+
+    def test_mismatched_content_aborts_upload(self):
+        self.assertEqual(self.put(0, b'not an image' * 10).status_code, 400)
+        self.assertEqual(StoryUpload.objects.get(upload_id=self.upload_id).status, StoryUploadStatusChoices.ABORTED)
+        self.assertEqual(self.stored_parts(), [])
+
+    def test_expired_upload_is_cleaned_up(self):
+        self.put(0, JPEG_BYTES[:512])
+        StoryUpload.objects.filter(upload_id=self.upload_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(self.put(512, JPEG_BYTES[512:1024]).status_code, 400)
+        call_command('cleanup_story_uploads', stdout=io.StringIO())
+        self.assertEqual(StoryUpload.objects.get(upload_id=self.upload_id).status, StoryUploadStatusChoices.ABORTED)
+        self.assertEqual(self.stored_parts(), [])
+        self.assertEqual(self.finalize().status_code, 400)
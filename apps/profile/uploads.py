@@ -0,0 +1,175 @@
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from apps.profile.models import Story, StoryUpload, StoryUploadStatusChoices
+from apps.utils.CustomValidationError import CustomValidationError
+
+READ_BUFFER_SIZE = 64 * 1024
+SNIFF_BYTES = 12
+
+# settings.STORAGES['story_uploads']: bir nechta app host bo'lsa umumiy backend (S3 va h.k.) ga ko'rsatiladi
+part_storage = SimpleLazyObject(lambda: storages['story_uploads'])
+
+ALLOWED_EXTENSIONS = {
+    'image': ('jpg', 'jpeg', 'png', 'gif'),
+    'video': ('mp4', 'mov', 'avi'),
+}
+
+
+def sniff_media_kind(head):
+    if head.startswith((b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a')):
+        return 'image'
+    if head[4:8] == b'ftyp' or (head[:4] == b'RIFF' and head[8:12] == b'AVI '):
+        return 'video'
+    return None
+
+
+def media_kind(content_type):
+    return content_type.split('/', 1)[0]
+
+
+class UploadedParts:
+    """
+    Saqlangan partlarni storage ga bitta fayl sifatida beradi: butun fayl diskka ham, xotiraga ham yig'ilmaydi.
+    """
+
+    def __init__(self, names, size):
+        self.names = names
+        self.size = size
+
+    def chunks(self, chunk_size=None):
+        for name in self.names:
+            with part_storage.open(name, 'rb') as f:
+                while data := f.read(chunk_size or READ_BUFFER_SIZE):
+                    yield data
+
+
+def part_name(upload, offset):
+    # nom tasodifiy: bir offsetga parallel kelgan ikki so'rov bir-birining partini ustidan yozmaydi
+    return f"{upload.upload_id}/{offset:015d}-{uuid.uuid4().hex}.part"
+
+
+def delete_parts(upload):
+    # commit qilinmay qolgan (so'rov o'rtada uzilgan) partlar ham shu papkada
+    prefix = str(upload.upload_id)
+    try:
+        _, files = part_storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for name in files:
+        part_storage.delete(f"{prefix}/{name}")
+
+
+def start_upload(user, filename, content_type, size):
+    return StoryUpload.objects.create(
+        user=user,
+        filename=os.path.basename(filename),
+        content_type=content_type,
+        size=size,
+        expires_at=timezone.now() + timedelta(seconds=settings.STORY_UPLOAD_TTL)
+    )
+
+
+def abort_upload(upload):
+    upload.status = StoryUploadStatusChoices.ABORTED
+    upload.save(update_fields=['status', 'updated_at'])
+    delete_parts(upload)
+
+
+def _check_writable(upload, offset):
+    if upload.status != StoryUploadStatusChoices.PENDING or upload.is_expired():
+        raise CustomValidationError(detail="Yuklash yakunlangan yoki muddati tugagan")
+    if offset != upload.offset:
+        raise CustomValidationError(detail=f"Offset noto'g'ri, joriy offset: {upload.offset}")
+
+
+def _read_chunk(stream, buffer, length):
+    received = 0
+    try:
+        while received < length:
+            data = stream.read(min(READ_BUFFER_SIZE, length - received))
+            if not data:
+                break
+            buffer.write(data)
+            received += len(data)
+    except OSError:
+        # mijoz ulanishi uzildi: shu paytgacha kelgan baytlar saqlanadi, mijoz davom ettiradi
+        pass
+    return received
+
+
+def write_chunk(upload_id, user, offset, stream, length):
+    """
+    Chunk lock va tranzaksiyasiz vaqtinchalik faylga o'qiladi (sekin mijoz qator lockini va DB ulanishini
+    ushlab turmaydi), so'ng part_storage ga alohida part sifatida saqlanadi. Lock faqat offset ni qayta
+    tekshirib surish uchun olinadi. Partlar umumiy storage da bo'lgani uchun davomini boshqa host qabul qila oladi.
+    """
+    upload = StoryUpload.objects.get(upload_id=upload_id, user=user)
+    _check_writable(upload, offset)
+    if length > settings.STORY_UPLOAD_CHUNK_SIZE:
+        raise CustomValidationError(detail=f"Chunk hajmi {settings.STORY_UPLOAD_CHUNK_SIZE} baytdan oshmasligi kerak")
+    if offset + length > upload.size:
+        raise CustomValidationError(detail="Chunk e'lon qilingan fayl hajmidan oshib ketdi")
+
+    with tempfile.TemporaryFile() as buffer:
+        received = _read_chunk(stream, buffer, length)
+        if not received:
+            return upload
+
+        mismatched = False
+        if offset == 0:
+            buffer.seek(0)
+            kind = sniff_media_kind(buffer.read(SNIFF_BYTES))
+            mismatched = kind is None or kind != media_kind(upload.content_type)
+        if mismatched:
+            abort_upload(upload)
+            raise CustomValidationError(detail="Fayl turi e'lon qilingan turga mos emas")
+
+        buffer.seek(0)
+        name = part_storage.save(part_name(upload, offset), File(buffer))
+
+    with transaction.atomic():
+        upload = StoryUpload.objects.select_for_update().get(upload_id=upload_id, user=user)
+        try:
+            _check_writable(upload, offset)
+        except CustomValidationError:
+            # shu offsetni parallel so'rov oldinroq yozib bo'ldi yoki yuklash bekor qilindi
+            part_storage.delete(name)
+            raise
+        upload.parts.append(name)
+        upload.offset += received
+        upload.save(update_fields=['offset', 'parts', 'updated_at'])
+    return upload
+
+
+def finalize_upload(upload_id, user):
+    with transaction.atomic():
+        upload = StoryUpload.objects.select_for_update().get(upload_id=upload_id, user=user)
+
+        if upload.status == StoryUploadStatusChoices.COMPLETED and upload.story_id:
+            return upload.story
+        if upload.status != StoryUploadStatusChoices.PENDING:
+            raise CustomValidationError(detail="Yuklash bekor qilingan")
+        if upload.offset != upload.size:
+            raise CustomValidationError(detail=f"Fayl to'liq yuklanmagan: {upload.offset}/{upload.size}")
+
+        story = Story(user=user, role=user.active_role)
+        # storage partlarni chunk bo'yicha o'qib hash qiladi va saqlaydi
+        story.content.save(upload.filename, UploadedParts(upload.parts, upload.size), save=False)
+        story.save()
+
+        upload.status = StoryUploadStatusChoices.COMPLETED
+        upload.story = story
+        upload.save(update_fields=['status', 'story', 'updated_at'])
+
+    delete_parts(upload)
+    return story
@@ -1,10 +1,14 @@
 from django.urls import path
 
-from apps.profile.views.follow_views import UserProfileFollowAPIView, UserUnFollowAPIView
+from apps.profile.views.follow_views import UserProfileFollowAPIView, UserUnFollowAPIView, \
+    UserFollowSuggestionListAPIView, UserMutualFollowersAPIView, FollowRequestInboxAPIView, \
+    FollowRequestApproveAPIView, FollowRequestRejectAPIView
 from apps.profile.views.profile_views import UserProfileListAPIView, UserProfileCreateAPIView, \
     UserMyProfileRetrieveAPIView, UserMyProfileDetailRetrieveUpdateDestroyAPIView, UserProfileRetrieveAPIView
+from apps.profile.views.story_upload_views import UserStoryUploadInitAPIView, UserStoryUploadChunkAPIView, \
+    UserStoryUploadFinalizeAPIView
 from apps.profile.views.story_views import UserStoryCreateAPIView, UserStoryListAPIView, UserActiveStoryListAPIView, \
-    UserStoryMarkViewedAPIView
+    UserStoryMarkViewedAPIView, UserStoryTrayAPIView
 
 app_name = 'profile'
 
@@ -17,9 +21,19 @@ urlpatterns = [
     path('story/create/', UserStoryCreateAPIView.as_view(), name='story_create'),
     path('story/list/', UserStoryListAPIView.as_view(), name='story_list'),
     path('story/active/', UserActiveStoryListAPIView.as_view(), name='story_active'),
+    path('story/tray/', UserStoryTrayAPIView.as_view(), name='story_tray'),
+    path('story/upload/', UserStoryUploadInitAPIView.as_view(), name='story_upload_init'),
+    path('story/upload/<uuid:upload_id>/', UserStoryUploadChunkAPIView.as_view(), name='story_upload_chunk'),
+    path('story/upload/<uuid:upload_id>/finalize/', UserStoryUploadFinalizeAPIView.as_view(),
+         name='story_upload_finalize'),
     path('story/<int:story_public_id>/view/', UserStoryMarkViewedAPIView.as_view(), name='story_view'),
+    path('follow-requests/', FollowRequestInboxAPIView.as_view(), name='follow-requests'),
+    path('follow-requests/approve/', FollowRequestApproveAPIView.as_view(), name='follow-requests-approve'),
+    path('follow-requests/reject/', FollowRequestRejectAPIView.as_view(), name='follow-requests-reject'),
+    path('suggestions/', UserFollowSuggestionListAPIView.as_view(), name='follow-suggestions'),
     path('<int:profile_public_id>/follow/', UserProfileFollowAPIView.as_view(), name='following'),
     path('<int:profile_public_id>/unfollow/', UserUnFollowAPIView.as_view(), name='unfollow'),
+    path('<int:profile_public_id>/mutual-followers/', UserMutualFollowersAPIView.as_view(), name='mutual-followers'),
 
     path('followers/me', UserUnFollowAPIView.as_view(), name='followers-me'),
     path('following/me', UserUnFollowAPIView.as_view(), name='followers-me'),
@@ -1,110 +1,177 @@
-from django.db.models import F
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
-from apps.profile.models import Profile, Follow, FollowChoices
+from apps.profile.follows import follow_profile, unfollow_profile, follow_requests, approve_follow_requests, \
+    reject_follow_requests
+from apps.profile.models import Follow, FollowChoices, FollowSuggestion, PatientProfile
+from apps.profile.paginations import FollowRequestPagination
+from apps.profile.relationships import mutual_follower_ids, viewer_profile_id
+from apps.profile.serializers.follow import FollowSuggestionSerializer, FollowProfileSerializer, \
+    FollowRequestSerializer, FollowRequestActionSerializer
 from apps.profile.serializers.profile import UserProfileDetailSerializer
 from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
 
 
 class UserProfileFollowAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, profile_id):
-        if not profile_id:
-            return CustomResponse.error_response(message='Profile id kelishi shart')
-
-        profile = request.user.profile
+    def post(self, request, profile_public_id):
+        profile = getattr(request.user, 'profile', None)
         if not profile:
             return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
 
-        try:
-            following_user = Profile.objects.get(id=profile_id)
-        except Profile.DoesNotExist:
+        following_user = PatientProfile.objects.filter(public_id=profile_public_id).first()
+        if following_user is None:
             return CustomResponse.error_response(
-                message=f'{profile_id}-idlik userga tegishli profil mavjud emas'
+                message=f'{profile_public_id}-idlik userga tegishli profil mavjud emas'
             )
 
-        if profile.id == following_user.id:
-            return CustomResponse.error_response(message="O'zingizni follow qila olmaysiz")
-
-        follow_obj, created = Follow.objects.get_or_create(
-            profile=profile,
-            following=following_user
+        follow_obj = follow_profile(profile, following_user)
+        profile.refresh_from_db(fields=['following_count'])
+        following_user.refresh_from_db(fields=['followers_count'])
+
+        return CustomResponse.success_response(
+            data={
+                "status": follow_obj.status,
+                "user": UserProfileDetailSerializer(profile).data,
+                "following_user": UserProfileDetailSerializer(following_user).data
+            },
+            message="So'rov yuborildi" if follow_obj.status == FollowChoices.requested else "Success"
         )
 
-        if created:
-            follow_obj.status = FollowChoices.follow
-            follow_obj.save()
 
-            Profile.objects.filter(id=profile.id).update(
-                following_count=F('following_count') + 1
-            )
+class UserUnFollowAPIView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        else:
-            if follow_obj.status == FollowChoices.follow:
-                return CustomResponse.error_response(message="Siz allaqachon follow qilgansiz")
+    def post(self, request, profile_public_id):
+        profile = getattr(request.user, 'profile', None)
+        if not profile:
+            return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
 
-            follow_obj.status = FollowChoices.follow
-            follow_obj.save()
+        unfollowing_user = PatientProfile.objects.filter(public_id=profile_public_id).first()
+        if unfollowing_user is None:
+            return CustomResponse.error_response(message=f"{profile_public_id}-idlik profil topilmadi")
 
-            Profile.objects.filter(id=profile.id).update(
-                following_count=F('following_count') + 1
-            )
+        unfollow_profile(profile, unfollowing_user)
+        profile.refresh_from_db(fields=['following_count'])
+        unfollowing_user.refresh_from_db(fields=['followers_count'])
 
-            Profile.objects.filter(id=following_user.id).update(
-                followers_count=F('followers_count') + 1
-            )
+        return CustomResponse.success_response({
+            "user": UserProfileDetailSerializer(profile).data,
+            "unfollowing_user": UserProfileDetailSerializer(unfollowing_user).data
+        })
 
-        user_data = UserProfileDetailSerializer(profile).data
-        following_data = UserProfileDetailSerializer(following_user).data
 
-        return CustomResponse.success_response(data={
-            "user": user_data,
-            "following_user": following_data
-        })
+class FollowRequestInboxAPIView(ListAPIView):
+    """
+    Yopiq profilga kelgan, hali tasdiqlanmagan follow so'rovlari (eng yangisi birinchi).
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = FollowRequestSerializer
+    pagination_class = FollowRequestPagination
 
+    def get_queryset(self):
+        # o'z inboxi: replica lag tufayli tasdiqlangan so'rov qayta ko'rinmasligi uchun primary dan
+        return follow_requests(viewer_profile_id(self.request.user)).select_related('profile')
 
-class UserUnFollowAPIView(APIView):
+
+class FollowRequestActionAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    action = None
+    success_message = None
 
-    def post(self, request, profile_id):
-        if not profile_id:
-            return CustomResponse.error_response("Profile id kelishi shart")
+    def post(self, request):
+        target_id = viewer_profile_id(request.user)
+        if target_id is None:
+            return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
+        serializer = FollowRequestActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        request_ids = None if serializer.validated_data['all'] else serializer.validated_data['ids']
 
-        profile = request.user.profile
+        count = self.action(target_id, request_ids)
+        return CustomResponse.success_response(data={"count": count}, message=self.success_message)
 
-        try:
-            unfollowing_user = Profile.objects.get(id=profile_id)
-        except Profile.DoesNotExist:
-            return CustomResponse.error_response(
-                f"{profile_id}-idlik profil topilmadi"
-            )
 
-        if profile.id == unfollowing_user.id:
-            return CustomResponse.error_response("O'zingizni unfollow qila olmaysiz")
+class FollowRequestApproveAPIView(FollowRequestActionAPIView):
+    action = staticmethod(approve_follow_requests)
+    success_message = "So'rovlar tasdiqlandi"
+
 
+class FollowRequestRejectAPIView(FollowRequestActionAPIView):
+    action = staticmethod(reject_follow_requests)
+    success_message = "So'rovlar rad etildi"
+
+
+class UserFollowSuggestionListAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request):
+        profile = getattr(request.user, 'profile', None)
+        if not profile:
+            return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
         try:
-            follow_obj = Follow.objects.get(
-                profile=profile,
-                following=unfollowing_user,
-                status=FollowChoices.follow
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            return CustomResponse.error_response(message="limit son bo'lishi kerak")
+
+        # tavsiya hisoblangandan keyin follow qilinganlar so'rov vaqtida (profile, following) unique indeksi
+        # bo'yicha EXISTS bilan chiqariladi: jadvalni qayta hisoblash shart emas
+        followed = Follow.objects.filter(
+            profile=profile, following=OuterRef('suggested_id'), status=FollowChoices.follow
+        )
+        suggestions = (
+            FollowSuggestion.objects.filter(profile=profile, suggested__deleted_at__isnull=True)
+            .exclude(Exists(followed))
+            .select_related('suggested')
+            .order_by('-score')[:limit]
+        )
+        profiles = []
+        for suggestion in suggestions:
+            suggestion.suggested.mutual_count = suggestion.mutual_count
+            profiles.append(suggestion.suggested)
+
+        if not profiles:
+            # hali hech kimni follow qilmagan yangi user: eng ko'p followerli profillar
+            # yopiq profillar umumiy "mashhur" ro'yxatga chiqmaydi
+            profiles = list(
+                PatientProfile.objects.filter(deleted_at__isnull=True, is_private=False)
+                .exclude(id=profile.id)
+                .exclude(Exists(Follow.objects.filter(profile=profile, following=OuterRef('pk'),
+                                                      status__in=[FollowChoices.follow, FollowChoices.requested])))
+                .order_by('-followers_count')[:limit]
             )
-        except Follow.DoesNotExist:
-            return CustomResponse.error_response("Siz bu userni follow qilmagansiz")
 
-        follow_obj.status = FollowChoices.unfollow
-        follow_obj.save()
+        return CustomResponse.success_response(data=FollowSuggestionSerializer(profiles, many=True).data)
 
-        Profile.objects.filter(id=profile.id).update(
-            following_count=F('following_count') - 1
-        )
 
-        Profile.objects.filter(id=unfollowing_user.id).update(
-            followers_count=F('followers_count') - 1
-        )
+class UserMutualFollowersAPIView(ReadReplicaMixin, APIView):
+    """
+    Men follow qiladigan va shu profilni follow qiladigan profillar ("X, Y va yana 12 kishi kuzatadi").
+    """
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
 
-        return CustomResponse.success_response({
-            "user": UserProfileDetailSerializer(profile).data,
-            "unfollowing_user": UserProfileDetailSerializer(unfollowing_user).data
+    def get(self, request, profile_public_id):
+        viewer_id = viewer_profile_id(request.user)
+        if viewer_id is None:
+            return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
+        profile = get_object_or_404(PatientProfile, public_id=profile_public_id)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 3)), 1), self.max_limit)
+        except ValueError:
+            return CustomResponse.error_response(message="limit son bo'lishi kerak")
+
+        # ikkala ro'yxat indeks tartibida oqim bilan o'qiladi va merge qilinadi
+        mutual_ids = list(mutual_follower_ids(viewer_id, profile.id))
+        profiles = PatientProfile.objects.in_bulk(mutual_ids[:limit])
+        return CustomResponse.success_response(data={
+            "count": len(mutual_ids),
+            "results": FollowProfileSerializer(
+                [profiles[profile_id] for profile_id in mutual_ids[:limit] if profile_id in profiles], many=True
+            ).data
         })
@@ -4,44 +4,47 @@ from rest_framework.generics import CreateAPIView, RetrieveAPIView, RetrieveUpda
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
 
+from apps.profile.deletion import request_account_deletion
 from apps.profile.filters import UserProfileListFilter
-from apps.profile.models import Profile
+from apps.profile.models import PatientProfile
 from apps.profile.paginations import UserProfileListPagination
 from apps.profile.permission import UserProfileDetailPermission
+from apps.profile.relationships import RelationshipContextMixin
 from apps.profile.serializers.profile import UserProfileCreateSerializer, UserProfileListSerializer, \
     UserProfileDetailSerializer
 from apps.users.choices import CustomUserRoleChoices
 from apps.users.permissions import UserListPermission
 from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
 
 
-class UserProfileListAPIView(ListAPIView):
+class UserProfileListAPIView(RelationshipContextMixin, ReadReplicaMixin, ListAPIView):
     serializer_class = UserProfileListSerializer
     permission_classes = [UserListPermission]
-    queryset = Profile.objects.select_related('user')
+    queryset = PatientProfile.objects.select_related('user')
     pagination_class = UserProfileListPagination
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['is_private']
     filterset_class = UserProfileListFilter
-    search_fields = ['username', 'full_name']
+    search_fields = ['full_name', 'user__contact']
     ordering_fields = ['created_at', 'updated_at', 'full_name']
     ordering = ['id']
 
 
-class UserProfileRetrieveAPIView(RetrieveAPIView):
+class UserProfileRetrieveAPIView(RelationshipContextMixin, ReadReplicaMixin, RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserProfileListSerializer
     lookup_field = 'public_id'
     lookup_url_kwarg = 'profile_public_id'
 
     def get_queryset(self):
-        return Profile.objects.select_related("user")
+        return PatientProfile.objects.select_related("user")
 
 
-class UserProfileCreateAPIView(CreateAPIView):
+class UserProfileCreateAPIView(ReadReplicaMixin, CreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserProfileCreateSerializer
-    queryset = Profile.objects.all()
+    queryset = PatientProfile.objects.all()
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -53,23 +56,23 @@ class UserProfileCreateAPIView(CreateAPIView):
 
 
 
-class UserMyProfileRetrieveAPIView(RetrieveAPIView):
+class UserMyProfileRetrieveAPIView(ReadReplicaMixin, RetrieveAPIView):
     permission_classes = [UserProfileDetailPermission]
     serializer_class = UserProfileListSerializer
 
     def get_object(self):
-        return Profile.objects.select_related("user").get(user=self.request.user)
+        return PatientProfile.objects.select_related("user").get(user=self.request.user)
 
 
-class UserMyProfileDetailRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class UserMyProfileDetailRetrieveUpdateDestroyAPIView(ReadReplicaMixin, RetrieveUpdateDestroyAPIView):
     permission_classes = [UserProfileDetailPermission]
     serializer_class = UserProfileListSerializer
 
     def get_queryset(self):
-        return Profile.objects.filter(user=self.request.user)
+        return PatientProfile.objects.filter(user=self.request.user)
 
     def get_object(self):
-        return Profile.objects.select_related("user").get(user=self.request.user)
+        return PatientProfile.objects.select_related("user").get(user=self.request.user)
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
@@ -77,13 +80,10 @@ class UserMyProfileDetailRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIVi
         return UserProfileDetailSerializer
 
     def destroy(self, request, *args, **kwargs):
-        profile = self.get_object()
+        self.get_object()
 
-        profile.delete()
-
-        user = request.user
-        user.is_active = False
-        user.save(update_fields=["is_active"])
+        # storis, ko'rishlar, follow va media process_account_deletions da partiyalab o'chiriladi
+        request_account_deletion(request.user)
 
         return CustomResponse.success_response(
             message="Profil o‘chirildi va akkaunt deaktiv qilindi",
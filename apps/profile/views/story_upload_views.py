@@ -0,0 +1,72 @@
+from django.shortcuts import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.status import HTTP_201_CREATED
+from rest_framework.views import APIView
+
+from apps.profile.models import StoryUpload, StoryUploadStatusChoices
+from apps.profile.serializers.story import StoryUploadInitSerializer, StoryUploadSerializer, UserStoryListSerializer
+from apps.profile.uploads import start_upload, write_chunk, finalize_upload, abort_upload
+from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
+
+
+class UserStoryUploadInitAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = StoryUploadInitSerializer
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = start_upload(user=request.user, **serializer.validated_data)
+        return CustomResponse.success_response(
+            message='Yuklash boshlandi',
+            data=StoryUploadSerializer(upload).data,
+            code=HTTP_201_CREATED
+        )
+
+
+class UserStoryUploadChunkAPIView(ReadReplicaMixin, APIView):
+    """
+    GET  - joriy offset (uzilgan yuklashni davom ettirish uchun)
+    PUT  - Upload-Offset headeri bilan chunk (tana: xom baytlar)
+    DELETE - yuklashni bekor qilish
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        upload = get_object_or_404(StoryUpload, upload_id=upload_id, user=request.user)
+        return CustomResponse.success_response(data=StoryUploadSerializer(upload).data)
+
+    def put(self, request, upload_id):
+        get_object_or_404(StoryUpload, upload_id=upload_id, user=request.user)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            return CustomResponse.error_response(message="Upload-Offset va Content-Length headerlari kelishi shart")
+
+        # request.data ishlatilmaydi: parser tanani xotiraga o'qimasligi uchun oqim to'g'ridan-to'g'ri o'qiladi
+        upload = write_chunk(upload_id, request.user, offset, request.stream, length)
+        response = CustomResponse.success_response(data=StoryUploadSerializer(upload).data)
+        response['Upload-Offset'] = str(upload.offset)
+        return response
+
+    def delete(self, request, upload_id):
+        upload = get_object_or_404(
+            StoryUpload, upload_id=upload_id, user=request.user, status=StoryUploadStatusChoices.PENDING
+        )
+        abort_upload(upload)
+        return CustomResponse.success_response(message='Yuklash bekor qilindi')
+
+
+class UserStoryUploadFinalizeAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        get_object_or_404(StoryUpload, upload_id=upload_id, user=request.user)
+        story = finalize_upload(upload_id, request.user)
+        return CustomResponse.success_response(
+            message='Storis muvaffaqiyatli yaratildi',
+            data=UserStoryListSerializer(story, context={'request': request}).data,
+            code=HTTP_201_CREATED
+        )
@@ -1,4 +1,5 @@
 from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
@@ -11,56 +12,57 @@ from rest_framework.views import APIView
 
 from apps.admin.permissions.users import AdminPermission
 from apps.profile.filters import UserStoryListFilter
-from apps.profile.models import StoryView, Story, Profile
+from apps.profile.models import StoryView, Story, PatientProfile, FollowChoices, STORY_LIFETIME
 from apps.profile.paginations import UserStoryListPagination
 from apps.profile.permission import UserActiveStoryPermission
+from apps.profile.ranking import build_story_tray
+from apps.profile.seen_state import get_seen_story_ids
 from apps.profile.serializers.story import UserStoryMarkViewedSerializer, UserActiveStoriesSerializer, \
     StoryElementSerializer, \
-    UserStoryListSerializer, UserStoryCreateSerializer
+    UserStoryListSerializer, UserStoryCreateSerializer, UserStoryTraySerializer
 from apps.utils import CustomResponse
+from apps.utils.db_router import ReadReplicaMixin
 
 
-class UserStoryCreateAPIView(CreateAPIView):
+class UserStoryCreateAPIView(ReadReplicaMixin, CreateAPIView):
     serializer_class = UserStoryCreateSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
     def create(self, request, *args, **kwargs):
-        user_profile = Profile.objects.filter(user=self.request.user).first()
+        user_profile = PatientProfile.objects.filter(user=self.request.user).first()
         if not user_profile:
             return CustomResponse.error_response(message='Userga tegishli profil mavjud emas')
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        story = serializer.save(profile=self.request.user.profile)
-        full_data = UserStoryListSerializer(story).data
+        story = serializer.save(user=self.request.user)
+        full_data = UserStoryListSerializer(story, context={'request': request}).data
         return CustomResponse.success_response(message='Storis muvaffaqiyatli yaratildi', data=full_data,
                                                code=HTTP_201_CREATED)
 
 
-class UserStoryListAPIView(ListAPIView):
+class UserStoryListAPIView(ReadReplicaMixin, ListAPIView):
     serializer_class = UserStoryListSerializer
     permission_classes = [AdminPermission]
     pagination_class = UserStoryListPagination
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['status']
     filterset_class = UserStoryListFilter
-    search_fields = ['profile__username', 'profile__full_name']
-    ordering_fields = ['created_at', 'updated_at', 'expires_at', 'profile__full_name']
+    search_fields = ['user__full_name', 'user__contact']
+    ordering_fields = ['created_at', 'updated_at', 'expires_at', 'user__full_name']
     ordering = ['id']
 
     def get_queryset(self):
-        return Story.objects.select_related('profile', 'profile__user')
+        return Story.objects.select_related('user', 'user__profile')
 
 
-class UserActiveStoryListAPIView(ListAPIView):
+class UserActiveStoryListAPIView(ReadReplicaMixin, ListAPIView):
     serializer_class = StoryElementSerializer
     permission_classes = [UserActiveStoryPermission]
 
     def get_queryset(self):
-        return Story.objects.filter(
-            expires_at__gte=timezone.now(),
-            profile__user=self.request.user,
-            expired=False
+        return Story.objects.active().filter(
+            user=self.request.user
         ).order_by('-created_at')
 
     def list(self, request, *args, **kwargs):
@@ -69,42 +71,68 @@ class UserActiveStoryListAPIView(ListAPIView):
         serializer = UserActiveStoriesSerializer({
             "profile": profile,
             "stories": stories
-        })
+        }, context={'request': request})
         return Response(serializer.data)
 
 
-class UserStoryMarkViewedAPIView(APIView):
+class UserStoryTrayAPIView(ReadReplicaMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, story_id):
-        view_profile = self.request.user.profile
+    def get(self, request):
+        viewer = PatientProfile.objects.filter(user=request.user).first()
+        if not viewer:
+            return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
+
+        stories = list(
+            Story.objects.active().filter(
+                user__profile__followers__profile=viewer,
+                user__profile__followers__status=FollowChoices.follow
+            ).select_related('user__profile').order_by('created_at')
+        )
+        seen_story_ids = get_seen_story_ids(viewer.id, [story.id for story in stories])
+
+        tray = build_story_tray(viewer.id, stories, seen_story_ids)
+        return CustomResponse.success_response(
+            data=UserStoryTraySerializer(tray, many=True, context={'request': request}).data
+        )
+
+
+class UserStoryMarkViewedAPIView(ReadReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, story_public_id):
+        view_profile = PatientProfile.objects.filter(user=request.user).first()
         if not view_profile:
             return CustomResponse.error_response(message='Userga tegishli profil topilmadi')
 
         try:
-            story = Story.objects.get(
-                id=story_id
-            )
+            # faqat tirik storislar partitionlari qidiriladi
+            story = Story.objects.select_related('user__profile').filter(
+                created_at__gte=timezone.now() - STORY_LIFETIME
+            ).get(public_id=story_public_id)
         except Story.DoesNotExist:
             return CustomResponse.error_response(message='Storis topilmadi')
-        if story.profile == self.request.user.profile:
+        if story.user_id == request.user.id:
             return CustomResponse.error_response(message="O'z storisini koryapti")
         try:
             with transaction.atomic():
                 view, created = StoryView.objects.get_or_create(
                     story=story,
+                    story_created_at=story.created_at,
                     view_profile=view_profile
                 )
 
                 if created:
-                    story.view_count = story.story_view.count()
-                    story.save(update_fields=['view_count'])
+                    Story.objects.filter(id=story.id, created_at=story.created_at).update(
+                        view_count=F('view_count') + 1
+                    )
+                    story.refresh_from_db(fields=['view_count'])
 
         except IntegrityError:
             return CustomResponse.error_response(message='Storyni belgilashda xatolik yuz berdi')
         serializer = UserStoryMarkViewedSerializer(
             instance={
-                "profile": view.story.profile,
+                "profile": story.user.profile,
                 "story": story
-            })
+            }, context={'request': request})
         return CustomResponse.success_response(serializer.data)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from apps.stats.models import StatRollup
+
+
+@admin.register(StatRollup)
+class StatRollupAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'dimension', 'granularity', 'bucket', 'count', 'updated_at')
+    list_filter = ('granularity', 'metric')
+    list_per_page = 50
+    ordering = ('-bucket', 'metric', 'dimension')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class StatsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.stats'
+
+    def ready(self):
+        from apps.stats.signals import connect_stat_signals
+        connect_stat_signals()
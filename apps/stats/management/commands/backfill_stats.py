@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.stats.rollups import backfill_user_stats, backfill_story_stats, day_bucket, hour_bucket
+
+
+class Command(BaseCommand):
+    help = "Dashboard rollup jadvallarini custom_user va story dan qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Faqat oxirgi N kunni qayta hisoblash (default: butun tarix)")
+        parser.add_argument('--story-hours', type=int, default=48)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # bulk_create va queryset.update signal yubormaydi: ulardan keyin shu buyruq ishga tushiriladi
+        since = day_bucket(now) - timedelta(days=options['days'] - 1) if options['days'] else None
+        user_rows = backfill_user_stats(since)
+        story_rows = backfill_story_stats(hour_bucket(now - timedelta(hours=options['story_hours'])))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{user_rows} ta kunlik user va {story_rows} ta soatlik storis rollup qatori yozildi"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('hour', 'Hour')], max_length=10)),
+                ('metric', models.CharField(max_length=50)),
+                ('bucket', models.DateTimeField()),
+                ('dimension', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Stat Rollup',
+                'verbose_name_plural': 'Stat Rollups',
+                'db_table': 'stat_rollup',
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'metric', 'bucket', 'dimension'),
+                                                        name='stat_rollup_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class StatGranularityChoices(models.TextChoices):
+    DAY = ('day', 'Day')
+    HOUR = ('hour', 'Hour')
+
+
+class StatRollup(models.Model):
+    # har (granularity, metric, bucket, dimension) uchun bitta qator, count faqat delta bilan o'zgaradi
+    granularity = models.CharField(max_length=10, choices=StatGranularityChoices.choices)
+    metric = models.CharField(max_length=50)
+    bucket = models.DateTimeField()
+    dimension = models.CharField(max_length=100, default='', blank=True)
+    count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'stat_rollup'
+        verbose_name = 'Stat Rollup'
+        verbose_name_plural = 'Stat Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'metric', 'bucket', 'dimension'],
+                                    name='stat_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.dimension}] {self.bucket:%Y-%m-%d %H:00}: {self.count}"
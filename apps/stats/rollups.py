@@ -0,0 +1,171 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from apps.profile.models import Story
+from apps.stats.models import StatRollup, StatGranularityChoices
+
+User = get_user_model()
+
+USERS = 'users'
+USERS_BY_ROLE = 'users_by_role'
+USERS_BY_CONTACT_TYPE = 'users_by_contact_type'
+USERS_BY_GENDER = 'users_by_gender'
+STORIES = 'stories'
+
+# metric -> User field. Har user o'zi ro'yxatdan o'tgan kunning qatoriga hozirgi qiymatlari bilan
+# yoziladi: role/gender o'zgarsa shu kunda -1/+1 bo'ladi va backfill GROUP BY natijasi bilan mos keladi
+USER_METRICS = {
+    USERS: None,
+    USERS_BY_ROLE: 'active_role',
+    USERS_BY_CONTACT_TYPE: 'contact_type',
+    USERS_BY_GENDER: 'gender',
+}
+
+
+def day_bucket(at):
+    return timezone.localtime(at).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def hour_bucket(at):
+    return timezone.localtime(at).replace(minute=0, second=0, microsecond=0)
+
+
+def user_stat_keys(user):
+    """
+    Userning rollup kalitlari: {(granularity, metric, bucket, dimension)}.
+    O'chirilgan yoki hali saqlanmagan user hech qayerda sanalmaydi.
+    """
+    if user.pk is None or user.deleted_at is not None or user.created_at is None:
+        return set()
+    bucket = day_bucket(user.created_at)
+    return {
+        (StatGranularityChoices.DAY, metric, bucket, (getattr(user, field) or '') if field else '')
+        for metric, field in USER_METRICS.items()
+    }
+
+
+def story_stat_keys(story):
+    # storis tugash soati bo'yicha sanaladi: aktivlik storis lentasidagi qoida bilan bir xil
+    # (Story.objects.active(): expired=False va expires_at >= now)
+    if story.pk is None or story.deleted_at is not None or story.expired or story.expires_at is None:
+        return set()
+    return {(StatGranularityChoices.HOUR, STORIES, hour_bucket(story.expires_at), '')}
+
+
+def diff_keys(old_keys, new_keys):
+    deltas = Counter()
+    for key in new_keys - old_keys:
+        deltas[key] += 1
+    for key in old_keys - new_keys:
+        deltas[key] -= 1
+    return deltas
+
+
+def _apply_delta(granularity, metric, bucket, dimension, delta):
+    queryset = StatRollup.objects.filter(granularity=granularity, metric=metric, bucket=bucket, dimension=dimension)
+    if queryset.update(count=F('count') + delta, updated_at=timezone.now()):
+        return
+
+    try:
+        with transaction.atomic():
+            StatRollup.objects.create(
+                granularity=granularity, metric=metric, bucket=bucket, dimension=dimension, count=delta
+            )
+    except IntegrityError:
+        queryset.update(count=F('count') + delta, updated_at=timezone.now())
+
+
+def apply_deltas(deltas):
+    for (granularity, metric, bucket, dimension), delta in sorted(deltas.items()):
+        if delta:
+            _apply_delta(granularity, metric, bucket, dimension, delta)
+
+
+def record_deltas(deltas):
+    # asosiy tranzaksiya commit bo'lgandan keyin: rollup qatori lock i registratsiyani ushlab turmaydi
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: apply_deltas(deltas))
+
+
+def _replace_rollups(granularity, metrics, since, rows):
+    queryset = StatRollup.objects.filter(granularity=granularity, metric__in=metrics)
+    if since is not None:
+        queryset = queryset.filter(bucket__gte=since)
+    with transaction.atomic():
+        queryset.delete()
+        StatRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+def backfill_user_stats(since=None):
+    """
+    Kunlik user rollup larini custom_user dan GROUP BY bilan qayta quradi (since=None - butun tarix).
+    """
+    rows = []
+    users = User.objects.all() if since is None else User.objects.filter(created_at__gte=since)
+    users = users.annotate(bucket=TruncDay('created_at'))
+    for metric, field in USER_METRICS.items():
+        group_by = ['bucket', field] if field else ['bucket']
+        for row in users.values(*group_by).annotate(total=Count('id')).order_by():
+            rows.append(StatRollup(
+                granularity=StatGranularityChoices.DAY, metric=metric, bucket=row['bucket'],
+                dimension=(row[field] or '') if field else '', count=row['total']
+            ))
+    _replace_rollups(StatGranularityChoices.DAY, list(USER_METRICS), since, rows)
+    return len(rows)
+
+
+def backfill_story_stats(since):
+    queryset = (
+        Story.objects.filter(expires_at__gte=since, expired=False)
+        .annotate(bucket=TruncHour('expires_at'))
+        .values('bucket').annotate(total=Count('id')).order_by()
+    )
+    rows = [
+        StatRollup(granularity=StatGranularityChoices.HOUR, metric=STORIES, bucket=row['bucket'], count=row['total'])
+        for row in queryset
+    ]
+    with transaction.atomic():
+        # soatlik storis qatorlari faqat aktiv storislar oynasi uchun kerak
+        StatRollup.objects.filter(granularity=StatGranularityChoices.HOUR, metric=STORIES, bucket__lt=since).delete()
+        _replace_rollups(StatGranularityChoices.HOUR, [STORIES], since, rows)
+    return len(rows)
+
+
+def dimension_totals(metric):
+    return dict(
+        StatRollup.objects.filter(granularity=StatGranularityChoices.DAY, metric=metric)
+        .values_list('dimension').annotate(total=Sum('count')).order_by('dimension')
+    )
+
+
+def dashboard_stats(days=30, now=None):
+    now = now or timezone.now()
+    since = day_bucket(now) - timedelta(days=days - 1)
+
+    registrations = (
+        StatRollup.objects.filter(granularity=StatGranularityChoices.DAY, metric=USERS, bucket__gte=since)
+        .order_by('bucket').values_list('bucket', 'count')
+    )
+    # tugash soati hali o'tmagan storislar, aniqlik 1 soat. Story.save dagi update(expired=True) signal
+    # yubormaydi, lekin u faqat expires_at i o'tganlarni belgilaydi va ular bu yerda baribir sanalmaydi
+    active_stories = StatRollup.objects.filter(
+        granularity=StatGranularityChoices.HOUR, metric=STORIES, bucket__gte=hour_bucket(now)
+    ).aggregate(total=Sum('count'))['total']
+
+    return {
+        "users_total": dimension_totals(USERS).get('', 0),
+        "users_by_role": dimension_totals(USERS_BY_ROLE),
+        "users_by_contact_type": dimension_totals(USERS_BY_CONTACT_TYPE),
+        "users_by_gender": dimension_totals(USERS_BY_GENDER),
+        "registrations_per_day": [
+            {"date": timezone.localtime(bucket).date(), "count": count} for bucket, count in registrations
+        ],
+        "active_stories": active_stories or 0,
+    }
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_init, post_save, post_delete
+
+from apps.profile.models import Story
+from apps.stats.rollups import user_stat_keys, story_stat_keys, diff_keys, record_deltas
+
+User = get_user_model()
+
+# model -> rollup kalitlarini hisoblovchi funksiya
+STAT_KEYS = {
+    User: user_stat_keys,
+    Story: story_stat_keys,
+}
+
+
+def remember_stat_keys(sender, instance, **kwargs):
+    # .only()/refresh_from_db(fields=...) bilan yuklangan qatorda deferred fieldga murojaat yana
+    # refresh_from_db -> post_init ni chaqiradi (cheksiz rekursiya), shuning uchun u eslab qolinmaydi
+    if instance.get_deferred_fields():
+        return
+    instance._stat_keys = STAT_KEYS[sender](instance)
+
+
+def update_stats_on_save(sender, instance, created, **kwargs):
+    if not created and not hasattr(instance, '_stat_keys'):
+        # qisman yuklangan instance: eski kalitlar noma'lum, backfill_stats qayta sanaydi
+        return
+    old_keys = set() if created else instance._stat_keys
+    new_keys = STAT_KEYS[sender](instance)
+    record_deltas(diff_keys(old_keys, new_keys))
+    instance._stat_keys = new_keys
+
+
+def update_stats_on_delete(sender, instance, **kwargs):
+    record_deltas(diff_keys(STAT_KEYS[sender](instance), set()))
+
+
+def connect_stat_signals():
+    for model in STAT_KEYS:
+        uid = f"stat_rollups_{model._meta.label_lower}"
+        post_init.connect(remember_stat_keys, sender=model, dispatch_uid=uid)
+        post_save.connect(update_stats_on_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(update_stats_on_delete, sender=model, dispatch_uid=uid)
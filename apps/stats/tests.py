@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.profile.models import Story
+from apps.stats.models import StatRollup
+from apps.stats.rollups import dashboard_stats, backfill_user_stats, backfill_story_stats, hour_bucket
+from apps.users.choices import CustomUserRoleChoices
+
+User = get_user_model()
+
+
+class StatRollupTests(TestCase):
+    def create_user(self, contact, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return User.objects.create_user(contact, full_name=contact.split('@')[0], **fields)
+
+    def create_story(self, user, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Story.objects.create(user=user, role=user.active_role, **fields)
+
+    def rollups(self):
+        return sorted(StatRollup.objects.values_list('granularity', 'metric', 'bucket', 'dimension', 'count'))
+
+    def test_registrations_are_counted_by_dimension(self):
+        self.create_user('first@example.com')
+        self.create_user('second@example.com', active_role=CustomUserRoleChoices.SHIFOKOR)
+
+        stats = dashboard_stats()
+        self.assertEqual(stats['users_total'], 2)
+        self.assertEqual(stats['users_by_role'][CustomUserRoleChoices.SHIFOKOR], 1)
+        self.assertEqual(stats['registrations_per_day'], [{"date": timezone.localdate(), "count": 2}])
+
+    def test_incremental_rollups_match_backfill(self):
+        user = self.create_user('first@example.com')
+        self.create_user('second@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.active_role = CustomUserRoleChoices.SHIFOKOR
+            user.save()
+        self.create_story(user)
+        incremental = self.rollups()
+
+        backfill_user_stats()
+        backfill_story_stats(hour_bucket(timezone.now()))
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_active_stories_follow_expiry(self):
+        user = self.create_user('author@example.com')
+        story = self.create_story(user)
+        self.create_story(user, expires_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(dashboard_stats()['active_stories'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            story.expired = True
+            story.save()
+        self.assertEqual(dashboard_stats()['active_stories'], 0)
+
+    def test_partially_loaded_story_does_not_recurse(self):
+        story = self.create_story(self.create_user('author@example.com'))
+        story.refresh_from_db(fields=['view_count'])
+
+        partial = Story.objects.only('id', 'view_count').get(id=story.id)
+        partial.view_count = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            partial.save()
+        self.assertEqual(dashboard_stats()['active_stories'], 1)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
-from apps.users.models import SmsCode
+from apps.users.models import SmsCode, UserImport
 
 # Register your models here.
 
@@ -13,4 +13,13 @@ class CustomUserAdmin(admin.ModelAdmin):
 
 @admin.register(SmsCode)
 class SmsCodeAdmin(admin.ModelAdmin):
-    list_display = ['id', 'contact', 'expires_at', 'hash_code', 'verified', '_type', 'resend_code', 'attempts', 'delete_obj']
\ No newline at end of file
+    list_display = ['id', 'contact', 'expires_at', 'hash_code', 'verified', '_type', 'resend_code', 'attempts', 'delete_obj']
+
+
+@admin.register(UserImport)
+class UserImportAdmin(admin.ModelAdmin):
+    list_display = ['id', 'file', 'status', 'total_rows', 'created_count', 'error_count', 'rows_per_second',
+                    'created_at']
+    list_filter = ['status']
+    readonly_fields = ['total_rows', 'created_count', 'error_count', 'errors', 'rows_per_second', 'error',
+                       'started_at', 'finished_at']
@@ -24,4 +24,10 @@ class UserContactTypeChoices(models.TextChoices):
 
 
 def default_roles():
-    return [CustomUserRoleChoices.FOYDALANUVCHI]
\ No newline at end of file
+    return [CustomUserRoleChoices.FOYDALANUVCHI]
+
+class UserImportStatusChoices(models.TextChoices):
+    PENDING = ('pending', 'Pending')
+    RUNNING = ('running', 'Running')
+    DONE = ('done', 'Done')
+    FAILED = ('failed', 'Failed')
@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.profile.models import PatientProfile
+from apps.stats.rollups import user_stat_keys, record_deltas
+from apps.users.choices import UserImportStatusChoices, CustomUserRoleChoices, default_roles
+from apps.users.models import UserImport
+from apps.utils.base_models import GenderChoices
+from apps.utils.generate_code import allocate_public_ids
+from apps.utils.validates import validate_email_or_phone_number, get_valid_roles
+
+User = get_user_model()
+
+IMPORT_FIELDS = ('contact', 'full_name', 'password', 'birth_date', 'gender', 'active_role')
+HASH_CHUNK_SIZE = 32
+
+
+def read_rows(file):
+    """
+    CSV (sarlavha qatori bilan) yoki JSON (obyektlar ro'yxati) faylni lug'atlar ro'yxatiga o'qiydi.
+    """
+    file.open('rb')
+    try:
+        data = file.read()
+    finally:
+        file.close()
+
+    if os.path.splitext(file.name)[1].lower() == '.json':
+        rows = json.loads(data.decode('utf-8-sig'))
+        if not isinstance(rows, list):
+            raise ValueError("JSON fayl obyektlar ro'yxatidan iborat bo'lishi kerak")
+        return rows
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8-sig'))))
+
+
+def clean_row(row, valid_roles):
+    if not isinstance(row, dict):
+        return None, ["Qator obyekt bo'lishi kerak"]
+
+    values = {field: str(row.get(field) or '').strip() for field in IMPORT_FIELDS}
+    errors = []
+
+    contact_type = validate_email_or_phone_number(values['contact'])
+    if not contact_type:
+        errors.append("Email yoki telefon raqam noto'g'ri")
+    if not values['password']:
+        errors.append("Parol kiritilishi shart")
+    if values['gender'] and values['gender'] not in GenderChoices.values:
+        errors.append(f"gender quyidagilardan biri bo'lishi kerak: {', '.join(GenderChoices.values)}")
+    if values['active_role'] and values['active_role'] not in valid_roles:
+        errors.append("Rol noto'g'ri")
+
+    birth_date = None
+    if values['birth_date']:
+        try:
+            birth_date = date.fromisoformat(values['birth_date'])
+        except ValueError:
+            errors.append("birth_date YYYY-MM-DD formatida bo'lishi kerak")
+
+    if errors:
+        return None, errors
+    return {
+        'contact': values['contact'],
+        'contact_type': contact_type,
+        'full_name': values['full_name'] or None,
+        'password': values['password'],
+        'birth_date': birth_date,
+        'gender': values['gender'] or None,
+        'active_role': values['active_role'] or None,
+    }, []
+
+
+def _row_error(number, contact, errors):
+    return {"row": number, "contact": contact, "errors": errors}
+
+
+def _insert_batch(batch, hashes):
+    """
+    batch: [(row_number, cleaned)], hashes: mos parol hashlari.
+    Userlar va profillar bitta tranzaksiyada bulk_create qilinadi; post_save signal ishlamaydi,
+    shuning uchun profillar shu yerda yaratiladi.
+    """
+    user_ids = allocate_public_ids(User, len(batch))
+    profile_ids = allocate_public_ids(PatientProfile, len(batch))
+
+    users = []
+    for (_, cleaned), password, public_id in zip(batch, hashes, user_ids):
+        active_role = cleaned['active_role'] or CustomUserRoleChoices.FOYDALANUVCHI
+        roles = default_roles()
+        if active_role not in roles:
+            roles.append(active_role)
+        users.append(User(
+            public_id=public_id,
+            contact=cleaned['contact'],
+            contact_type=cleaned['contact_type'],
+            full_name=cleaned['full_name'],
+            password=password,
+            birth_date=cleaned['birth_date'],
+            gender=cleaned['gender'],
+            active_role=active_role,
+            roles=roles,
+            # kontakt klinika/kompaniya tomonidan tasdiqlangan: kod yuborilmaydi
+            status=True,
+        ))
+
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        PatientProfile.objects.bulk_create([
+            PatientProfile(user=user, public_id=public_id, full_name=user.full_name)
+            for user, public_id in zip(users, profile_ids)
+        ])
+        # bulk_create post_save yubormaydi: dashboard rollup lari shu yerda yangilanadi
+        deltas = Counter()
+        for user in users:
+            deltas.update(user_stat_keys(user))
+        record_deltas(deltas)
+    return len(users)
+
+
+def process_user_import(job, batch_size=None, workers=None):
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    workers = workers or settings.USER_IMPORT_HASH_WORKERS
+    started = time.monotonic()
+
+    rows = read_rows(job.file)
+    valid_roles = get_valid_roles()
+    errors = []
+    cleaned_rows = []
+    seen_contacts = set()
+
+    for number, row in enumerate(rows, start=1):
+        cleaned, row_errors = clean_row(row, valid_roles)
+        if row_errors:
+            errors.append(_row_error(number, row.get('contact') if isinstance(row, dict) else None, row_errors))
+        elif cleaned['contact'] in seen_contacts:
+            errors.append(_row_error(number, cleaned['contact'], ["Kontakt faylda takrorlangan"]))
+        else:
+            seen_contacts.add(cleaned['contact'])
+            cleaned_rows.append((number, cleaned))
+
+    UserImport.objects.filter(id=job.id).update(total_rows=len(rows), updated_at=timezone.now())
+
+    created = 0
+    # PBKDF2 CPU ni band qiladi: hashlar alohida jarayonlarda parallel hisoblanadi
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for offset in range(0, len(cleaned_rows), batch_size):
+            batch = cleaned_rows[offset:offset + batch_size]
+
+            existing = set(
+                User.all_objects.filter(contact__in=[cleaned['contact'] for _, cleaned in batch])
+                .values_list('contact', flat=True)
+            )
+            for number, cleaned in batch:
+                if cleaned['contact'] in existing:
+                    errors.append(_row_error(number, cleaned['contact'], ["Bu kontakt bilan user mavjud"]))
+            batch = [(number, cleaned) for number, cleaned in batch if cleaned['contact'] not in existing]
+            if not batch:
+                continue
+
+            hashes = list(pool.map(make_password, [cleaned['password'] for _, cleaned in batch],
+                                   chunksize=HASH_CHUNK_SIZE))
+            try:
+                created += _insert_batch(batch, hashes)
+            except IntegrityError as e:
+                # parallel ro'yxatdan o'tish bilan to'qnashuv: partiya qatorlari xato sifatida qaytariladi
+                errors.extend(_row_error(number, cleaned['contact'], [str(e)]) for number, cleaned in batch)
+
+            UserImport.objects.filter(id=job.id).update(created_count=created, updated_at=timezone.now())
+
+    errors.sort(key=lambda error: error['row'])
+    elapsed = time.monotonic() - started
+    UserImport.objects.filter(id=job.id).update(
+        status=UserImportStatusChoices.DONE,
+        created_count=created,
+        error_count=len(errors),
+        errors=errors,
+        rows_per_second=round(len(rows) / elapsed, 1) if elapsed else None,
+        finished_at=timezone.now(),
+        updated_at=timezone.now()
+    )
+    return created, errors
+
+
+def claim_next_import():
+    with transaction.atomic():
+        job = (
+            UserImport.objects.select_for_update(skip_locked=True)
+            .filter(status=UserImportStatusChoices.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job:
+            job.status = UserImportStatusChoices.RUNNING
+            job.started_at = timezone.now()
+            job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.users.choices import UserImportStatusChoices
+from apps.users.imports import claim_next_import, process_user_import
+from apps.users.models import UserImport
+
+
+class Command(BaseCommand):
+    help = "Yuklangan CSV/JSON fayllardan userlarni partiyalab import qiladi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.USER_IMPORT_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=settings.USER_IMPORT_HASH_WORKERS,
+                            help="Parol hashlash uchun jarayonlar soni")
+        parser.add_argument('--loop', action='store_true', help="Worker rejimi: navbatni doimiy kuzatadi")
+        parser.add_argument('--sleep', type=int, default=10)
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_import()
+            if job is None:
+                if not options['loop']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            try:
+                created, errors = process_user_import(job, options['batch_size'], options['workers'])
+                job.refresh_from_db(fields=['rows_per_second'])
+                self.stdout.write(self.style.SUCCESS(
+                    f"Import {job.id}: {created} ta user yaratildi, {len(errors)} ta xato, "
+                    f"{job.rows_per_second} qator/s"
+                ))
+            except Exception as e:
+                UserImport.objects.filter(id=job.id).update(
+                    status=UserImportStatusChoices.FAILED, error=str(e), finished_at=timezone.now(),
+                    updated_at=timezone.now()
+                )
+                self.stderr.write(f"Import {job.id} da xatolik: {e}")
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.management.commands.soft_delete_records import get_soft_delete_model
+from apps.utils.base_models import SoftDeleteBaseModel
+
+
+class Command(BaseCommand):
+    help = "Saqlash muddati o'tgan soft delete qilingan qatorlarni butunlay o'chiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help="Masalan: profile.Follow profile.Story (default: hammasi)")
+        parser.add_argument('--older-than-days', type=int, default=30)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['models']:
+            models = [get_soft_delete_model(label) for label in options['models']]
+        else:
+            models = [model for model in apps.get_models() if issubclass(model, SoftDeleteBaseModel)]
+
+        threshold = timezone.now() - timedelta(days=options['older_than_days'])
+        for model in models:
+            queryset = model.all_objects.filter(deleted_at__lt=threshold)
+            if options['dry_run']:
+                self.stdout.write(f"{model._meta.label}: {queryset.count()} ta qator o'chiriladi")
+                continue
+
+            purged = 0
+            while True:
+                ids = list(queryset.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    # cascade va post_delete (media blob havolalari) oddiy delete() orqali ishlaydi
+                    model.all_objects.filter(id__in=ids).delete()
+                purged += len(ids)
+
+            self.stdout.write(self.style.SUCCESS(f"{model._meta.label}: {purged} ta qator o'chirildi"))
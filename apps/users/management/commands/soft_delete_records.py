@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.base_models import SoftDeleteBaseModel
+
+FILTER_VALUES = {'true': True, 'false': False, 'null': None}
+
+
+def parse_filters(items):
+    filters = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise CommandError(f"Filter noto'g'ri: {item} (field=value ko'rinishida bo'lishi kerak)")
+        filters[key] = FILTER_VALUES.get(value.lower(), value)
+    return filters
+
+
+def get_soft_delete_model(label):
+    try:
+        model = apps.get_model(label)
+    except (LookupError, ValueError):
+        raise CommandError(f"Model topilmadi: {label}")
+    if not issubclass(model, SoftDeleteBaseModel):
+        raise CommandError(f"{label} soft delete ni qo'llab-quvvatlamaydi")
+    return model
+
+
+class Command(BaseCommand):
+    help = "Filterga mos qatorlarni partiyalab soft delete qiladi (deleted_at ni to'ldiradi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="Masalan: profile.Story")
+        parser.add_argument('--filter', action='append', default=[], dest='filters',
+                            help="field=value, bir necha marta berish mumkin (masalan expired=true)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        model = get_soft_delete_model(options['model'])
+        filters = parse_filters(options['filters'])
+        if not filters:
+            raise CommandError("Kamida bitta --filter berilishi kerak")
+
+        queryset = model.objects.filter(**filters)
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} ta qator soft delete qilinadi")
+            return
+
+        total = 0
+        while True:
+            # har partiya alohida UPDATE: katta jadvalda uzoq lock ushlanmaydi
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += model.objects.filter(id__in=ids).soft_delete()
+
+        self.stdout.write(self.style.SUCCESS(f"{total} ta qator soft delete qilindi"))
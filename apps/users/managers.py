@@ -1,7 +1,13 @@
 from django.contrib.auth.base_user import BaseUserManager
 
+from apps.utils.base_models import SoftDeleteQuerySet
+
+
+class CustomUserManager(BaseUserManager.from_queryset(SoftDeleteQuerySet)):
+    def get_queryset(self):
+        # o'chirilgan akkauntlar login, JWT va ro'yxatlarda ko'rinmaydi; ular User.all_objects da
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
-class CustomUserManager(BaseUserManager):
     def create_user(self, contact, password=None, **extra_fields):
         if not contact:
             raise ValueError('Email yoki telefon raqam kiritilishi shart')
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:14
+
+import apps.media.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_customuser_roles_alter_customuser_active_role'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=apps.media.storage.get_content_addressed_storage, upload_to='users/image/'),
+        ),
+    ]
@@ -7,13 +7,14 @@ from django.db.models import Q
 from django.utils import timezone
 
 from apps.users.choices import UserContactTypeChoices, UserSocialAuthRegistrationTypeChoices, CustomUserRoleChoices, \
-    default_roles
+    default_roles, UserImportStatusChoices
+from apps.media.storage import get_content_addressed_storage
 from apps.users.managers import CustomUserManager
-from apps.utils.base_models import  CreateUpdateBaseModel, GenderChoices
+from apps.utils.base_models import CreateUpdateBaseModel, SoftDeleteBaseModel, GenderChoices
 from apps.utils.generate_code import generate_public_id
 
 
-class CustomUser(AbstractBaseUser, PermissionsMixin, CreateUpdateBaseModel):
+class CustomUser(AbstractBaseUser, PermissionsMixin, SoftDeleteBaseModel):
     public_id = models.PositiveIntegerField(null=True, db_index=True)
     full_name = models.CharField(max_length=200, null=True)
     contact = models.CharField(max_length=200, unique=True, db_index=True)
@@ -29,7 +30,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin, CreateUpdateBaseModel):
         blank=True
     )
     roles = models.JSONField(default=default_roles, null=True, blank=True)
-    image = models.ImageField(upload_to='users/image/', null=True, blank=True)
+    image = models.ImageField(upload_to='users/image/', storage=get_content_addressed_storage, null=True, blank=True)
     birth_date = models.DateField(null=True)
     gender = models.CharField(null=True, choices=GenderChoices.choices)
     status = models.BooleanField(default=False)
@@ -48,6 +49,10 @@ class CustomUser(AbstractBaseUser, PermissionsMixin, CreateUpdateBaseModel):
         verbose_name = 'Custom User'
         verbose_name_plural = 'Custom Users'
         ordering = ['-id']
+        indexes = [
+            models.Index(fields=['contact'], name='custom_user_contact_alive_idx',
+                         condition=Q(deleted_at__isnull=True)),
+        ]
 
     def __str__(self):
         return self.full_name or self.contact or self.contact_type
@@ -106,7 +111,52 @@ class SmsCode(CreateUpdateBaseModel):
         )
         return sms_code_obj
 
+    @classmethod
+    async def acreate_for_contact(cls, contact, hash_code, _type='', second=180):
+        await cls.objects.filter(
+            verified=False
+        ).filter(
+            Q(delete_obj__lt=timezone.now()) | Q(resend_code__gte=3)
+        ).adelete()
+
+        sms_code_obj = await cls.objects.acreate(
+            contact=contact,
+            hash_code=hash_code,
+            expires_at=timezone.now() + timedelta(seconds=second),
+            delete_obj=timezone.now() + timedelta(minutes=10),
+            _type=_type
+        )
+        return sms_code_obj
+
     class Meta:
         db_table = 'sms_code'
         verbose_name = 'Sms Code'
         verbose_name_plural = 'Sms Codes'
+
+
+class UserImport(CreateUpdateBaseModel):
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='user_imports')
+    file = models.FileField(upload_to='imports/users/')
+    status = models.CharField(max_length=20, choices=UserImportStatusChoices.choices,
+                              default=UserImportStatusChoices.PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # [{"row": 12, "contact": "...", "errors": ["..."]}, ...]
+    errors = models.JSONField(default=list, blank=True)
+    rows_per_second = models.FloatField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'user_import'
+        verbose_name = 'User Import'
+        verbose_name_plural = 'User Imports'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='user_import_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.file.name}: {self.status}"
@@ -0,0 +1,237 @@
+import asyncio
+import time
+
+import httpx
+import jwt
+from adrf.views import APIView
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from google.auth import jwt as google_jwt
+from rest_framework import status
+
+from apps.users.models import UserSocialAuthRegistrationTypeChoices, UserContactTypeChoices
+from apps.users.serializers import UserSerializer
+from apps.users.social_auth.save_picture import asave_profile_picture_from_url
+from apps.users.social_auth.serializers import UserGoogleSocialAuthSerializer, UserFacebookSocialAuthSerializer, \
+    UserAppleSocialAuthSerializer
+from apps.utils import CustomResponse
+from apps.utils.http_client import get_async_client
+from apps.utils.token_claim import get_tokens_for_user
+from config.settings import SOCIAL_AUTH_KEYS
+
+User = get_user_model()
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+PUBLIC_KEYS_TTL = 3600
+
+_public_keys_cache = {}
+
+
+async def _afetch_public_keys(url):
+    # Google sertifikatlari va Apple JWKS kam o'zgaradi, har login uchun qayta yuklanmaydi
+    cached = _public_keys_cache.get(url)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    response = await get_async_client().get(url)
+    response.raise_for_status()
+    keys = response.json()
+    _public_keys_cache[url] = (time.monotonic() + PUBLIC_KEYS_TTL, keys)
+    return keys
+
+
+async def averify_google_id_token(token, audience):
+    certs = await _afetch_public_keys(GOOGLE_CERTS_URL)
+    id_info = google_jwt.decode(token, certs=certs, audience=audience)
+    if id_info.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError("Token issuer noto'g'ri")
+    return id_info
+
+
+async def aget_apple_signing_key(identity_token):
+    jwks = await _afetch_public_keys(SOCIAL_AUTH_KEYS['APPLE']['APPLE_PUBLIC_URL'])
+    kid = jwt.get_unverified_header(identity_token).get("kid")
+    for key in jwt.PyJWKSet.from_dict(jwks).keys:
+        if key.key_id == kid:
+            return key.key
+    raise jwt.PyJWKClientError("Apple signing key topilmadi")
+
+
+class AsyncUserGoogleSocialAuthAPIView(APIView):
+    serializer_class = UserGoogleSocialAuthSerializer
+
+    async def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = serializer.validated_data.get("token")
+
+        try:
+            id_info = await averify_google_id_token(token, SOCIAL_AUTH_KEYS['GOOGLE']['GOOGLE_CLIENT_ID'])
+        except (ValueError, httpx.HTTPError):
+            return CustomResponse.error_response(
+                message="Token yaroqsiz",
+                code=status.HTTP_403_FORBIDDEN
+            )
+
+        email = id_info.get("email")
+        given_name = id_info.get("given_name", "")
+        family_name = id_info.get("family_name", "")
+        picture_url = id_info.get("picture", "")
+
+        user, created = await User.objects.aget_or_create(
+            contact=email,
+            defaults={
+                "contact_type": UserContactTypeChoices.EMAIL,
+                "status": True,
+                "full_name": f"{given_name} {family_name}".strip(),
+                "registration_type": UserSocialAuthRegistrationTypeChoices.GOOGLE
+            }
+        )
+
+        if picture_url and created:
+            await asave_profile_picture_from_url(user=user, picture_url=picture_url)
+
+        if created:
+            message = "Google orqali muvaffaqiyatli ro'yhatdan o'dingiz."
+        else:
+            message = "Google orqali login muvaffaqiyatli bajarildi."
+
+        token = await sync_to_async(get_tokens_for_user)(user)
+        return CustomResponse.success_response(
+            message=message,
+            data={
+                "token": token,
+                "user": UserSerializer(user).data
+            }
+        )
+
+
+class AsyncUserFacebookSocialAuthAPIView(APIView):
+    serializer_class = UserFacebookSocialAuthSerializer
+
+    async def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        access_token = serializer.validated_data.get("access_token")
+
+        debug_url = (f"https://graph.facebook.com/debug_token?input_token={access_token}"
+                     f"&access_token={SOCIAL_AUTH_KEYS['FACEBOOK']['FACEBOOK_CLIENT_ID']}|"
+                     f"{SOCIAL_AUTH_KEYS['FACEBOOK']['FACEBOOK_SECRET']}")
+        user_info_url = f"https://graph.facebook.com/me?fields=id,name,email,picture&access_token={access_token}"
+
+        try:
+            # ikkala so'rov bir-biriga bog'liq emas, parallel yuboriladi
+            client = get_async_client()
+            debug_response, user_info_response = await asyncio.gather(
+                client.get(debug_url), client.get(user_info_url)
+            )
+            data = debug_response.json()
+            user_data = user_info_response.json()
+        except (ValueError, httpx.HTTPError):
+            return CustomResponse.error_response(
+                message="Facebook tokenini tekshirishda xatolik",
+                code=status.HTTP_403_FORBIDDEN
+            )
+
+        if "error" in data.get("data", {}):
+            return CustomResponse.error_response(
+                message="Facebook token yaroqsiz yoki muddati tugagan",
+                code=status.HTTP_400_BAD_REQUEST
+            )
+
+        email = user_data.get("email", "")
+        name = user_data.get("name", "")
+        profile_pic_url = user_data.get("picture", {}).get("data", {}).get("url", "")
+
+        if not email:
+            return CustomResponse.error_response(
+                message='Facebook foydalanuvchidan email olinmadi, loginni yakunlab bo‘lmadi',
+                code=status.HTTP_400_BAD_REQUEST
+            )
+
+        user, created = await User.objects.aget_or_create(
+            contact=email,
+            defaults={
+                "contact_type": UserContactTypeChoices.EMAIL,
+                "status": True,
+                "full_name": name.strip(),
+                "registration_type": UserSocialAuthRegistrationTypeChoices.FACEBOOK
+            }
+        )
+
+        if profile_pic_url and created:
+            await asave_profile_picture_from_url(user=user, picture_url=profile_pic_url)
+
+        token = await sync_to_async(get_tokens_for_user)(user)
+        if created:
+            message = "Facebook orqali muvaffaqiyatli ro'yhatdan o'dingiz."
+        else:
+            message = "Facebook orqali login muvaffaqiyatli bajarildi."
+        return CustomResponse.success_response(
+            message=message,
+            data={
+                "token": token,
+                "user": UserSerializer(user).data
+            }
+        )
+
+
+class AsyncUserAppleSocialAuthAPIView(APIView):
+    serializer_class = UserAppleSocialAuthSerializer
+
+    async def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        identity_token = serializer.validated_data.get("identity_token")
+
+        try:
+            signing_key = await aget_apple_signing_key(identity_token)
+
+            decoded = jwt.decode(
+                identity_token,
+                signing_key,
+                algorithms=["RS256"],
+                audience=SOCIAL_AUTH_KEYS['APPLE']['APPLE_CLIENT_ID'],
+                issuer="https://appleid.apple.com",
+            )
+
+            email = decoded.get("email", '')
+        except Exception as e:
+            return CustomResponse.error_response(
+                message=f"Apple token yaroqsiz: {e}",
+                code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not email:
+            return CustomResponse.error_response(
+                message='Apple email olishda xatolik',
+                code=status.HTTP_400_BAD_REQUEST
+            )
+        user, created = await User.objects.aget_or_create(
+            contact=email,
+            defaults={
+                "status": True,
+                "contact_type": UserContactTypeChoices.EMAIL,
+                "full_name": serializer.validated_data.get("full_name", '').strip(),
+                "registration_type": UserSocialAuthRegistrationTypeChoices.APPLE,
+            }
+        )
+
+        if created:
+            default_avatar_url = f"https://www.gravatar.com/avatar/{hash(email.lower())}?d=identicon"
+            await asave_profile_picture_from_url(user=user, picture_url=default_avatar_url)
+
+        token = await sync_to_async(get_tokens_for_user)(user)
+        if created:
+            message = "Apple orqali muvaffaqiyatli ro'yhatdan o'dingiz."
+        else:
+            message = "Apple orqali login muvaffaqiyatli bajarildi."
+
+        return CustomResponse.success_response(
+            message=message,
+            data={
+                "token": token,
+                "user": UserSerializer(user).data
+            }
+        )
@@ -1,10 +1,16 @@
+import logging
 import os
 import requests
 
 from urllib.parse import urlparse
 
+from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
 
+from apps.utils.http_client import get_async_client
+
+logger = logging.getLogger(__name__)
+
 
 def save_profile_picture_from_url(user, picture_url):
     if not picture_url:
@@ -15,7 +21,7 @@ def save_profile_picture_from_url(user, picture_url):
         if response.status_code == 200:
             # Extract filename from URL
             path = urlparse(picture_url).path
-            filename = os.path.basename(path) or f"{user.username}.jpg"
+            filename = os.path.basename(path) or f"{user.public_id}.jpg"
             if not filename.endswith(".jpg"):
                 filename = filename + ".jpg"
 
@@ -23,5 +29,24 @@ def save_profile_picture_from_url(user, picture_url):
             user.image.save(
                 filename, ContentFile(response.content), save=True
             )
-    except Exception as e:
-        print(f"Error saving profile picture: {e}")
+    except Exception:
+        logger.exception("Error saving profile picture from %s", picture_url)
+
+
+async def asave_profile_picture_from_url(user, picture_url):
+    if not picture_url:
+        return
+
+    try:
+        response = await get_async_client().get(picture_url)
+        if response.status_code == 200:
+            path = urlparse(picture_url).path
+            filename = os.path.basename(path) or f"{user.public_id}.jpg"
+            if not filename.endswith(".jpg"):
+                filename = filename + ".jpg"
+
+            await sync_to_async(user.image.save)(
+                filename, ContentFile(response.content), save=True
+            )
+    except Exception:
+        logger.exception("Error saving profile picture from %s", picture_url)
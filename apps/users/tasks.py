@@ -1,6 +1,15 @@
-from django.core.mail import send_mail
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.mail import send_mail, get_connection, EmailMessage
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+
+def mail_from():
+    return f"Medical APP <{settings.EMAIL_HOST_USER}>"
+
 
 def send_verification_code(email, code):
     subject = "Tasdiqlash kodi"
@@ -9,7 +18,44 @@ def send_verification_code(email, code):
     send_mail(
         subject,
         message,
-        f"Medical APP <{settings.EMAIL_HOST_USER}>",
+        mail_from(),
         [email],
         fail_silently=False,
     )
+
+
+async def asend_verification_code(email, code):
+    # SMTP kutish vaqtida event loop band bo'lmasligi uchun alohida threadda yuboriladi
+    await sync_to_async(send_verification_code, thread_sensitive=False)(email, code)
+
+
+def send_mail_batch(messages):
+    """
+    messages: [(email, subject, message)]. Hammasi bitta SMTP ulanish orqali, har xat alohida yuboriladi,
+    shuning uchun bittasining xatosi qolganlarini to'xtatmaydi. Natija: {index: xato matni} (yuborilmaganlar).
+    """
+    if not messages:
+        return {}
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # SMTP ga ulanib bo'lmadi: hech bir xat ketmagan, hammasi odatiy retry yo'li bilan qayta navbatga tushadi
+        logger.exception("SMTP connection failed, %s messages not sent", len(messages))
+        return {index: str(e) for index in range(len(messages))}
+
+    errors = {}
+    try:
+        for index, (email, subject, message) in enumerate(messages):
+            try:
+                EmailMessage(subject, message, mail_from(), [email], connection=connection).send()
+            except Exception as e:
+                errors[index] = str(e)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            # xatlar allaqachon yuborilgan, yopishdagi xato natijani o'zgartirmaydi
+            logger.exception("SMTP connection close failed")
+    return errors
@@ -1,3 +1,234 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.profile.models import PatientProfile, Story
+from apps.users.choices import UserImportStatusChoices
+from apps.users.models import SmsCode, UserImport
+from apps.users.tasks import send_mail_batch
+from apps.users.views.async_auth import AsyncLoginAPIView, AsyncResendCode
+
+User = get_user_model()
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("SMTP server is unreachable")
+
+    def send_messages(self, email_messages):
+        raise AssertionError("send_messages must not run without a connection")
+
+
+class RejectingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        if any(message.to == ['bad@example.com'] for message in email_messages):
+            raise ValueError("Recipient rejected")
+        mail.outbox.extend(email_messages)
+        return len(email_messages)
+
+
+@override_settings(EMAIL_HOST_USER='noreply@example.com')
+class SendMailBatchTests(SimpleTestCase):
+    def test_all_messages_are_sent(self):
+        errors = send_mail_batch([('a@example.com', 'Mavzu', 'Matn'), ('b@example.com', 'Mavzu', 'Matn')])
+        self.assertEqual(errors, {})
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['b@example.com']])
+
+    @override_settings(EMAIL_BACKEND='apps.users.tests.RejectingEmailBackend')
+    def test_one_failure_does_not_stop_the_batch(self):
+        errors = send_mail_batch([
+            ('a@example.com', 'Mavzu', 'Matn'), ('bad@example.com', 'Mavzu', 'Matn'), ('c@example.com', 'Mavzu', 'Matn')
+        ])
+        self.assertEqual(errors, {1: "Recipient rejected"})
+        self.assertEqual(len(mail.outbox), 2)
+
+    @override_settings(EMAIL_BACKEND='apps.users.tests.UnreachableEmailBackend')
+    def test_connection_failure_fails_every_message(self):
+        with self.assertLogs('apps.users.tasks', 'ERROR'):
+            errors = send_mail_batch([('a@example.com', 'Mavzu', 'Matn'), ('b@example.com', 'Mavzu', 'Matn')])
+        self.assertEqual(errors, {0: "SMTP server is unreachable", 1: "SMTP server is unreachable"})
+
+    def test_empty_batch(self):
+        self.assertEqual(send_mail_batch([]), {})
+
+
+@override_settings(EMAIL_HOST_USER='noreply@example.com')
+class AsyncAuthViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('doctor@example.com', password='secret123', full_name='Doctor',
+                                             status=True)
+        self.factory = APIRequestFactory()
+
+    async def post(self, view, data):
+        request = self.factory.post('/', data, format='json')
+        return await view.as_view()(request)
+
+    async def test_login_sends_code(self):
+        response = await self.post(AsyncLoginAPIView, {"contact": "doctor@example.com", "password": "secret123"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['user']['contact'], 'doctor@example.com')
+
+        self.assertEqual(len(mail.outbox), 1)
+        code = mail.outbox[0].body.rsplit(' ', 1)[-1]
+        sms_code = await SmsCode.objects.aget(contact='doctor@example.com')
+        self.assertTrue(check_password(code, sms_code.hash_code))
+
+    async def test_login_rejects_wrong_password_and_unknown_user(self):
+        response = await self.post(AsyncLoginAPIView, {"contact": "doctor@example.com", "password": "wrong"})
+        self.assertEqual(response.status_code, 401)
+        response = await self.post(AsyncLoginAPIView, {"contact": "nobody@example.com", "password": "secret123"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(mail.outbox), 0)
+
+    async def test_resend_code_is_limited(self):
+        await self.post(AsyncLoginAPIView, {"contact": "doctor@example.com", "password": "secret123"})
+        for remaining in (1, 0):
+            response = await self.post(AsyncResendCode, {"contact": "doctor@example.com"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['data']['qayta_jonatish_qoldi'], remaining)
+
+        response = await self.post(AsyncResendCode, {"contact": "doctor@example.com"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(mail.outbox), 3)
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('author@example.com', full_name='author')
+        self.stories = [Story.objects.create(user=self.user, role=self.user.active_role) for _ in range(3)]
+
+    def call(self, *args):
+        call_command(*args, stdout=StringIO())
+
+    def test_managers_hide_deleted_rows(self):
+        self.assertEqual(Story.objects.filter(id=self.stories[0].id).soft_delete(), 1)
+        self.assertEqual(Story.objects.count(), 2)
+        self.assertEqual(Story.all_objects.dead().get(), self.stories[0])
+
+        self.user.soft_delete()
+        self.assertFalse(User.objects.filter(id=self.user.id).exists())
+        # FK orqali murojaat o'chirilgan qatorni ham qaytaradi
+        self.assertEqual(Story.objects.first().user, self.user)
+
+        self.stories[0].restore()
+        self.assertEqual(Story.objects.count(), 3)
+
+    def test_deleted_contact_cannot_register_again(self):
+        User.objects.filter(id=self.user.id).update(status=True)
+        User.objects.filter(id=self.user.id).soft_delete()
+        response = self.client.post(reverse('users:register'), {
+            "contact": "author@example.com", "password": "secret123", "full_name": "author"
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("avval ro'yhatdan o'tilgan", response.data['message'])
+
+    def test_soft_delete_records_in_batches(self):
+        Story.objects.filter(id=self.stories[2].id).update(expired=True)
+        self.call('soft_delete_records', 'profile.Story', '--filter', 'expired=false', '--batch-size', '1')
+        self.assertEqual(list(Story.objects.all()), [self.stories[2]])
+
+        with self.assertRaises(CommandError):
+            self.call('soft_delete_records', 'profile.Story')
+        with self.assertRaises(CommandError):
+            self.call('soft_delete_records', 'users.SmsCode', '--filter', 'verified=false')
+
+    def test_purge_only_old_deleted_rows(self):
+        Story.objects.filter(id=self.stories[0].id).soft_delete()
+        Story.all_objects.filter(id=self.stories[1].id).update(deleted_at=timezone.now() - timedelta(days=31))
+
+        self.call('purge_soft_deleted', 'profile.Story', '--older-than-days', '30')
+        self.assertEqual(set(Story.all_objects.values_list('id', flat=True)),
+                         {self.stories[0].id, self.stories[2].id})
+
+
+IMPORT_CSV = """contact,full_name,password,birth_date,gender,active_role
+first@example.com,First,secret123,1990-05-01,erkak,
+second@example.com,Second,secret123,,,
+bad-contact,Bad,secret123,,,
+first@example.com,Again,secret123,,,
+existing@example.com,Existing,secret123,,,
+third@example.com,Third,,01.02.1990,other,
+fourth@example.com,Fourth,secret123,,ayol,
+"""
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.admin = User.objects.create_superuser('admin@example.com', full_name='Admin')
+        User.objects.create_user('existing@example.com', full_name='Existing')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name, content):
+        return self.client.post(reverse('custom_admin:admin-user-import'), {
+            "file": SimpleUploadedFile(name, content.encode())
+        }, format='multipart')
+
+    def process(self):
+        call_command('process_user_imports', '--batch-size', '2', '--workers', '1', stdout=StringIO())
+
+    def test_csv_import_creates_users_and_reports_errors(self):
+        response = self.upload('users.csv', IMPORT_CSV)
+        self.assertEqual(response.status_code, 201)
+        self.process()
+
+        job = UserImport.objects.get()
+        self.assertEqual((job.status, job.total_rows, job.created_count, job.error_count),
+                         (UserImportStatusChoices.DONE, 7, 3, 4))
+        self.assertEqual([(error['row'], error['contact']) for error in job.errors], [
+            (3, 'bad-contact'), (4, 'first@example.com'), (5, 'existing@example.com'), (6, 'third@example.com')
+        ])
+        self.assertEqual(len(job.errors[3]['errors']), 3)
+        self.assertIsNotNone(job.rows_per_second)
+
+        imported = User.objects.filter(contact__in=['first@example.com', 'second@example.com', 'fourth@example.com'])
+        self.assertEqual(imported.count(), 3)
+        self.assertEqual(PatientProfile.objects.filter(user__in=imported).count(), 3)
+        first = imported.get(contact='first@example.com')
+        self.assertTrue(first.status)
+        self.assertTrue(first.check_password('secret123'))
+        self.assertEqual(first.profile.full_name, 'First')
+        self.assertEqual(len(set(User.objects.values_list('public_id', flat=True))), User.objects.count())
+
+        response = self.client.get(reverse('custom_admin:admin-user-import-detail', args=[job.id]))
+        self.assertEqual(len(response.data['errors']), 4)
+
+    def test_json_import(self):
+        rows = [{"contact": "json@example.com", "full_name": "Json", "password": "secret123"}, "not a row"]
+        self.upload('users.json', json.dumps(rows))
+        self.process()
+
+        job = UserImport.objects.get()
+        self.assertEqual((job.created_count, job.error_count), (1, 1))
+        self.assertTrue(User.objects.filter(contact='json@example.com').exists())
+
+    def test_invalid_file_marks_job_failed(self):
+        self.upload('users.json', '{"contact": "json@example.com"}')
+        call_command('process_user_imports', '--workers', '1', stdout=StringIO(), stderr=StringIO())
+        job = UserImport.objects.get()
+        self.assertEqual(job.status, UserImportStatusChoices.FAILED)
+        self.assertIn("ro'yxatidan", job.error)
+
+    def test_only_csv_or_json_is_accepted(self):
+        self.assertEqual(self.upload('users.txt', IMPORT_CSV).status_code, 400)
+        self.assertFalse(UserImport.objects.exists())
@@ -1,13 +1,24 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path
 
-from apps.users.social_auth.views import (UserGoogleSocialAuthAPIView, UserFacebookSocialAuthAPIView,
-                                          UserAppleSocialAuthAPIView)
-from apps.users.views.auth import RegisterCreateAPIView, LoginAPIView
+from apps.users.views.auth import RegisterCreateAPIView
 from apps.users.views.change_password import UserForgotPasswordAPIView, UserResetPasswordAPIView
 from apps.users.views.detail import UserRetrieveUpdateAPIView, UserSelectRoleRetrieveAPIView
-from apps.users.views.sms_code import VerifyCodeAPIView, ResendCode
+from apps.users.views.sms_code import VerifyCodeAPIView
+
+# ASGI (uvicorn) ostida tashqi servislarni kutadigan viewlar async versiyasi bilan almashtiriladi
+if settings.ASYNC_VIEWS:
+    from apps.users.social_auth.async_views import (
+        AsyncUserGoogleSocialAuthAPIView as UserGoogleSocialAuthAPIView,
+        AsyncUserFacebookSocialAuthAPIView as UserFacebookSocialAuthAPIView,
+        AsyncUserAppleSocialAuthAPIView as UserAppleSocialAuthAPIView,
+    )
+    from apps.users.views.async_auth import AsyncLoginAPIView as LoginAPIView, AsyncResendCode as ResendCode
+else:
+    from apps.users.social_auth.views import (UserGoogleSocialAuthAPIView, UserFacebookSocialAuthAPIView,
+                                              UserAppleSocialAuthAPIView)
+    from apps.users.views.auth import LoginAPIView
+    from apps.users.views.sms_code import ResendCode
 
 app_name = 'users'
 
@@ -26,5 +37,3 @@ urlpatterns = [
     path('select-role/', UserSelectRoleRetrieveAPIView.as_view(), name='select-role')
 
 ]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from adrf.views import APIView
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, check_password
+from django.utils import timezone
+from rest_framework.status import HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND
+
+from apps.users.models import SmsCodeTypeChoices, UserContactTypeChoices, SmsCode
+from apps.users.serializers import UserSerializer, SmsCodeSerializer, LoginSerializer, ResendCodeSerializer
+from apps.users.tasks import asend_verification_code
+from apps.utils import CustomResponse
+from apps.utils.generate_code import generate_code
+from apps.utils.validates import validate_email_or_phone_number
+
+User = get_user_model()
+
+# PBKDF2 hisoblash CPU ni band qiladi, event loopni to'xtatmasligi uchun threadga chiqariladi
+amake_password = sync_to_async(make_password, thread_sensitive=False)
+acheck_password = sync_to_async(check_password, thread_sensitive=False)
+
+
+class AsyncLoginAPIView(APIView):
+    serializer_class = LoginSerializer
+
+    async def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        contact = serializer.validated_data.get('contact').strip()
+        password = serializer.validated_data.get('password').strip()
+
+        try:
+            user = await User.objects.aget(contact=contact, status=True)
+        except User.DoesNotExist:
+            return CustomResponse.error_response(message="User topilmadi", code=HTTP_404_NOT_FOUND)
+
+        if not await acheck_password(password, user.password):
+            return CustomResponse.error_response(message="Parol noto'g'ri", code=HTTP_401_UNAUTHORIZED)
+
+        user = UserSerializer(user).data
+
+        contact_type = validate_email_or_phone_number(contact)
+        if contact_type == UserContactTypeChoices.EMAIL:
+            code = generate_code()
+            user_code_obj = await SmsCode.acreate_for_contact(contact=contact, hash_code=await amake_password(code),
+                                                              _type=SmsCodeTypeChoices.LOGIN)
+            user_code_data = SmsCodeSerializer(user_code_obj).data
+            await asend_verification_code(email=contact, code=code)
+            return CustomResponse.success_response(
+                message='Kod yuborildi.',
+                data={"user": user, "user_code_data": user_code_data}
+            )
+        return CustomResponse.success_response(data={"user": user})
+
+
+class AsyncResendCode(APIView):
+    serializer_class = ResendCodeSerializer
+
+    MAX_RESEND_CODE = 3
+
+    async def post(self, request):
+        contact = request.data.get('contact', '').strip()
+
+        if not contact:
+            return CustomResponse.error_response(message="Email yoki telefon raqam kelishi shart.")
+
+        user_code_obj = await SmsCode.objects.filter(
+            contact=contact,
+            verified=False,
+            delete_obj__gte=timezone.now()
+        ).order_by('-created_at').afirst()
+
+        if not user_code_obj:
+            return CustomResponse.error_response(message='Kod topilmadi.')
+
+        if user_code_obj.resend_code >= self.MAX_RESEND_CODE:
+            return CustomResponse.error_response(
+                message="Urinishlar soni tugadi.",
+                data=SmsCodeSerializer(user_code_obj).data
+            )
+
+        code = generate_code()
+        user_code_obj.resend_code += 1
+        user_code_obj.expires_at = timezone.now() + timedelta(seconds=180)
+        user_code_obj.attempts = 0
+        user_code_obj.hash_code = await amake_password(code)
+        await user_code_obj.asave()
+        await asend_verification_code(contact, code)
+        sms_code_obj = SmsCodeSerializer(user_code_obj).data
+        return CustomResponse.success_response(
+            data={
+                "contact": contact,
+                "sms_code_obj": sms_code_obj,
+                "qayta_jonatish_qoldi": self.MAX_RESEND_CODE - sms_code_obj['resend_code']
+            },
+            message="Kod qaytadan yuborildi."
+        )
@@ -34,12 +34,13 @@ class RegisterCreateAPIView(CreateAPIView):
         if not password:
             return CustomResponse.error_response(message='Parol kiritilishi shart.')
 
-        if User.objects.filter(contact=contact, status=True).exists():
+        # contact unique: o'chirilgan (soft delete) akkauntlar ham tekshiriladi
+        if User.all_objects.filter(contact=contact, status=True).exists():
             return CustomResponse.error_response(
                 message=f"{contact} orqali avval ro'yhatdan o'tilgan"
             )
 
-        User.objects.filter(contact=contact, status=False).delete()
+        User.all_objects.filter(contact=contact, status=False).delete()
 
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
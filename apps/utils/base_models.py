@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 
@@ -12,6 +13,60 @@ class CreateUpdateBaseModel(models.Model):
         abstract = True
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def dead(self):
+        return self.filter(deleted_at__isnull=False)
+
+    def soft_delete(self):
+        now = timezone.now()
+        return self.filter(deleted_at__isnull=True).update(deleted_at=now, updated_at=now)
+
+    def restore(self):
+        return self.filter(deleted_at__isnull=False).update(deleted_at=None, updated_at=timezone.now())
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    O'chirilgan (deleted_at to'ldirilgan) qatorlarni ko'rsatmaydi.
+    So'rovlar WHERE deleted_at IS NULL shartli partial indekslarga tushadi.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    pass
+
+
+class SoftDeleteBaseModel(CreateUpdateBaseModel):
+    """
+    objects - faqat tirik qatorlar, all_objects - o'chirilganlari bilan birga.
+    FK orqali murojaat (_base_manager) o'chirilgan qatorlarni ham qaytaradi.
+    delete() avvalgidek qatorni butunlay o'chiradi, soft_delete() faqat belgilaydi.
+    """
+    objects = SoftDeleteManager()
+    all_objects = AllObjectsManager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at', 'updated_at'])
+
+    def restore(self):
+        self.deleted_at = None
+        self.save(update_fields=['deleted_at', 'updated_at'])
+
+
 class GenderChoices(models.TextChoices):
     ERKAK = 'erkak', 'erkak'
     AYOL = 'ayol', 'ayol'
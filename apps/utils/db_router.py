@@ -0,0 +1,117 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, DatabaseError
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_PREFIX = 'replica'
+PRIMARY_DB = 'default'
+
+_read_db = ContextVar('read_db', default=None)
+
+# lag har so'rovda emas, DB_REPLICA_LAG_CHECK_SECONDS da bir marta o'lchanadi
+_replica_lag = {}
+
+
+def _pin_key(user_id):
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_to_primary(user):
+    # yozishdan keyin user o'z o'zgarishini replica kechikishi sababli yo'qotmasligi uchun
+    if user and user.is_authenticated:
+        cache.set(_pin_key(user.pk), 1, timeout=settings.DB_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    if not user or not user.is_authenticated:
+        return False
+    return cache.get(_pin_key(user.pk)) is not None
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_DB_PREFIX)]
+
+
+def measure_replica_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        # SQLite/boshqa bazalarda lag o'lchab bo'lmaydi (lokal test uchun 0 deb olinadi)
+        return 0.0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE "
+            "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+            "END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def get_replica_lag(alias):
+    now = time.monotonic()
+    checked_at, lag = _replica_lag.get(alias, (None, None))
+    if checked_at is not None and now - checked_at < settings.DB_REPLICA_LAG_CHECK_SECONDS:
+        return lag
+
+    try:
+        lag = measure_replica_lag(alias)
+    except DatabaseError:
+        lag = float('inf')
+    _replica_lag[alias] = (now, lag)
+    return lag
+
+
+def choose_read_db():
+    healthy = [
+        alias for alias in replica_aliases()
+        if get_replica_lag(alias) <= settings.DB_REPLICA_MAX_LAG_SECONDS
+    ]
+    if not healthy:
+        return PRIMARY_DB
+    return random.choice(healthy)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        return _read_db.get() or PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
+
+
+class ReadReplicaMixin:
+    """
+    GET/HEAD so'rovlarda view querylarini lag chegarasidan oshmagan replica ga yo'naltiradi.
+    Muvaffaqiyatli yozish so'rovidan keyin user DB_REPLICA_PIN_SECONDS davomida primary ga bog'lanadi.
+    Autentifikatsiya primary dan o'qiladi, chunki u initial() ichida shu mixindan oldin ishlaydi.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+                replica_aliases()
+                and request.method in SAFE_METHODS
+                and not is_pinned_to_primary(request.user)
+        ):
+            self._read_db_token = _read_db.set(choose_read_db())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_read_db_token', None)
+        if token is not None:
+            _read_db.reset(token)
+            self._read_db_token = None
+        elif request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
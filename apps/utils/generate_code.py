@@ -13,7 +13,22 @@ import random
 def generate_public_id(model, field="public_id", start=100000, end=999999):
     while True:
         public_id = random.randint(start, end)
-        if not model.objects.filter(**{field: public_id}).exists():
+        # o'chirilgan qatorlar ham unique indeksda turadi
+        if not model._base_manager.filter(**{field: public_id}).exists():
             return public_id
 
 
+def allocate_public_ids(model, count, field="public_id", start=100000, end=999999):
+    """
+    count ta bo'sh public_id ni bir nechta so'rovda ajratadi (har id uchun alohida exists() emas).
+    """
+    allocated = set()
+    while len(allocated) < count:
+        need = count - len(allocated)
+        # band qilinganlar chiqib ketishi uchun biroz ko'proq nomzod olinadi
+        candidates = set(random.sample(range(start, end + 1), min(need * 2, end - start + 1))) - allocated
+        taken = set(model._base_manager.filter(**{f"{field}__in": candidates}).values_list(field, flat=True))
+        allocated.update(list(candidates - taken)[:need])
+    return list(allocated)
+
+
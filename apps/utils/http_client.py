@@ -0,0 +1,14 @@
+import httpx
+
+_async_client = None
+
+
+def get_async_client():
+    # har bir uvicorn worker o'z event loopida bitta client (connection pool) ishlatadi
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _async_client
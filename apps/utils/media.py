@@ -0,0 +1,179 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import Http404, HttpResponseForbidden, HttpResponse, HttpResponseNotModified, FileResponse, \
+    StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from django.views.decorators.http import require_safe
+
+from apps.media.signing import requires_signature, verify_media_signature
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CONTENT_ADDRESSED_RE = re.compile(r'(^|/)[0-9a-f]{64}(\.[A-Za-z0-9]+)?$')
+CHUNK_SIZE = 64 * 1024
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=86400'
+SIGNED_CACHE_CONTROL = 'private, max-age=3600'
+
+
+def is_content_addressed(path):
+    # fayl nomi kontentning sha256 i bo'lsa, u hech qachon o'zgarmaydi
+    return bool(CONTENT_ADDRESSED_RE.search(path))
+
+
+def make_etag(path, st):
+    match = CONTENT_ADDRESSED_RE.search(path)
+    if match:
+        return f'"{os.path.splitext(os.path.basename(path))[0]}"'
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def parse_range(header, size):
+    """
+    Faqat bitta oraliq qo'llab-quvvatlanadi: (start, end) yoki None (to'liq fayl).
+    Qondirib bo'lmaydigan oraliq uchun ValueError.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def range_applies(request, etag, mtime):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    if_range_date = parse_http_date_safe(if_range)
+    return if_range_date is not None and int(mtime) <= if_range_date
+
+
+def iter_file_range(file_path, start, end):
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _set_cache_headers(response, path, etag, mtime):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Accept-Ranges'] = 'bytes'
+    if requires_signature(path):
+        # imzolangan URL muddati tugagach umumiy keshlardan ham olinmasligi kerak
+        response['Cache-Control'] = SIGNED_CACHE_CONTROL
+    elif is_content_addressed(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = DEFAULT_CACHE_CONTROL
+    return response
+
+
+def resolve_media_path(path):
+    """
+    (file_path, path) qaytaradi: path MEDIA_ROOT ga nisbatan kanonik ko'rinishda.
+    'cas//stories', './cas/stories', 'users/../cas/stories' bitta faylga olib keladi, shuning uchun
+    imzo va prefiks tekshiruvi faqat normallashtirilgan yo'lda bajariladi.
+    """
+    file_path = safe_join(settings.MEDIA_ROOT, path)
+    relative = os.path.relpath(file_path, os.path.abspath(settings.MEDIA_ROOT))
+    return file_path, relative.replace(os.sep, '/')
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        file_path, path = resolve_media_path(path)
+    except ValueError:
+        raise Http404("Fayl topilmadi")
+
+    if requires_signature(path) and not verify_media_signature(
+            path, request.GET.get('exp'), request.GET.get('sig')
+    ):
+        return HttpResponseForbidden("Havola yaroqsiz yoki muddati tugagan")
+
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        raise Http404("Fayl topilmadi")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("Fayl topilmadi")
+
+    etag = make_etag(path, st)
+    mtime = st.st_mtime
+
+    if not_modified(request, etag, mtime):
+        return _set_cache_headers(HttpResponseNotModified(), path, etag, mtime)
+
+    # nginx orqasida baytlarni nginx o'zi yuboradi (Range ham nginx tomonidan bajariladi)
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse()
+        # nginx X-Accel-Redirect ni URI sifatida decode qiladi: bo'sh joy, '?', '%' li nomlar quote qilinadi
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(path.lstrip('/'), safe='/')
+        )
+        response['Content-Type'] = ''
+        return _set_cache_headers(response, path, etag, mtime)
+
+    content_type, encoding = mimetypes.guess_type(file_path)
+    content_type = content_type or 'application/octet-stream'
+
+    range_header = request.headers.get('Range')
+    if range_header and range_applies(request, etag, mtime):
+        try:
+            byte_range = parse_range(range_header, st.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{st.st_size}'
+            return _set_cache_headers(response, path, etag, mtime)
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                iter_file_range(file_path, start, end), status=206, content_type=content_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+            return _set_cache_headers(response, path, etag, mtime)
+
+    # to'liq fayl: FileResponse wsgi.file_wrapper (sendfile) dan foydalanadi
+    response = FileResponse(open(file_path, 'rb'), content_type=content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return _set_cache_headers(response, path, etag, mtime)
@@ -0,0 +1,213 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from apps.utils import db_router
+from apps.utils.db_router import PrimaryReplicaRouter, ReadReplicaMixin, choose_read_db, get_replica_lag, \
+    is_pinned_to_primary, pin_to_primary
+from config import settings as project_settings
+
+IMAGE_PATH = 'cas/ab/cd/' + 'b' * 64 + '.jpg'
+
+DB_ENV = {
+    'DB_ENGINE': 'django.db.backends.postgresql', 'DB_NAME': 'app', 'DB_USER': 'app', 'DB_PASS': 'secret',
+    'DB_HOST': 'primary', 'DB_PORT': '5432', 'DB_REPLICA_NAME': 'app', 'DB_REPLICA_HOST': 'replica',
+}
+
+
+@mock.patch.dict(os.environ, DB_ENV)
+class DatabaseSettingsTests(SimpleTestCase):
+    def test_persistent_connections_by_default(self):
+        with mock.patch.object(project_settings, 'DB_POOL', False):
+            database = project_settings.database_settings()
+        self.assertEqual(database['CONN_MAX_AGE'], project_settings.DB_CONN_MAX_AGE)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('OPTIONS', database)
+
+    def test_pool_disables_persistent_connections(self):
+        with mock.patch.object(project_settings, 'DB_POOL', True):
+            database = project_settings.database_settings()
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], project_settings.DB_POOL_MAX_SIZE)
+        self.assertNotIn('CONN_HEALTH_CHECKS', database)
+
+    def test_pool_is_postgresql_only(self):
+        with mock.patch.object(project_settings, 'DB_POOL', True), \
+                mock.patch.dict(os.environ, {'DB_ENGINE': 'django.db.backends.sqlite3'}):
+            database = project_settings.database_settings()
+        self.assertNotIn('OPTIONS', database)
+
+    def test_replica_falls_back_to_primary_credentials(self):
+        database = project_settings.database_settings('REPLICA_')
+        self.assertEqual((database['HOST'], database['USER'], database['PASSWORD']), ('replica', 'app', 'secret'))
+
+
+class RecordingView(ReadReplicaMixin, APIView):
+    permission_classes = []
+    read_dbs = []
+
+    def get(self, request):
+        self.read_dbs.append(PrimaryReplicaRouter().db_for_read(None))
+        return Response({})
+
+    def post(self, request):
+        if request.data.get('fail'):
+            return Response({}, status=400)
+        return Response({}, status=201)
+
+
+class FakeUser:
+    pk = 7
+    is_authenticated = True
+
+
+@override_settings(DB_REPLICA_MAX_LAG_SECONDS=2, DB_REPLICA_LAG_CHECK_SECONDS=5, DB_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        db_router._replica_lag.clear()
+        self.addCleanup(db_router._replica_lag.clear)
+        patcher = mock.patch.object(db_router, 'replica_aliases', return_value=['replica'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        RecordingView.read_dbs = []
+        self.factory = APIRequestFactory()
+
+    def request(self, method, user, data=None):
+        request = getattr(self.factory, method)('/', data or {}, format='json')
+        force_authenticate(request, user)
+        return RecordingView.as_view()(request)
+
+    def test_writes_and_migrations_use_primary(self):
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(None), 'default')
+        self.assertEqual(PrimaryReplicaRouter().db_for_write(None), 'default')
+        self.assertFalse(PrimaryReplicaRouter().allow_migrate('replica', 'users'))
+
+    def test_lagging_or_broken_replica_is_skipped(self):
+        with mock.patch.object(db_router, 'measure_replica_lag', return_value=0.5):
+            self.assertEqual(choose_read_db(), 'replica')
+        db_router._replica_lag.clear()
+        with mock.patch.object(db_router, 'measure_replica_lag', return_value=3):
+            self.assertEqual(choose_read_db(), 'default')
+        db_router._replica_lag.clear()
+        with mock.patch.object(db_router, 'measure_replica_lag', side_effect=DatabaseError):
+            self.assertEqual(choose_read_db(), 'default')
+
+    def test_lag_is_measured_once_per_interval(self):
+        with mock.patch.object(db_router, 'measure_replica_lag', return_value=0.5) as measure, \
+                mock.patch.object(db_router.time, 'monotonic', side_effect=[100, 104, 106]):
+            for _ in range(3):
+                self.assertEqual(get_replica_lag('replica'), 0.5)
+        self.assertEqual(measure.call_count, 2)
+
+    @mock.patch.object(db_router, 'measure_replica_lag', return_value=0)
+    def test_safe_requests_read_from_replica(self, measure):
+        self.request('get', AnonymousUser())
+        self.assertEqual(RecordingView.read_dbs, ['replica'])
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(None), 'default')
+
+    @mock.patch.object(db_router, 'measure_replica_lag', return_value=0)
+    def test_successful_write_pins_user_to_primary(self, measure):
+        user = FakeUser()
+        self.request('post', user, {"fail": True})
+        self.assertFalse(is_pinned_to_primary(user))
+
+        self.request('post', user)
+        self.assertTrue(is_pinned_to_primary(user))
+        self.request('get', user)
+        self.request('get', AnonymousUser())
+        self.assertEqual(RecordingView.read_dbs, ['default', 'replica'])
+
+    def test_anonymous_user_is_never_pinned(self):
+        pin_to_primary(AnonymousUser())
+        self.assertFalse(is_pinned_to_primary(AnonymousUser()))
+
+
+@override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='')
+class ServeMediaTests(SimpleTestCase):
+    content = b'0123456789abcdef'
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        for path in ('users/photo one.txt', IMAGE_PATH):
+            full_path = os.path.join(self.media_root, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'wb') as f:
+                f.write(self.content)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def get(self, path, **headers):
+        return self.client.get(f'/media/{path}', headers=headers)
+
+    def test_full_file_has_validators(self):
+        response = self.get('users/photo one.txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertIn('Last-Modified', response)
+
+    def test_content_addressed_file_is_immutable(self):
+        response = self.get(IMAGE_PATH)
+        self.assertEqual(response['ETag'], f'"{"b" * 64}"')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_conditional_get_returns_not_modified(self):
+        response = self.get('users/photo one.txt')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self.get('users/photo one.txt', if_none_match=etag).status_code, 304)
+        self.assertEqual(self.get('users/photo one.txt', if_none_match=f'W/{etag}').status_code, 304)
+        self.assertEqual(self.get('users/photo one.txt', if_modified_since=last_modified).status_code, 304)
+        self.assertEqual(self.get('users/photo one.txt', if_none_match='"other"').status_code, 200)
+
+    def test_byte_ranges(self):
+        for header, body, content_range in (
+                ('bytes=2-5', b'2345', 'bytes 2-5/16'),
+                ('bytes=10-', b'abcdef', 'bytes 10-15/16'),
+                ('bytes=-3', b'def', 'bytes 13-15/16'),
+                ('bytes=12-100', b'cdef', 'bytes 12-15/16'),
+        ):
+            with self.subTest(range=header):
+                response = self.get('users/photo one.txt', range=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(b''.join(response.streaming_content), body)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(response['Content-Length'], str(len(body)))
+
+    def test_unsatisfiable_range(self):
+        response = self.get('users/photo one.txt', range='bytes=16-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */16')
+
+    def test_stale_if_range_returns_full_file(self):
+        response = self.get('users/photo one.txt', range='bytes=2-5', if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        etag = self.get('users/photo one.txt')['ETag']
+        response = self.get('users/photo one.txt', range='bytes=2-5', if_range=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_missing_file_directory_or_traversal(self):
+        self.assertEqual(self.get('users/missing.txt').status_code, 404)
+        self.assertEqual(self.get('users').status_code, 404)
+        # MEDIA_ROOT dan tashqariga chiqish SuspiciousFileOperation -> 400
+        self.assertEqual(self.get('users/%2e%2e/%2e%2e/etc/passwd').status_code, 400)
+
+    def test_accel_redirect_quotes_path(self):
+        with self.settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = self.get('users/photo one.txt')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/users/photo%20one.txt')
+        self.assertEqual(response.content, b'')
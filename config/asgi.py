@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Run with ``ASYNC_VIEWS=True uvicorn config.asgi:application --workers 4`` to
+serve the login and social auth endpoints with their async views.
 """
 
 import os
@@ -37,12 +37,16 @@ CUSTOM_APPS = [
     'apps.users',
     'apps.appointments',
     'apps.profile',
+    'apps.media',
+    'apps.stats',
+    'apps.notifications',
 ]
 
 CUSTOM_INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'drf_spectacular',
+    'adrf',
 
 ]
 
@@ -83,21 +87,81 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# uvicorn config.asgi:application bilan ishga tushirilganda login va social auth async viewlari ulanadi
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config("DB_NAME"),
-        'USER': config("DB_USER"),
-        'PASSWORD': config("DB_PASS"),
-        'HOST': config('DB_HOST'),
-        'PORT': config('DB_PORT'),
+# DB_POOL=True psycopg3 pool ishlatadi (ASGI uchun tavsiya etiladi), aks holda
+# CONN_MAX_AGE bilan doimiy ulanishlar health check bilan qayta ishlatiladi.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=10, cast=int)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+
+def database_settings(prefix=''):
+    database = {
+        'ENGINE': config(f'DB_{prefix}ENGINE', default='django.db.backends.postgresql'),
+        'NAME': config(f'DB_{prefix}NAME'),
+        'USER': config(f'DB_{prefix}USER', default=config('DB_USER', default='')),
+        'PASSWORD': config(f'DB_{prefix}PASS', default=config('DB_PASS', default='')),
+        'HOST': config(f'DB_{prefix}HOST', default=config('DB_HOST', default='')),
+        'PORT': config(f'DB_{prefix}PORT', default=config('DB_PORT', default='')),
     }
+    if DB_POOL and database['ENGINE'] == 'django.db.backends.postgresql':
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS'] = {
+            'pool': {
+                'min_size': DB_POOL_MIN_SIZE,
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': 10,
+            }
+        }
+    else:
+        database['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+        database['CONN_HEALTH_CHECKS'] = True
+    return database
+
+
+DATABASES = {
+    'default': database_settings(),
 }
 
+# Replica faqat DB_REPLICA_NAME berilganda ulanadi. Lokal tekshirish uchun
+# DB_REPLICA_ENGINE=django.db.backends.sqlite3 bilan alohida SQLite fayl ishlatish mumkin.
+if config('DB_REPLICA_NAME', default=''):
+    DATABASES['replica'] = database_settings('REPLICA_')
+    DATABASE_ROUTERS = ['apps.utils.db_router.PrimaryReplicaRouter']
+
+# Yozishdan (follow, story, profil) keyin user shu vaqt davomida faqat primary dan o'qiydi
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+# Replica lag shu chegaradan oshsa o'qish primary ga qaytadi
+DB_REPLICA_MAX_LAG_SECONDS = config('DB_REPLICA_MAX_LAG_SECONDS', default=2, cast=float)
+DB_REPLICA_LAG_CHECK_SECONDS = config('DB_REPLICA_LAG_CHECK_SECONDS', default=5, cast=float)
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -135,6 +199,79 @@ STATIC_URL = '/static/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+# nginx da "internal" location (masalan /protected-media/ -> MEDIA_ROOT) berilsa,
+# fayl baytlari X-Accel-Redirect orqali nginx tomonidan yuboriladi
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='')
+
+# Storis fayllari faqat imzolangan (HMAC: path, muddat) URL orqali beriladi. URL bearer token:
+# userga bog'lanmaydi, muddat tugaguncha uni olgan har kim ocha oladi
+MEDIA_SIGNING_KEY = config('MEDIA_SIGNING_KEY', default='')
+MEDIA_SIGNED_URL_TTL = config('MEDIA_SIGNED_URL_TTL', default=3600, cast=int)
+MEDIA_SIGNED_URL_BUCKET = config('MEDIA_SIGNED_URL_BUCKET', default=300, cast=int)
+MEDIA_SIGNED_PREFIXES = ('cas/stories/', 'users/profile/story/')
+
+# Bo'lib-bo'lib (resumable) storis yuklash. Partlar STORAGES['story_uploads'] da saqlanadi: default lokal
+# papka, bir nechta app host bo'lsa hammasi ko'radigan backend (masalan S3) berilishi kerak
+STORY_UPLOAD_TEMP_DIR = config('STORY_UPLOAD_TEMP_DIR', default=os.path.join(BASE_DIR, 'tmp', 'story_uploads'))
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'story_uploads': {
+        'BACKEND': config('STORY_UPLOAD_STORAGE_BACKEND', default='django.core.files.storage.FileSystemStorage'),
+        'OPTIONS': {'location': STORY_UPLOAD_TEMP_DIR},
+    },
+}
+STORY_UPLOAD_MAX_SIZE = config('STORY_UPLOAD_MAX_SIZE', default=100 * 1024 * 1024, cast=int)
+STORY_UPLOAD_CHUNK_SIZE = config('STORY_UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int)
+STORY_UPLOAD_TTL = config('STORY_UPLOAD_TTL', default=24 * 60 * 60, cast=int)
+
+# Admin bulk user import (python manage.py process_user_imports)
+USER_IMPORT_MAX_SIZE = config('USER_IMPORT_MAX_SIZE', default=20 * 1024 * 1024, cast=int)
+USER_IMPORT_BATCH_SIZE = config('USER_IMPORT_BATCH_SIZE', default=500, cast=int)
+USER_IMPORT_HASH_WORKERS = config('USER_IMPORT_HASH_WORKERS', default=os.cpu_count() or 1, cast=int)
+
+# story va story_view kunlik partitionlari (python manage.py manage_story_partitions)
+STORY_PARTITION_DAYS_AHEAD = config('STORY_PARTITION_DAYS_AHEAD', default=7, cast=int)
+STORY_PARTITION_RETENTION_DAYS = config('STORY_PARTITION_RETENTION_DAYS', default=30, cast=int)
+STORY_PARTITION_ARCHIVE_SCHEMA = config('STORY_PARTITION_ARCHIVE_SCHEMA', default='archive')
+
+# compute_follow_suggestions: har profil uchun saqlanadigan tavsiyalar soni va co-follow dagi hub chegarasi
+FOLLOW_SUGGESTION_TOP_K = config('FOLLOW_SUGGESTION_TOP_K', default=50, cast=int)
+FOLLOW_SUGGESTION_HUB_LIMIT = config('FOLLOW_SUGGESTION_HUB_LIMIT', default=10000, cast=int)
+# Bitta approve/reject so'rovida yuborish mumkin bo'lgan follow so'rovlari soni (all=true cheklanmaydi)
+FOLLOW_REQUEST_BULK_MAX = config('FOLLOW_REQUEST_BULK_MAX', default=10000, cast=int)
+
+# Shifokorlar availability indeksi necha kun oldinga hisoblanadi
+DOCTOR_AVAILABILITY_DAYS = config('DOCTOR_AVAILABILITY_DAYS', default=60, cast=int)
+DOCTOR_SLOT_CACHE_TTL = config('DOCTOR_SLOT_CACHE_TTL', default=600, cast=int)
+
+# Qabul eslatmalari (send_appointment_reminders)
+APPOINTMENT_REMINDER_BATCH_SIZE = config('APPOINTMENT_REMINDER_BATCH_SIZE', default=200, cast=int)
+APPOINTMENT_REMINDER_LOOKAHEAD_SECONDS = config('APPOINTMENT_REMINDER_LOOKAHEAD_SECONDS', default=300, cast=int)
+APPOINTMENT_REMINDER_MAX_ATTEMPTS = config('APPOINTMENT_REMINDER_MAX_ATTEMPTS', default=3, cast=int)
+APPOINTMENT_REMINDER_RETRY_SECONDS = config('APPOINTMENT_REMINDER_RETRY_SECONDS', default=60, cast=int)
+# SENDING holatida shundan uzoq turgan eslatma qayta yuborilmaydi (FAILED)
+APPOINTMENT_REMINDER_CLAIM_TIMEOUT = config('APPOINTMENT_REMINDER_CLAIM_TIMEOUT', default=600, cast=int)
+# Bayes reyting: (C * m + yulduzlar yig'indisi) / (C + sharhlar soni). O'zgartirilsa verify_doctor_ratings --fix
+DOCTOR_RATING_PRIOR_MEAN = config('DOCTOR_RATING_PRIOR_MEAN', default=4.0, cast=float)
+DOCTOR_RATING_PRIOR_COUNT = config('DOCTOR_RATING_PRIOR_COUNT', default=5, cast=int)
+
+# Yaqin atrof qidiruvi: auto - PostGIS extension bo'lsa u, aks holda geohash; postgis/geohash - majburan
+GEO_BACKEND = config('GEO_BACKEND', default='auto')
+GEO_MAX_RADIUS_KM = config('GEO_MAX_RADIUS_KM', default=100, cast=float)
+GEO_KNN_START_KM = config('GEO_KNN_START_KM', default=2, cast=float)
+GEO_KNN_MAX_KM = config('GEO_KNN_MAX_KM', default=200, cast=float)
+GEO_NEARBY_MAX_RESULTS = config('GEO_NEARBY_MAX_RESULTS', default=50, cast=int)
+
+# Bildirishnoma digestlari (send_notification_digests): hodisalar shu oyna bo'yicha bitta xabarga yig'iladi
+NOTIFICATION_DIGEST_WINDOW_SECONDS = config('NOTIFICATION_DIGEST_WINDOW_SECONDS', default=3600, cast=int)
+# oyna oxiridan shuncha sekund o'tgach yopilgan hisoblanadi (kech commit bo'lgan tranzaksiyalar uchun)
+NOTIFICATION_DIGEST_GRACE_SECONDS = config('NOTIFICATION_DIGEST_GRACE_SECONDS', default=60, cast=int)
+NOTIFICATION_DIGEST_LOOKBACK_WINDOWS = config('NOTIFICATION_DIGEST_LOOKBACK_WINDOWS', default=3, cast=int)
+NOTIFICATION_DIGEST_BATCH_SIZE = config('NOTIFICATION_DIGEST_BATCH_SIZE', default=200, cast=int)
+NOTIFICATION_DIGEST_MAX_ATTEMPTS = config('NOTIFICATION_DIGEST_MAX_ATTEMPTS', default=3, cast=int)
+NOTIFICATION_DIGEST_CLAIM_TIMEOUT = config('NOTIFICATION_DIGEST_CLAIM_TIMEOUT', default=600, cast=int)
+NOTIFICATION_EVENT_RETENTION_DAYS = config('NOTIFICATION_EVENT_RETENTION_DAYS', default=7, cast=int)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
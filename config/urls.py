@@ -14,9 +14,11 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
+from apps.utils.media import serve_media
 from apps.utils.swagger.swagger_urls import SPECTACULAR_URL
 
 urlpatterns = [
@@ -24,6 +26,9 @@ urlpatterns = [
     path('admin/', include('apps.admin.urls', namespace='custom_admin')),
     path('users/', include('apps.users.urls', namespace='users')),
     path('profile/', include('apps.profile.urls', namespace='profile')),
+    path('appointments/', include('apps.appointments.urls', namespace='appointments')),
+    path('notifications/', include('apps.notifications.urls', namespace='notifications')),
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", serve_media, name='media'),
 
 ] + SPECTACULAR_URL
 